@@ -0,0 +1,128 @@
+"""
+Cold-start measurement.
+
+``measure_cold_start`` runs one of ``TARGETS`` in a fresh interpreter under
+``python -X importtime`` and reports how long it took, which modules it
+left loaded and what every import cost.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+
+# What a worker or a manage.py run executes before doing any work.
+TARGETS = {
+    "wsgi": "import LibraryServiceAPI.wsgi",
+    "asgi": "import LibraryServiceAPI.asgi",
+    "manage": "import django; django.setup()",
+    # The URLconf is loaded by the first request and by system checks.
+    "urls": (
+        "import django; django.setup(); "
+        "from django.urls import get_resolver; get_resolver().url_patterns"
+    ),
+}
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "modules": sorted(sys.modules)}))
+"""
+
+IMPORTTIME_PREFIX = "import time:"
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".")[0]
+
+
+@dataclass(frozen=True)
+class ColdStart:
+    target: str
+    seconds: float
+    modules: frozenset[str]
+    imports: tuple[ImportTiming, ...]
+
+    def heaviest(
+        self, limit: int, key: str = "cumulative"
+    ) -> list[ImportTiming]:
+        """The ``limit`` imports with the largest ``key`` time."""
+        return sorted(
+            self.imports,
+            key=lambda timing: getattr(timing, f"{key}_us"),
+            reverse=True,
+        )[:limit]
+
+    def packages(self, limit: int) -> list[tuple[str, int]]:
+        """Self time in microseconds of the ``limit`` costliest packages."""
+        totals: dict[str, int] = defaultdict(int)
+        for timing in self.imports:
+            totals[timing.package] += timing.self_us
+        return sorted(totals.items(), key=lambda item: -item[1])[:limit]
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        fields = line.removeprefix(IMPORTTIME_PREFIX).split("|")
+        self_us, cumulative_us, module = fields
+        if not self_us.strip().isdigit():
+            continue  # The header line.
+        timings.append(
+            ImportTiming(module.strip(), int(self_us), int(cumulative_us))
+        )
+    return timings
+
+
+def measure_cold_start(
+    target: str = "wsgi",
+    profile: str = "prod",
+    env: Optional[dict[str, str]] = None,
+) -> ColdStart:
+    """Run ``TARGETS[target]`` in a new interpreter with ``profile``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, TARGETS[target]],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "LibraryServiceAPI.settings",
+            "DJANGO_SETTINGS_PROFILE": profile,
+            **(env or {}),
+        },
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        errors = [
+            line
+            for line in result.stderr.splitlines()
+            if not line.startswith(IMPORTTIME_PREFIX)
+        ]
+        raise RuntimeError(
+            f"Cold start of {target!r} failed:\n" + "\n".join(errors[-20:])
+        )
+    report = json.loads(result.stdout.splitlines()[-1])
+    return ColdStart(
+        target=target,
+        seconds=report["seconds"],
+        modules=frozenset(report["modules"]),
+        imports=tuple(parse_importtime(result.stderr)),
+    )
@@ -0,0 +1,226 @@
+"""
+Low-overhead per-request instrumentation.
+
+``RequestMetricsMiddleware`` starts a ``RequestMetrics`` for a sampled share
+of requests and publishes it in a context variable. While it is set, every
+database query (through an execute wrapper installed on each connection)
+and every ``timed()`` block adds to it; unsampled requests only pay for a
+context variable lookup per query. Finished requests are folded into the
+process-wide ``registry``, exported in the Prometheus text format.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Upper bounds, in seconds, of the request duration histogram buckets.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+@dataclass
+class RequestMetrics:
+    queries: int = 0
+    db_seconds: float = 0.0
+    # Seconds spent per timed() section, e.g. "serializer" or "hashing".
+    sections: dict[str, float] = field(default_factory=dict)
+    _active: set[str] = field(default_factory=set)
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+@contextmanager
+def collect() -> Iterator[RequestMetrics]:
+    """Collect the metrics of the code run inside the block."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(section: str) -> Iterator[None]:
+    """
+    Add the time spent in the block to ``section`` of the current request.
+
+    Nested blocks of the same section are only counted once.
+    """
+    metrics = _current.get()
+    if metrics is None or section in metrics._active:
+        yield
+        return
+    metrics._active.add(section)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._active.discard(section)
+        metrics.sections[section] = metrics.sections.get(section, 0.0) + (
+            time.perf_counter() - start
+        )
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting queries of sampled requests."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - start
+
+
+def install_query_recorder(connection) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def on_connection_created(*, connection, **kwargs) -> None:
+    install_query_recorder(connection)
+
+
+class MetricsRegistry:
+    """Per-process aggregates of the request metrics, keyed by view."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: dict[tuple[str, str, int], int] = defaultdict(int)
+            self.buckets: dict[str, list[int]] = defaultdict(
+                lambda: [0] * (len(DURATION_BUCKETS) + 1)
+            )
+            self.duration: dict[str, float] = defaultdict(float)
+            self.sampled: dict[str, int] = defaultdict(int)
+            self.queries: dict[str, int] = defaultdict(int)
+            self.db_seconds: dict[str, float] = defaultdict(float)
+            self.sections: dict[tuple[str, str], float] = defaultdict(float)
+
+    def observe(
+        self,
+        view: str,
+        method: str,
+        status: int,
+        seconds: float,
+        metrics: Optional[RequestMetrics],
+    ) -> None:
+        bucket = next(
+            (
+                index
+                for index, bound in enumerate(DURATION_BUCKETS)
+                if seconds <= bound
+            ),
+            len(DURATION_BUCKETS),
+        )
+        with self._lock:
+            self.requests[view, method, status] += 1
+            self.buckets[view][bucket] += 1
+            self.duration[view] += seconds
+            if metrics is None:
+                return
+            self.sampled[view] += 1
+            self.queries[view] += metrics.queries
+            self.db_seconds[view] += metrics.db_seconds
+            for section, section_seconds in metrics.sections.items():
+                self.sections[view, section] += section_seconds
+
+    def render(self, gauges: Optional[dict[str, float]] = None) -> str:
+        """Render the aggregates, plus ``gauges``, as Prometheus text."""
+        lines = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            family("http_requests_total", "counter", "Requests served.")
+            for (view, method, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'http_requests_total{{view="{view}",method="{method}",'
+                    f'status="{status}"}} {count}'
+                )
+
+            family(
+                "http_request_duration_seconds",
+                "histogram",
+                "Time to produce the response.",
+            )
+            for view, counts in sorted(self.buckets.items()):
+                cumulative = 0
+                for bound, count in zip((*DURATION_BUCKETS, "+Inf"), counts):
+                    cumulative += count
+                    lines.append(
+                        "http_request_duration_seconds_bucket"
+                        f'{{view="{view}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'http_request_duration_seconds_sum{{view="{view}"}} '
+                    f"{self.duration[view]}"
+                )
+                lines.append(
+                    f'http_request_duration_seconds_count{{view="{view}"}} '
+                    f"{cumulative}"
+                )
+
+            for name, help_text, values in (
+                (
+                    "http_requests_sampled_total",
+                    "Requests whose queries and sections were measured.",
+                    self.sampled,
+                ),
+                (
+                    "db_queries_total",
+                    "Database queries of sampled requests.",
+                    self.queries,
+                ),
+                (
+                    "db_query_duration_seconds_total",
+                    "Database time of sampled requests.",
+                    self.db_seconds,
+                ),
+            ):
+                family(name, "counter", help_text)
+                for view, value in sorted(values.items()):
+                    lines.append(f'{name}{{view="{view}"}} {value}')
+
+            family(
+                "section_duration_seconds_total",
+                "counter",
+                "Time of sampled requests spent in instrumented sections.",
+            )
+            for (view, section), value in sorted(self.sections.items()):
+                lines.append(
+                    "section_duration_seconds_total"
+                    f'{{view="{view}",section="{section}"}} {value}'
+                )
+
+        for name, value in sorted((gauges or {}).items()):
+            family(name, "gauge", name.replace("_", " ").capitalize() + ".")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.utils.module_loading import import_string
+
+from LibraryServiceAPI.metrics import (
+    RequestMetrics,
+    collect,
+    install_query_recorder,
+    registry,
+)
+from LibraryServiceAPI.routers import replica_reads
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RequestMetricsMiddleware:
+    """
+    Time every request and, for a sampled share of them, count database
+    queries and instrumented sections.
+
+    Results are aggregated per view in ``LibraryServiceAPI.metrics.registry``
+    and, when enabled, returned in a ``Server-Timing`` header.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        config = settings.REQUEST_METRICS
+        self.sample_rate = config["SAMPLE_RATE"]
+        self.server_timing = config["SERVER_TIMING"]
+        # Connections opened before the connection_created receiver was
+        # registered.
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        if self.sampled():
+            with collect() as metrics:
+                response = self.get_response(request)
+        else:
+            metrics = None
+            response = self.get_response(request)
+        self.finish(request, response, time.perf_counter() - start, metrics)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        start = time.perf_counter()
+        if self.sampled():
+            with collect() as metrics:
+                response = await self.get_response(request)
+        else:
+            metrics = None
+            response = await self.get_response(request)
+        self.finish(request, response, time.perf_counter() - start, metrics)
+        return response
+
+    def finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        seconds: float,
+        metrics: Optional[RequestMetrics],
+    ) -> None:
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        registry.observe(
+            view, request.method, response.status_code, seconds, metrics
+        )
+        if self.server_timing:
+            response["Server-Timing"] = self.server_timing_header(
+                seconds, metrics
+            )
+
+    @staticmethod
+    def server_timing_header(
+        seconds: float, metrics: Optional[RequestMetrics]
+    ) -> str:
+        entries = []
+        if metrics is not None:
+            entries.append(
+                f"db;dur={metrics.db_seconds * 1000:.2f};"
+                f'desc="{metrics.queries} queries"'
+            )
+            entries.extend(
+                f"{section};dur={section_seconds * 1000:.2f}"
+                for section, section_seconds in metrics.sections.items()
+            )
+        entries.append(f"total;dur={seconds * 1000:.2f}")
+        return ", ".join(entries)
+
+
+class ReplicaReadsMiddleware:
+    """
+    Let safe requests read routed models from replicas.
+
+    Unsafe requests read from the primary throughout, so objects they
+    update are never loaded from a lagging replica.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with replica_reads(request.method in SAFE_METHODS):
+            return self.get_response(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        with replica_reads(request.method in SAFE_METHODS):
+            return await self.get_response(request)
+
+
+class MiddlewareScope:
+    """A middleware chain built like ``BaseHandler.load_middleware``."""
+
+    def __init__(self, paths: list[str], get_response, is_async: bool) -> None:
+        adapt = BaseHandler().adapt_method_mode
+        self.view_middleware: list[Callable] = []
+        self.template_response_middleware: list[Callable] = []
+        self.exception_middleware: list[Callable] = []
+
+        handler = get_response
+        handler_is_async = is_async
+        for path in reversed(paths):
+            middleware = import_string(path)
+            if is_async and getattr(middleware, "async_capable", False):
+                middleware_is_async = True
+            elif getattr(middleware, "sync_capable", True):
+                middleware_is_async = False
+            else:
+                middleware_is_async = True
+            adapted = adapt(middleware_is_async, handler, handler_is_async)
+            try:
+                instance = middleware(adapted)
+            except MiddlewareNotUsed:
+                continue
+            if instance is None:
+                raise ImproperlyConfigured(
+                    f"Middleware factory {path} returned None."
+                )
+            # RouteScopedMiddleware runs the hooks synchronously; Django
+            # adapts it as a whole under ASGI.
+            if hasattr(instance, "process_view"):
+                self.view_middleware.insert(
+                    0, adapt(False, instance.process_view)
+                )
+            if hasattr(instance, "process_template_response"):
+                self.template_response_middleware.append(
+                    adapt(False, instance.process_template_response)
+                )
+            if hasattr(instance, "process_exception"):
+                self.exception_middleware.append(
+                    adapt(False, instance.process_exception)
+                )
+            handler = convert_exception_to_response(instance)
+            handler_is_async = middleware_is_async
+        self.handler = adapt(is_async, handler, handler_is_async)
+
+
+class RouteScopedMiddleware:
+    """
+    Run the middleware listed in ``MIDDLEWARE_SCOPES`` for the longest URL
+    prefix matching the request path.
+
+    Lets routes that authenticate by token skip the session, CSRF and
+    messages middleware that the admin needs. The ``process_view``,
+    ``process_template_response`` and ``process_exception`` hooks of the
+    scoped middleware run as they would from ``MIDDLEWARE``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        is_async = iscoroutinefunction(get_response)
+        self.scopes = sorted(
+            (
+                (prefix, MiddlewareScope(paths, get_response, is_async))
+                for prefix, paths in settings.MIDDLEWARE_SCOPES.items()
+            ),
+            key=lambda scope: len(scope[0]),
+            reverse=True,
+        )
+        if is_async:
+            markcoroutinefunction(self)
+
+    def scope(self, request: HttpRequest) -> Optional[MiddlewareScope]:
+        for prefix, scope in self.scopes:
+            if request.path_info.startswith(prefix):
+                return scope
+        return None
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.middleware_scope = scope = self.scope(request)
+        if scope is None:
+            return self.get_response(request)
+        return scope.handler(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        request.middleware_scope = scope = self.scope(request)
+        if scope is None:
+            return await self.get_response(request)
+        return await scope.handler(request)
+
+    def process_view(
+        self, request: HttpRequest, view_func, view_args, view_kwargs
+    ) -> Optional[HttpResponse]:
+        scope = request.middleware_scope
+        for process_view in scope.view_middleware if scope else ():
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        scope = request.middleware_scope
+        for process in scope.template_response_middleware if scope else ():
+            response = process(request, response)
+        return response
+
+    def process_exception(
+        self, request: HttpRequest, exception: Exception
+    ) -> Optional[HttpResponse]:
+        scope = request.middleware_scope
+        for process_exception in scope.exception_middleware if scope else ():
+            response = process_exception(request, exception)
+            if response is not None:
+                return response
+        return None
@@ -0,0 +1,43 @@
+"""JSON parsing through orjson."""
+
+from __future__ import annotations
+
+import io
+import re
+
+import orjson
+from django.conf import settings
+from rest_framework import parsers
+
+from LibraryServiceAPI.renderers import ORJSONRenderer
+
+UTF8 = frozenset({"utf-8", "utf8"})
+
+# orjson reads integers outside the 64 bit range as floats, losing digits.
+# Every integer it reads exactly has at most 19 digits.
+LONG_DIGITS = re.compile(rb"\d{19}")
+
+
+class ORJSONParser(parsers.JSONParser):
+    """
+    Parse UTF-8 JSON bodies with orjson.
+
+    Bodies in other encodings, and non-strict parsing that accepts NaN and
+    Infinity, are left to ``JSONParser``, as are bodies orjson rejects or may
+    read inexactly: lone surrogate escapes and runs of 19 or more digits.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if not self.strict or encoding.lower() not in UTF8:
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if not LONG_DIGITS.search(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
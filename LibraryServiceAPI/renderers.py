@@ -0,0 +1,69 @@
+"""
+JSON rendering through orjson.
+
+Output decodes to the same values as DRF's ``JSONRenderer`` with the default
+compact, unicode and strict settings, and is byte for byte the same except
+for floats, which orjson spells in the shortest form (``1e16`` rather than
+``1e+16``). Requests for indented output, deployments that change those
+settings and data orjson cannot encode, such as integers beyond 64 bits or
+non-finite floats, are rendered by ``JSONRenderer`` itself.
+"""
+
+from __future__ import annotations
+
+import math
+from decimal import Decimal
+
+import orjson
+from rest_framework import renderers
+
+# Datetimes in UTC end in "Z" as with DRF's encoder, and integer dictionary
+# keys are written as strings as json.dumps does.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def has_non_finite(data) -> bool:
+    """Whether ``data`` holds a NaN or infinite float or Decimal."""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, Decimal):
+        return not data.is_finite()
+    if isinstance(data, dict):
+        return any(has_non_finite(item) for item in data.items())
+    if isinstance(data, (list, tuple)):
+        return any(has_non_finite(item) for item in data)
+    return False
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """Render JSON straight to bytes with orjson."""
+
+    def __init__(self) -> None:
+        # Types orjson does not know, such as Decimal, lazy translations and
+        # querysets, are converted as DRF's encoder converts them.
+        self.default = self.encoder_class().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=self.default, option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson writes NaN and infinities as null where strict mode raises
+        # ValueError, so only output with a null needs the walk.
+        if b"null" in ret and has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped by JSONRenderer so the output is valid JavaScript.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
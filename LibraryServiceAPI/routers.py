@@ -0,0 +1,146 @@
+"""
+Read-replica routing.
+
+``ReplicaRouter`` sends reads of the models in
+``REPLICA_ROUTING["MODELS"]`` to a random replica from
+``DATABASE_REPLICAS``, but only while replica reads are enabled for the
+current context. ``ReplicaReadsMiddleware`` enables them for safe requests;
+everything else (writes, management commands, unsafe requests) stays on
+``default``.
+
+Reads fall back to ``default``:
+
+* inside a transaction on ``default``,
+* for the rest of a request once it saved a user, and for
+  ``PIN_SECONDS`` after a user was saved when the requester is that user
+  (read-your-writes),
+* when every replica lags more than ``MAX_LAG`` seconds or is unreachable.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+# Lag, in seconds, of a Postgres standby: zero once it has replayed
+# everything it received, otherwise the age of the last replayed
+# transaction.
+POSTGRES_LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM now() - "
+    "pg_last_xact_replay_timestamp()), 0) END"
+)
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True) -> Iterator[None]:
+    """Allow routed reads inside the block to use replicas."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def pin_key(user_id: int) -> str:
+    return f"db:pin:{user_id}"
+
+
+def pin_to_primary(user_id: Optional[int] = None) -> None:
+    """
+    Send the remaining reads of the current context to ``default``, and
+    with ``user_id``, the reads of that user's requests for ``PIN_SECONDS``.
+    """
+    _replica_reads.set(False)
+    if user_id is not None and settings.DATABASE_REPLICAS:
+        cache.set(
+            pin_key(user_id), True, settings.REPLICA_ROUTING["PIN_SECONDS"]
+        )
+
+
+def apply_user_pin(user_id: int) -> None:
+    """Read from ``default`` if ``user_id`` was saved moments ago."""
+    if (
+        _replica_reads.get()
+        and settings.DATABASE_REPLICAS
+        and cache.get(pin_key(user_id))
+    ):
+        _replica_reads.set(False)
+
+
+def measure_lag(alias: str) -> float:
+    """Replication lag of ``alias`` in seconds; 0 when unknown."""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(POSTGRES_LAG_SQL)
+        return float(cursor.fetchone()[0])
+
+
+class ReplicaMonitor:
+    """Per-process record of replica lag, refreshed every CHECK_INTERVAL."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # alias -> (monotonic time of the check, lag in seconds)
+        self._lags: dict[str, tuple[float, float]] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._lags.clear()
+
+    def lag(self, alias: str) -> float:
+        now = time.monotonic()
+        interval = settings.REPLICA_ROUTING["CHECK_INTERVAL"]
+        with self._lock:
+            checked = self._lags.get(alias)
+        if checked is not None and now - checked[0] < interval:
+            return checked[1]
+        try:
+            lag = measure_lag(alias)
+        except DatabaseError:
+            lag = float("inf")
+        with self._lock:
+            self._lags[alias] = (now, lag)
+        return lag
+
+    def healthy(self, aliases: list[str]) -> list[str]:
+        max_lag = settings.REPLICA_ROUTING["MAX_LAG"]
+        return [alias for alias in aliases if self.lag(alias) <= max_lag]
+
+
+monitor = ReplicaMonitor()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        if not _replica_reads.get() or not settings.DATABASE_REPLICAS:
+            return None
+        if model._meta.label_lower not in settings.REPLICA_ROUTING["MODELS"]:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = monitor.healthy(settings.DATABASE_REPLICAS)
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints) -> str:
+        # Also for instances read from a replica, which Django would
+        # otherwise save back to the database they came from.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
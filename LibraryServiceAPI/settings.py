@@ -14,6 +14,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,10 +27,21 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY")
 
+# Settings profile: "dev" for local development, "prod" for deployments,
+# "bench" for production-like benchmark runs and "test" for the test suite,
+# which manage.py test selects by default.
+SETTINGS_PROFILE = os.getenv("DJANGO_SETTINGS_PROFILE", "dev")
+if SETTINGS_PROFILE not in ("dev", "prod", "bench", "test"):
+    raise ImproperlyConfigured(
+        f"Unknown DJANGO_SETTINGS_PROFILE {SETTINGS_PROFILE!r}."
+    )
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = SETTINGS_PROFILE == "dev"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.getenv("DJANGO_ALLOWED_HOSTS", "").split(",") if host
+]
 
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -38,12 +50,12 @@ INTERNAL_IPS = [
 # Application definition
 
 INSTALLED_APPS = [
+    "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "rest_framework",
     "rest_framework_simplejwt",
     "users",
@@ -51,16 +63,45 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "LibraryServiceAPI.middleware.RequestMetricsMiddleware",
+    "LibraryServiceAPI.middleware.ReplicaReadsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "LibraryServiceAPI.middleware.RouteScopedMiddleware",
 ]
 
+# Middleware run by RouteScopedMiddleware for the longest matching URL
+# prefix. The users API authenticates with JWTs and never touches sessions,
+# CSRF cookies or messages; the admin and the API docs keep all of them.
+MIDDLEWARE_SCOPES = {
+    "/": [
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+    ],
+    "/api/v1/users/": [],
+}
+
+# The admin and CSRF middleware checks only look at MIDDLEWARE;
+# users.E003 checks MIDDLEWARE_SCOPES instead.
+SILENCED_SYSTEM_CHECKS = [
+    "admin.E408",
+    "admin.E409",
+    "admin.E410",
+    "security.W003",
+]
+
+# The debug toolbar is only loaded in the dev profile, and DEBUG_TOOLBAR=False
+# skips it there too for faster manage.py runs.
+DEBUG_TOOLBAR = (
+    SETTINGS_PROFILE == "dev" and os.getenv("DEBUG_TOOLBAR", "True") == "True"
+)
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(3, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "LibraryServiceAPI.urls"
 
 TEMPLATES = [
@@ -79,12 +120,25 @@ TEMPLATES = [
     },
 ]
 
+if SETTINGS_PROFILE != "dev":
+    # Explicit cached loaders; APP_DIRS cannot be combined with "loaders".
+    TEMPLATES[0]["APP_DIRS"] = False
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        ),
+    ]
+
 WSGI_APPLICATION = "LibraryServiceAPI.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-POSTGRES = False
+POSTGRES = os.getenv("POSTGRES", "False") == "True"
 if POSTGRES:
     DATABASES = {
         "default": {
@@ -104,6 +158,81 @@ else:
         }
     }
 
+if SETTINGS_PROFILE == "test":
+    # Build test databases straight from the models instead of replaying
+    # every migration, which users.tests.test_migrations does once; SQLite
+    # test databases live in memory.
+    DATABASES["default"]["TEST"] = {"MIGRATE": False}
+    # Independent second database for the replica routing tests; only
+    # created when a test uses it.
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "replica.sqlite3",
+        "TEST": {"MIGRATE": False},
+    }
+
+# Keep connections open between requests outside development, checking
+# them before reuse so a dropped connection does not fail a request.
+DATABASES["default"]["CONN_MAX_AGE"] = int(
+    os.getenv("DB_CONN_MAX_AGE", 0 if SETTINGS_PROFILE == "dev" else 600)
+)
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = SETTINGS_PROFILE != "dev"
+
+# psycopg connection pool shared by the threads of a worker process. Django
+# refuses to combine it with persistent connections; CONN_HEALTH_CHECKS makes
+# the pool check connections before handing them out.
+POSTGRES_POOL = POSTGRES and os.getenv("POSTGRES_POOL", "False") == "True"
+if POSTGRES_POOL:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", 10)),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", 10)),
+            "max_idle": float(os.getenv("POSTGRES_POOL_MAX_IDLE", 600)),
+            "max_lifetime": float(
+                os.getenv("POSTGRES_POOL_MAX_LIFETIME", 3600)
+            ),
+        }
+    }
+
+# Read replicas: aliases in DATABASES that LibraryServiceAPI.routers sends
+# user reads of safe requests to. POSTGRES_REPLICA_HOSTS lists standbys of
+# the primary; without Postgres, SQLITE_REPLICAS lists SQLite files to try
+# routing locally, kept in sync by hand (e.g. sqlite3's ".backup").
+DATABASE_REPLICAS = []
+if SETTINGS_PROFILE != "test":
+    if POSTGRES:
+        replicas = os.getenv("POSTGRES_REPLICA_HOSTS", "")
+        replica_key = "HOST"
+    else:
+        replicas = os.getenv("SQLITE_REPLICAS", "")
+        replica_key = "NAME"
+    for number, value in enumerate(filter(None, replicas.split(",")), 1):
+        DATABASES[f"replica{number}"] = {
+            **DATABASES["default"],
+            replica_key: value,
+            "TEST": {"MIRROR": "default"},
+        }
+        DATABASE_REPLICAS.append(f"replica{number}")
+
+# Replica reads of MODELS fall back to the primary for PIN_SECONDS after a
+# user is saved, for that user, and whenever a replica lags more than
+# MAX_LAG seconds, measured at most every CHECK_INTERVAL seconds. Keep
+# MAX_LAG below PIN_SECONDS so pinned writes are visible on replicas in use
+# once the pin expires. Pins are kept in the default cache, so they only
+# cover requests served by other workers when that cache is shared (see
+# CACHES).
+REPLICA_ROUTING = {
+    "MODELS": ["users.user"],
+    "PIN_SECONDS": float(os.getenv("REPLICA_PIN_SECONDS", 5)),
+    "MAX_LAG": float(os.getenv("REPLICA_MAX_LAG", 2)),
+    "CHECK_INTERVAL": 5,
+}
+
+DATABASE_ROUTERS = ["LibraryServiceAPI.routers.ReplicaRouter"]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -123,12 +252,76 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "users.hashers.TunableArgon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
     "django.contrib.auth.hashers.ScryptPasswordHasher",
 ]
+if SETTINGS_PROFILE == "test":
+    # Deliberately weak and fast; never use outside the test suite.
+    PASSWORD_HASHERS.insert(0, "django.contrib.auth.hashers.MD5PasswordHasher")
+
+# Argon2 cost of new hashes; stored hashes with another cost are upgraded on
+# the next login. The defaults are the argon2-cffi library defaults; run
+# "manage.py calibrate_password_hasher" to size them for the host. MEMORY_COST
+# is in KiB.
+PASSWORD_HASHING_COST = {
+    "TIME_COST": int(os.getenv("ARGON2_TIME_COST", 2)),
+    "MEMORY_COST": int(os.getenv("ARGON2_MEMORY_COST", 102400)),
+    "PARALLELISM": int(os.getenv("ARGON2_PARALLELISM", 8)),
+}
+
+# Upgrades of stale password hashes after a login run on WORKERS background
+# threads once the request's transaction commits. With ASYNC off they run
+# inline, as they do in the test profile.
+PASSWORD_REHASH = {
+    "ASYNC": os.getenv(
+        "PASSWORD_REHASH_ASYNC", str(SETTINGS_PROFILE != "test")
+    )
+    == "True",
+    "WORKERS": int(os.getenv("PASSWORD_REHASH_WORKERS", 2)),
+}
+
+# Process pool used by the async registration and password update views to
+# hash passwords off the event loop, and by the bulk import view. Requests
+# beyond MAX_WORKERS + QUEUE_LIMIT are rejected with 429; imports hash
+# MAX_WORKERS passwords at a time and wait up to IMPORT_TIMEOUT seconds for
+# free slots first.
+PASSWORD_HASHING_POOL = {
+    "MAX_WORKERS": int(
+        os.getenv("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)
+    ),
+    "QUEUE_LIMIT": int(os.getenv("PASSWORD_HASHING_QUEUE_LIMIT", 32)),
+    "IMPORT_TIMEOUT": float(os.getenv("PASSWORD_HASHING_IMPORT_TIMEOUT", 10)),
+}
+
+# Serve register, me and password update from the native async views in
+# users.async_views instead of the DRF views. Only useful under ASGI; the
+# async views are always reachable under their async/ URLs as well.
+ASYNC_USER_VIEWS = os.getenv("ASYNC_USER_VIEWS", "False") == "True"
+
+# Per-request instrumentation by RequestMetricsMiddleware. SAMPLE_RATE is the
+# share of requests whose queries and serializer/hashing time are measured;
+# all requests are timed. SERVER_TIMING returns the figures to clients in a
+# Server-Timing header. The Prometheus endpoint at api/v1/metrics/ requires
+# "Authorization: Bearer <TOKEN>" when TOKEN is set and is otherwise only
+# served with DEBUG on.
+REQUEST_METRICS = {
+    "SAMPLE_RATE": float(os.getenv("REQUEST_METRICS_SAMPLE_RATE", 1.0)),
+    "SERVER_TIMING": os.getenv(
+        "REQUEST_METRICS_SERVER_TIMING", str(SETTINGS_PROFILE == "dev")
+    )
+    == "True",
+    "TOKEN": os.getenv("METRICS_TOKEN"),
+}
+
+# Runs the test suite in one process per core by default; set
+# DJANGO_TEST_PROCESSES or pass --parallel to change it.
+TEST_RUNNER = "LibraryServiceAPI.test_runner.ParallelDiscoverRunner"
+
+# Rows validated and inserted together by the bulk user import.
+USER_IMPORT_BATCH_SIZE = 500
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -154,29 +347,121 @@ MEDIA_ROOT = BASE_DIR / "mediafiles"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Token revocations, token versions and replica pins are published to other
+# workers through the default cache, so every worker must share it. The
+# local memory default only suits a single process; users.E004 rejects it in
+# the prod profile. Any shared backend works, e.g. CACHE_BACKEND=
+# django.core.cache.backends.db.DatabaseCache with CACHE_LOCATION=cache_table
+# after manage.py createcachetable.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+# Build request.user from the signed token claims instead of loading the
+# User row on every request. Token versions are read through the cache, so
+# use a shared cache backend when running several workers.
+STATELESS_JWT_AUTH = os.getenv("STATELESS_JWT_AUTH", "False") == "True"
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
+# Seconds to keep the serialized GET /api/v1/users/me/ payload cached.
+# Set to 0 to disable the cache.
+USER_PROFILE_CACHE_TIMEOUT = 60 * 5
+
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly"
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        (
+            "users.authentication.StatelessJWTAuthentication"
+            if STATELESS_JWT_AUTH
+            else "users.authentication.JWTAuthentication"
+        ),
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "users.throttling.SlidingWindowAnonRateThrottle",
+        "users.throttling.SlidingWindowUserRateThrottle",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 50,
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/minute", "user": "30/minute"},
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "10/minute",
+        "user": "30/minute",
+        "register": "5/minute",
+        "token": "10/minute",
+        "me": "60/minute",
+    },
+    "DEFAULT_SCHEMA_CLASS": "users.schema.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "LibraryServiceAPI.renderers.ORJSONRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "LibraryServiceAPI.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+if SETTINGS_PROFILE == "dev":
+    # The browsable API is a development aid; elsewhere it only adds a
+    # template render path to content negotiation.
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "rest_framework.renderers.BrowsableAPIRenderer"
+    )
+
+if SETTINGS_PROFILE == "test":
+    # A rate of None lets every request through; throttling tests set the
+    # rates they exercise.
+    REST_FRAMEWORK["DEFAULT_THROTTLE_CLASSES"] = []
+    REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] = dict.fromkeys(
+        REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+    )
+
+# Counter store shared by the sliding-window throttles. The cache store needs
+# a cache shared by every worker to enforce limits across processes; on a
+# single host THROTTLE_STORE_PATH switches to a shared SQLite file instead.
+THROTTLE_STORE = {
+    "BACKEND": "users.throttling.CacheThrottleStore",
+    "OPTIONS": {},
+}
+if os.getenv("THROTTLE_STORE_PATH"):
+    THROTTLE_STORE = {
+        "BACKEND": "users.throttling.SQLiteThrottleStore",
+        "OPTIONS": {"path": os.getenv("THROTTLE_STORE_PATH")},
+    }
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=30),  # minutes=30
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.UserTokenObtainPairSerializer",
+    "TOKEN_USER_CLASS": "users.authentication.ClaimsUser",
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.UserTokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "users.serializers.UserTokenVerifySerializer",
 }
 
+# Revoked JWT IDs are mirrored into a per-process Bloom filter sized for
+# BLOOM_CAPACITY entries at BLOOM_ERROR_RATE. Revocations by other
+# processes are added as they happen, which needs the shared cache described
+# above CACHES; without it other workers only see them when their filter is
+# rebuilt in full every REFRESH_INTERVAL seconds. Run
+# manage.py purge_revoked_tokens periodically to drop expired entries.
+TOKEN_REVOCATION = {
+    "BLOOM_CAPACITY": 100_000,
+    "BLOOM_ERROR_RATE": 0.001,
+    "REFRESH_INTERVAL": 60,
+}
+
+# Where manage.py build_schema writes the OpenAPI schema served at
+# api/v1/doc/schema/, and how long clients may cache it.
+OPENAPI_SCHEMA_ROOT = BASE_DIR / "schema"
+OPENAPI_SCHEMA_MAX_AGE = 60 * 60 * 24
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Library Service API",
     "DESCRIPTION": "API for Library Service",
@@ -191,3 +476,14 @@ SPECTACULAR_SETTINGS = {
 }
 
 AUTH_USER_MODEL = "users.User"
+
+# Seconds a fresh interpreter may take to import wsgi.application in the
+# prod profile, the best of RUNS attempts. Enforced by manage.py
+# profile_imports --budget, and by the test suite when COLD_START_CHECK is
+# set. Otherwise the test suite allows TEST_BUDGET, loose enough for a busy
+# machine, to catch only gross regressions.
+COLD_START = {
+    "BUDGET": float(os.getenv("COLD_START_BUDGET", 1.0)),
+    "TEST_BUDGET": float(os.getenv("COLD_START_TEST_BUDGET", 3.0)),
+    "RUNS": int(os.getenv("COLD_START_RUNS", 3)),
+}
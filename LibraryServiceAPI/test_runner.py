@@ -0,0 +1,13 @@
+from django.test.runner import DiscoverRunner
+
+
+class ParallelDiscoverRunner(DiscoverRunner):
+    """
+    ``DiscoverRunner`` running one test process per core unless
+    ``--parallel`` says otherwise. ``DJANGO_TEST_PROCESSES`` caps the count.
+    """
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(parallel="auto")
@@ -16,49 +16,48 @@ Including another URLconf
 """
 
 from django.conf import settings
+from django.contrib import admin
 from django.conf.urls.static import static
-from django.contrib.auth.views import LogoutView
 from django.urls import path, include
-from debug_toolbar.toolbar import debug_toolbar_urls
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from rest_framework_simplejwt.views import (
+
+from LibraryServiceAPI.views import metrics, readiness, schema, swagger_ui
+from users.views import (
+    TokenLogoutView,
     TokenObtainPairView,
     TokenVerifyView,
     TokenRefreshView,
 )
 
-urlpatterns = (
-    [
-        path(
-            "api/v1/users/token/",
-            TokenObtainPairView.as_view(),
-            name="token_obtain_pair",
-        ),
-        path(
-            "api/v1/users/token/refresh/",
-            TokenRefreshView.as_view(),
-            name="token_refresh",
-        ),
-        path(
-            "api/v1/users/token/verify/",
-            TokenVerifyView.as_view(),
-            name="token_verify",
-        ),
-        path(
-            "api/v1/users/token/logout/",
-            LogoutView.as_view(),
-            name="token_logout",
-        ),
-        path(
-            "api/v1/doc/schema/", SpectacularAPIView.as_view(), name="schema"
-        ),
-        path(
-            "api/v1/doc/swagger/",
-            SpectacularSwaggerView.as_view(url_name="schema"),
-            name="swagger-ui",
-        ),
-        path("api/v1/users/", include("users.urls", namespace="users")),
-    ]
-    + debug_toolbar_urls()
-    + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-)
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path(
+        "api/v1/users/token/",
+        TokenObtainPairView.as_view(),
+        name="token_obtain_pair",
+    ),
+    path(
+        "api/v1/users/token/refresh/",
+        TokenRefreshView.as_view(),
+        name="token_refresh",
+    ),
+    path(
+        "api/v1/users/token/verify/",
+        TokenVerifyView.as_view(),
+        name="token_verify",
+    ),
+    path(
+        "api/v1/users/token/logout/",
+        TokenLogoutView.as_view(),
+        name="token_logout",
+    ),
+    path("api/v1/doc/schema/", schema, name="schema"),
+    path("api/v1/doc/swagger/", swagger_ui, name="swagger-ui"),
+    path("api/v1/users/", include("users.urls", namespace="users")),
+    path("api/v1/health/ready/", readiness, name="readiness"),
+    path("api/v1/metrics/", metrics, name="metrics"),
+] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    from debug_toolbar.toolbar import debug_toolbar_urls
+
+    urlpatterns += debug_toolbar_urls()
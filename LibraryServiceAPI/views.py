@@ -0,0 +1,215 @@
+import hashlib
+import hmac
+import logging
+from functools import cache
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+from rest_framework import status
+
+from LibraryServiceAPI.metrics import registry
+from users.hashing import hashing_pool_metrics
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CONTENT_TYPES = {
+    "json": "application/vnd.oai.openapi+json",
+    "yaml": "application/vnd.oai.openapi",
+}
+
+# Preferred first; each entry maps a content coding to its file suffix.
+SCHEMA_ENCODINGS = (("br", ".br"), ("gzip", ".gz"), ("identity", ""))
+
+# (path, mtime) -> (content, etag) of schema files already read.
+_schema_files: dict[tuple[str, float], tuple[bytes, str]] = {}
+
+
+def pool_stats() -> dict | None:
+    """Return saturation figures of the default database pool, if any."""
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    in_use = stats.get("pool_size", 0) - stats.get("pool_available", 0)
+    return {
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "size": stats.get("pool_size", 0),
+        "in_use": in_use,
+        "waiting": stats.get("requests_waiting", 0),
+        "saturation": in_use / pool.max_size,
+    }
+
+
+@never_cache
+@require_GET
+def readiness(request: HttpRequest) -> JsonResponse:
+    """
+    Readiness probe: 503 when the database is unreachable, or when every
+    pooled connection is in use and requests are queueing for one.
+    """
+    pool = pool_stats()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        database = "ok"
+    except DatabaseError:
+        # Error messages can name hosts, users and databases.
+        logger.exception("Readiness check could not reach the database.")
+        database = "unavailable"
+
+    ready = database == "ok" and not (
+        pool and pool["saturation"] >= 1 and pool["waiting"]
+    )
+    return JsonResponse(
+        {"ready": ready, "database": database, "pool": pool},
+        status=200 if ready else 503,
+    )
+
+
+def metrics_authorized(request: HttpRequest) -> bool:
+    token = settings.REQUEST_METRICS["TOKEN"]
+    if not token:
+        return settings.DEBUG
+    expected = f"Bearer {token}"
+    received = request.headers.get("Authorization", "")
+    return hmac.compare_digest(received.encode(), expected.encode())
+
+
+@never_cache
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    Prometheus scrape endpoint for the request metrics of this process,
+    plus database and hashing pool gauges.
+    """
+    if not metrics_authorized(request):
+        raise Http404
+    gauges = {}
+    for prefix, values in (
+        ("db_pool", pool_stats()),
+        ("password_hashing_pool", hashing_pool_metrics()),
+    ):
+        for name, value in (values or {}).items():
+            gauges[f"{prefix}_{name}"] = value
+    return HttpResponse(
+        registry.render(gauges),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def read_schema_file(path: Path) -> tuple[bytes, str] | None:
+    """Return the content and strong ETag of a built schema file."""
+    try:
+        key = (str(path), path.stat().st_mtime)
+    except FileNotFoundError:
+        return None
+    if key not in _schema_files:
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        _schema_files[key] = (content, f'"{digest}"')
+    return _schema_files[key]
+
+
+def schema_format(request: HttpRequest) -> str:
+    requested = request.GET.get("format")
+    if requested in ("json", "openapi-json"):
+        return "json"
+    if requested in ("yaml", "openapi"):
+        return "yaml"
+    accept = request.headers.get("Accept", "")
+    return "json" if "json" in accept and "yaml" not in accept else "yaml"
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """
+    The codings of ``SCHEMA_ENCODINGS`` an Accept-Encoding value allows.
+    Codings with q=0 are refused; identity is always served as a last resort.
+    """
+    qvalues = {}
+    for item in header.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        qvalue = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+        qvalues[coding] = qvalue
+    default = qvalues.pop("*", 0.0)
+    return {"identity"} | {
+        encoding
+        for encoding, _ in SCHEMA_ENCODINGS
+        if qvalues.get(encoding, default) > 0
+    }
+
+
+@require_GET
+def schema(request: HttpRequest) -> HttpResponse:
+    """
+    Serve the OpenAPI schema built by ``manage.py build_schema``.
+
+    Pre-compressed variants are picked from Accept-Encoding and every
+    variant carries a strong ETag. Without built files the schema is
+    generated live in DEBUG and reported unavailable otherwise.
+    """
+    output_format = schema_format(request)
+    path = Path(settings.OPENAPI_SCHEMA_ROOT) / f"schema.{output_format}"
+    accepted = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+
+    for encoding, suffix in SCHEMA_ENCODINGS:
+        if encoding not in accepted:
+            continue
+        variant = read_schema_file(path.with_name(path.name + suffix))
+        if variant is not None:
+            break
+    else:
+        if settings.DEBUG:
+            from drf_spectacular.views import SpectacularAPIView
+
+            return SpectacularAPIView.as_view()(request)
+        return JsonResponse(
+            {"detail": "The API schema has not been built."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+    content, etag = variant
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = HttpResponse(
+            content, content_type=SCHEMA_CONTENT_TYPES[output_format]
+        )
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+    response["ETag"] = etag
+    patch_cache_control(
+        response, public=True, max_age=settings.OPENAPI_SCHEMA_MAX_AGE
+    )
+    patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+    return response
+
+
+@cache
+def swagger_ui_view():
+    # drf-spectacular loads its schema generator; import it on first use
+    # rather than with the URLconf.
+    from drf_spectacular.views import SpectacularSwaggerView
+
+    return SpectacularSwaggerView.as_view(url_name="schema")
+
+
+def swagger_ui(request: HttpRequest) -> HttpResponse:
+    """Swagger UI for the schema served by ``schema``."""
+    return swagger_ui_view()(request)
@@ -1,3 +1,245 @@
+"""
+Admin for a users table too large to count or page through with OFFSET.
+
+* Result counts are estimates: planner statistics on PostgreSQL, a cached
+  count of the table or a capped count of a filtered changelist elsewhere.
+  Small results are counted exactly.
+* The changelist seeks over ``(date_joined, id)`` with the cursors of the
+  API pagination instead of numbered pages.
+* Searches only run lookups that one of ``User.Meta.indexes`` or
+  ``unique_email_ci`` can serve, and groups and permissions are picked
+  through autocomplete widgets rather than rendered in full.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Optional
+
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.auth import forms as auth_forms
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+
+from users.models import User
+from users.cursors import encode_cursor, seek_after
+
+# Counts up to this many rows are exact; larger ones are estimated.
+EXACT_COUNT_LIMIT = 10_000
+# Seconds a counted table size is reused outside PostgreSQL.
+TABLE_COUNT_TIMEOUT = 300
+
+CURSOR_VAR = "cursor"
+
+
+def planner_estimate(queryset: QuerySet) -> Optional[int]:
+    """Rows PostgreSQL expects ``queryset`` to return; None if unknown."""
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 until the table is first vacuumed or analyzed.
+            return row[0] if row and row[0] >= 0 else None
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimated_count(queryset: QuerySet) -> int:
+    """
+    Number of rows of ``queryset``, exact below ``EXACT_COUNT_LIMIT``.
+
+    Outside PostgreSQL the whole table is counted once per
+    ``TABLE_COUNT_TIMEOUT`` and filtered querysets stop counting at the
+    limit.
+    """
+    queryset = queryset.order_by()
+    if connections[queryset.db].vendor == "postgresql":
+        estimate = planner_estimate(queryset)
+        if estimate is not None and estimate > EXACT_COUNT_LIMIT:
+            return estimate
+        return queryset.count()
+    if queryset.query.where:
+        return queryset[: EXACT_COUNT_LIMIT + 1].count()
+    return cache.get_or_set(
+        f"admin:count:{queryset.db}:{queryset.model._meta.db_table}",
+        queryset.count,
+        TABLE_COUNT_TIMEOUT,
+    )
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self) -> int:
+        return estimated_count(self.object_list)
+
+
+class UserChangeList(ChangeList):
+    """
+    Changelist paged by cursor: ``next_url`` continues after the last row
+    shown and ``first_url`` returns to the start.
+    """
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_ordering(self, request, queryset):
+        # The seek needs this order; sortable_by hides the column links but
+        # hand-written "o" parameters would otherwise still apply.
+        return list(self.model_admin.ordering)
+
+    def get_results(self, request):
+        paginator = self.model_admin.get_paginator(
+            request, self.queryset, self.list_per_page
+        )
+        queryset = self.queryset
+        cursor = request.GET.get(CURSOR_VAR)
+        if cursor:
+            try:
+                queryset = seek_after(queryset, cursor)
+            except NotFound:
+                raise IncorrectLookupParameters
+        # One extra row tells whether there is a next page.
+        rows = list(queryset[: self.list_per_page + 1])
+        has_next = len(rows) > self.list_per_page
+        self.result_list = rows[: self.list_per_page]
+
+        self.result_count = paginator.count
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = has_next or bool(cursor)
+        self.paginator = paginator
+
+        self.next_url = None
+        if has_next:
+            last = self.result_list[-1]
+            self.next_url = self.get_query_string(
+                {CURSOR_VAR: encode_cursor(last.date_joined, last.pk)}
+            )
+        self.first_url = (
+            self.get_query_string(remove=[CURSOR_VAR]) if cursor else None
+        )
+
+
+class UserChangeForm(auth_forms.UserChangeForm):
+    class Meta:
+        model = User
+        fields = "__all__"
+        # UsernameField cannot normalize the None of a blank username.
+        field_classes = {}
+
+
+class UserCreationForm(auth_forms.BaseUserCreationForm):
+    class Meta:
+        model = User
+        fields = ("email",)
+
+
+@admin.register(User)
+class UserAdmin(BaseUserAdmin):
+    fieldsets = (
+        (None, {"fields": ("email", "password")}),
+        (
+            _("Personal info"),
+            {"fields": ("username", "first_name", "last_name")},
+        ),
+        (
+            _("Permissions"),
+            {
+                "fields": (
+                    "is_active",
+                    "is_staff",
+                    "is_superuser",
+                    "groups",
+                    "user_permissions",
+                ),
+            },
+        ),
+        (_("Important dates"), {"fields": ("last_login", "date_joined")}),
+    )
+    add_fieldsets = (
+        (
+            None,
+            {
+                "classes": ("wide",),
+                "fields": (
+                    "email",
+                    "usable_password",
+                    "password1",
+                    "password2",
+                ),
+            },
+        ),
+    )
+    form = UserChangeForm
+    add_form = UserCreationForm
+    list_display = (
+        "email",
+        "username",
+        "first_name",
+        "last_name",
+        "is_staff",
+        "date_joined",
+    )
+    list_filter = ("is_staff", "is_superuser", "is_active")
+    # Prefixes of the username and (last_name, first_name) indexes and the
+    # email of unique_email_ci; see get_search_results().
+    search_fields = ("^username", "^last_name", "=email")
+    ordering = ("date_joined", "id")
+    sortable_by = ()
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    paginator = EstimatedCountPaginator
+    filter_horizontal = ()
+    autocomplete_fields = ("groups", "user_permissions")
+
+    def get_changelist(self, request, **kwargs):
+        return UserChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match an email exactly, ignoring case, or otherwise a prefix of the
+        last name or username as ``UserManager.search_prefix`` does.
+
+        The stock search ORs ``icontains`` over every field, which no
+        btree index can serve.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if "@" in term:
+            return queryset.filter(email__lower=term.lower()), False
+        return queryset & User.objects.search_prefix(term), False
+
+
+@admin.register(Permission)
+class PermissionAdmin(admin.ModelAdmin):
+    list_display = ("name", "content_type", "codename")
+    list_select_related = ("content_type",)
+    search_fields = ("name", "codename")
+    ordering = ("content_type__app_label", "content_type__model", "codename")
 
-# Register your models here.
+    def get_queryset(self, request):
+        # Permission.__str__ reads the content type.
+        return super().get_queryset(request).select_related("content_type")
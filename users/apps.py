@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CustomerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "users"
+
+    def ready(self):
+        from users import checks  # noqa: F401
+        from users.search import create_unmigrated_search_index
+
+        post_migrate.connect(create_unmigrated_search_index, sender=self)
@@ -0,0 +1,220 @@
+"""
+Native async versions of the users endpoints.
+
+They run on the event loop under ASGI, use the async ORM, and hand password
+hashing to the bounded process pool in ``users.hashing``, answering 429 when
+it is saturated. Routed in place of the sync views when
+``settings.ASYNC_USER_VIEWS`` is set, and always under their ``async/`` URLs.
+"""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    JsonResponse,
+    QueryDict,
+)
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+from rest_framework import exceptions, status
+from rest_framework.settings import api_settings
+
+from users.authentication import (
+    ClaimsUser,
+    aresolve_user,
+    cache_token_version,
+)
+from users.cache import cache_profile, get_cached_profile
+from users.hashing import HashingPoolSaturated, get_hashing_pool
+from users.models import User
+from users.serializers import (
+    UserCreateSerializer,
+    UserManageSerializer,
+    UserPasswordUpdateSerializer,
+    UserUpdateSerializer,
+)
+from users.throttling import SlidingWindowScopedRateThrottle
+
+
+def parse_body(request: HttpRequest) -> dict:
+    if request.content_type == "application/json":
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError as exc:
+            raise exceptions.ParseError(f"JSON parse error - {exc}")
+    return QueryDict(request.body, encoding=request.encoding)
+
+
+def error_response(exc: exceptions.APIException) -> JsonResponse:
+    detail = exc.detail
+    if not isinstance(detail, dict):
+        detail = {"detail": detail}
+    response = JsonResponse(detail, status=exc.status_code)
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = str(int(exc.wait))
+    return response
+
+
+def saturated_response() -> JsonResponse:
+    response = JsonResponse(
+        {"detail": "Too many password operations in progress."},
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+    )
+    response["Retry-After"] = "1"
+    return response
+
+
+@sync_to_async
+def authenticate(request: HttpRequest) -> User | ClaimsUser:
+    """Authenticate with the configured DRF authentication classes."""
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = authentication_class().authenticate(request)
+        if result is not None:
+            return result[0]
+    raise exceptions.NotAuthenticated
+
+
+@sync_to_async
+def check_throttle(
+    request: HttpRequest, user: User | ClaimsUser | AnonymousUser, scope: str
+) -> None:
+    """Apply the sliding-window throttle of ``scope`` like a DRF view."""
+    throttle = SlidingWindowScopedRateThrottle()
+    view = SimpleNamespace(throttle_scope=scope)
+    if not throttle.allow_request(
+        SimpleNamespace(user=user, META=request.META), view
+    ):
+        raise exceptions.Throttled(throttle.wait())
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def register(request: HttpRequest) -> JsonResponse:
+    """Async counterpart of ``UserCreateView``."""
+    try:
+        await check_throttle(request, AnonymousUser(), "register")
+        serializer = UserCreateSerializer(data=parse_body(request))
+    except exceptions.APIException as exc:
+        return error_response(exc)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(
+            serializer.errors, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    data = serializer.validated_data
+    try:
+        password = await get_hashing_pool().make_password(data.pop("password"))
+    except HashingPoolSaturated:
+        return saturated_response()
+
+    user = User(
+        email=User.objects.normalize_email(data.pop("email")),
+        password=password,
+        **data,
+    )
+    await user.asave()
+    return JsonResponse(
+        UserCreateSerializer(user).data, status=status.HTTP_201_CREATED
+    )
+
+
+@csrf_exempt
+@require_http_methods(["PUT", "PATCH"])
+async def password_update(request: HttpRequest) -> JsonResponse:
+    """Async counterpart of ``UserPasswordUpdateView``."""
+    try:
+        user = await authenticate(request)
+        # The default anon and user throttles of UserPasswordUpdateView.
+        await check_throttle(request, user, "user")
+        user = await aresolve_user(user)
+        serializer = UserPasswordUpdateSerializer(
+            user, data=parse_body(request), partial=request.method == "PATCH"
+        )
+    except exceptions.APIException as exc:
+        return error_response(exc)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(
+            serializer.errors, status=status.HTTP_400_BAD_REQUEST
+        )
+    if "password" not in serializer.validated_data:
+        return JsonResponse({})
+
+    try:
+        user.password = await get_hashing_pool().make_password(
+            serializer.validated_data["password"]
+        )
+    except HashingPoolSaturated:
+        return saturated_response()
+
+    await user.asave(update_fields=["password"])
+    cache_token_version(user)
+    return JsonResponse({})
+
+
+async def retrieve_profile(
+    request: HttpRequest, user: User | ClaimsUser
+) -> HttpResponse:
+    entry = get_cached_profile(user.pk)
+    if entry is None:
+        serializer = UserManageSerializer(await aresolve_user(user))
+        entry = cache_profile(user.pk, serializer.data)
+    payload, etag = entry
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse(payload)
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Authorization",))
+    return response
+
+
+@csrf_exempt
+@require_http_methods(["GET", "PUT", "PATCH", "DELETE"])
+async def me(request: HttpRequest) -> HttpResponse:
+    """Async counterpart of ``ManageUserView``."""
+    try:
+        user = await authenticate(request)
+        await check_throttle(request, user, "me")
+        if request.method == "GET":
+            return await retrieve_profile(request, user)
+        user = await aresolve_user(user)
+        if request.method == "DELETE":
+            await user.adelete()
+            return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+        serializer = UserUpdateSerializer(
+            user, data=parse_body(request), partial=request.method == "PATCH"
+        )
+    except exceptions.APIException as exc:
+        return error_response(exc)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(
+            serializer.errors, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    for attr, value in serializer.validated_data.items():
+        setattr(user, attr, value)
+    await user.asave()
+    return JsonResponse(UserUpdateSerializer(user).data)
+
+
+@require_GET
+async def hashing_metrics(request: HttpRequest) -> JsonResponse:
+    """Report the state of the password hashing pool to staff users."""
+    try:
+        user = await authenticate(request)
+    except exceptions.APIException as exc:
+        return error_response(exc)
+    if not user.is_staff:
+        return error_response(exceptions.PermissionDenied())
+    return JsonResponse(get_hashing_pool().metrics())
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from LibraryServiceAPI.routers import apply_user_pin
+from users.cache import token_version_cache_key
+from users.models import User
+from users.revocation import is_token_revoked
+
+TOKEN_VERSION_CLAIM = "ver"
+
+
+def get_token_version(user_id: int) -> Optional[int]:
+    """
+    Return the current token version of an active user, or None if there
+    is no such user. Served from the cache, falling back to the database.
+    """
+    key = token_version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            User.objects.filter(pk=user_id, is_active=True)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is None:
+            return None
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def cache_token_version(user: User) -> None:
+    """Publish the user's current token version to the cache."""
+    cache.set(
+        token_version_cache_key(user.pk),
+        user.token_version,
+        settings.TOKEN_VERSION_CACHE_TIMEOUT,
+    )
+
+
+def check_token_version(validated_token: Token, current: int) -> None:
+    if validated_token.get(TOKEN_VERSION_CLAIM, 0) != current:
+        raise AuthenticationFailed(
+            _("The user's password has been changed."),
+            code="password_changed",
+        )
+
+
+def check_token_revoked(validated_token: Token) -> None:
+    if is_token_revoked(validated_token):
+        raise InvalidToken(_("Token has been revoked"))
+
+
+class ClaimsUser(TokenUser):
+    """
+    Lightweight user built from the signed token claims.
+
+    The full ``User`` row is only loaded when ``get_db_user`` is called.
+    """
+
+    @cached_property
+    def email(self) -> str:
+        return self.token.get("email", "")
+
+    @cached_property
+    def token_version(self) -> int:
+        return self.token.get(TOKEN_VERSION_CLAIM, 0)
+
+    def get_db_user(self) -> User:
+        """Load and memoize the ``User`` row behind the token."""
+        if "_db_user" not in self.__dict__:
+            try:
+                self._db_user = User.objects.get(pk=self.id, is_active=True)
+            except User.DoesNotExist:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                )
+        return self._db_user
+
+    async def aget_db_user(self) -> User:
+        """Async version of ``get_db_user``."""
+        if "_db_user" not in self.__dict__:
+            try:
+                self._db_user = await User.objects.aget(
+                    pk=self.id, is_active=True
+                )
+            except User.DoesNotExist:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                )
+        return self._db_user
+
+
+def resolve_user(user: User | ClaimsUser) -> User:
+    """Return the ``User`` model instance for an authenticated user."""
+    if isinstance(user, ClaimsUser):
+        return user.get_db_user()
+    return user
+
+
+async def aresolve_user(user: User | ClaimsUser) -> User:
+    """Async version of ``resolve_user``."""
+    if isinstance(user, ClaimsUser):
+        return await user.aget_db_user()
+    return user
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    Database-backed JWT authentication that also rejects revoked tokens and
+    tokens issued before the user's last password change.
+    """
+
+    def get_user(self, validated_token: Token) -> User:
+        check_token_revoked(validated_token)
+        apply_user_pin(validated_token.get(api_settings.USER_ID_CLAIM))
+        user = super().get_user(validated_token)
+        check_token_version(validated_token, user.token_version)
+        return user
+
+
+class StatelessJWTAuthentication(
+    authentication.JWTStatelessUserAuthentication
+):
+    """
+    JWT authentication that builds the user from the token claims instead of
+    selecting the ``User`` row on every request.
+
+    Only the token version is looked up, and that goes through the cache;
+    revocation is checked against the in-process revocation list.
+    """
+
+    def get_user(self, validated_token: Token) -> ClaimsUser:
+        check_token_revoked(validated_token)
+        user = super().get_user(validated_token)
+        apply_user_pin(user.id)
+        current = get_token_version(user.id)
+        if current is None:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        check_token_version(validated_token, current)
+        return user
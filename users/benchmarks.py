@@ -0,0 +1,189 @@
+"""
+In-process latency benchmarks of the users API, driven by ``manage.py bench``.
+
+Every scenario sends its requests through ``APIClient``, so the full
+middleware, authentication and serialization stack is measured without a
+network. Per-request setup, such as minting a token, happens outside the
+timed section. Throttling is disabled while the benchmarks run.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from users.models import User
+from users.serializers import UserTokenObtainPairSerializer
+
+PASSWORD = "bench!23password"
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Return p50/p95/p99 of ``samples`` (seconds) in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        f"p{percent}": ordered[
+            min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        ]
+        * 1000
+        for percent in (50, 95, 99)
+    }
+
+
+@dataclass
+class Scenario:
+    """
+    One benchmarked endpoint.
+
+    ``prepare(i)`` returns the keyword arguments of the ``i``-th request
+    and runs untimed; ``send`` issues it and returns the response.
+    """
+
+    name: str
+    prepare: Callable[[int], dict]
+    send: Callable[..., Any]
+    expected_status: int = 200
+
+
+class APIBenchmark:
+    """Seeds users and measures each scenario ``iterations`` times."""
+
+    def __init__(self, users: int = 100, iterations: int = 100) -> None:
+        self.users = users
+        self.iterations = iterations
+        self.client = APIClient()
+
+    def seed(self) -> None:
+        with transaction.atomic():
+            for number in range(self.users):
+                User.objects.create_user(
+                    email=f"user{number}@bench.example.com",
+                    first_name="Bench",
+                    last_name=f"User{number}",
+                )
+            self.user = User.objects.create_user(
+                email="bench@example.com", password=PASSWORD
+            )
+
+    def tokens(self) -> dict[str, str]:
+        """Mint a token pair for the current state of the bench user."""
+        self.user.refresh_from_db()
+        refresh = UserTokenObtainPairSerializer.get_token(self.user)
+        return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+    def authenticated(self, access: str) -> dict:
+        return {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+
+    def scenarios(self) -> list[Scenario]:
+        client = self.client
+        access = self.tokens()["access"]
+        return [
+            Scenario(
+                "register",
+                lambda i: {
+                    "data": {
+                        "email": f"new{i}@bench.example.com",
+                        "password": PASSWORD,
+                    }
+                },
+                lambda **kw: client.post(reverse("users:register"), **kw),
+                expected_status=201,
+            ),
+            Scenario(
+                "token obtain",
+                lambda i: {
+                    "data": {
+                        "email": "bench@example.com",
+                        "password": PASSWORD,
+                    }
+                },
+                lambda **kw: client.post(reverse("token_obtain_pair"), **kw),
+            ),
+            Scenario(
+                "token refresh",
+                lambda i: {"data": {"refresh": self.tokens()["refresh"]}},
+                lambda **kw: client.post(reverse("token_refresh"), **kw),
+            ),
+            Scenario(
+                "token verify",
+                lambda i: {"data": {"token": access}},
+                lambda **kw: client.post(reverse("token_verify"), **kw),
+            ),
+            Scenario(
+                "me GET",
+                lambda i: self.authenticated(access),
+                lambda **kw: client.get(reverse("users:me"), **kw),
+            ),
+            Scenario(
+                "me PATCH",
+                lambda i: {
+                    "data": {"first_name": f"Bench{i}"},
+                    **self.authenticated(access),
+                },
+                lambda **kw: client.patch(reverse("users:me"), **kw),
+            ),
+            # Runs last: every password change revokes the tokens above.
+            Scenario(
+                "password update",
+                lambda i: {
+                    "data": {"password": PASSWORD},
+                    **self.authenticated(self.tokens()["access"]),
+                },
+                lambda **kw: client.put(reverse("users:password"), **kw),
+            ),
+        ]
+
+    def measure(self, scenario: Scenario) -> dict[str, Any]:
+        samples, queries = [], []
+        errors = 0
+        for i in range(self.iterations):
+            kwargs = scenario.prepare(i)
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                response = scenario.send(**kwargs)
+                samples.append(time.perf_counter() - start)
+            queries.append(len(context.captured_queries))
+            if response.status_code != scenario.expected_status:
+                errors += 1
+        return {
+            **{
+                f"{key}_ms": value
+                for key, value in percentiles(samples).items()
+            },
+            "mean_ms": sum(samples) / len(samples) * 1000,
+            "throughput_rps": len(samples) / sum(samples),
+            "queries_mean": sum(queries) / len(queries),
+            "queries_max": max(queries),
+            "errors": errors,
+        }
+
+    def run(
+        self,
+        only: Optional[Iterable[str]] = None,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> dict[str, dict]:
+        """Seed the database and return the results of each scenario."""
+        self.seed()
+        only = set(only) if only else None
+        results = {}
+        with mock.patch.object(
+            SimpleRateThrottle,
+            "THROTTLE_RATES",
+            defaultdict(lambda: None),
+        ):
+            for scenario in self.scenarios():
+                if only is not None and scenario.name not in only:
+                    continue
+                if progress is not None:
+                    progress(scenario.name)
+                results[scenario.name] = self.measure(scenario)
+        return results
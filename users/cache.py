@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Bump whenever the UserManageSerializer output changes so that stale
+# payloads cached by a previous release are never served.
+PROFILE_CACHE_VERSION = 1
+
+# User columns in the cached payload, i.e. UserManageSerializer.Meta.fields.
+# Saves that touch none of them leave the cache entry in place.
+PROFILE_FIELDS = frozenset(
+    {"id", "email", "username", "is_staff", "first_name", "last_name"}
+)
+
+
+def profile_cache_key(user_id: int) -> str:
+    return f"users:profile:{user_id}"
+
+
+def make_etag(payload: dict) -> str:
+    """Build a strong ETag from a serialized payload."""
+    content = json.dumps(payload, sort_keys=True, default=str).encode()
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def get_cached_profile(user_id: int) -> Optional[tuple[dict, str]]:
+    """Return the cached ``(payload, etag)`` pair for a user, if any."""
+    if not settings.USER_PROFILE_CACHE_TIMEOUT:
+        return None
+    return cache.get(profile_cache_key(user_id), version=PROFILE_CACHE_VERSION)
+
+
+def cache_profile(user_id: int, payload: dict) -> tuple[dict, str]:
+    """Cache a serialized profile and return it with its ETag."""
+    entry = (dict(payload), make_etag(payload))
+    if settings.USER_PROFILE_CACHE_TIMEOUT:
+        cache.set(
+            profile_cache_key(user_id),
+            entry,
+            settings.USER_PROFILE_CACHE_TIMEOUT,
+            version=PROFILE_CACHE_VERSION,
+        )
+    return entry
+
+
+def invalidate_profile(user_id: int) -> None:
+    cache.delete(profile_cache_key(user_id), version=PROFILE_CACHE_VERSION)
+
+
+def token_version_cache_key(user_id: int) -> str:
+    return f"users:token_version:{user_id}"
+
+
+def invalidate_token_version(user_id: int) -> None:
+    cache.delete(token_version_cache_key(user_id))
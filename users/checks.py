@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.checks import Error, register
+from django.urls import NoReverseMatch, reverse
+
+# Middleware that instruments every request and must stay out of the
+# production request path.
+PROFILING_MIDDLEWARE = (
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "silk.middleware.SilkyMiddleware",
+    "pyinstrument.middleware.ProfilerMiddleware",
+)
+
+PRODUCTION_PROFILES = ("prod", "bench")
+
+# Cache backends private to one process. Revocations, token versions and
+# replica pins published through them never reach the other workers.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+# Middleware the admin relies on, which may run from MIDDLEWARE_SCOPES rather
+# than MIDDLEWARE.
+ADMIN_MIDDLEWARE = (
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+)
+
+
+@register()
+def check_production_profile(app_configs, **kwargs) -> list[Error]:
+    """Refuse to start a production-like profile with debugging enabled."""
+    if settings.SETTINGS_PROFILE not in PRODUCTION_PROFILES:
+        return []
+
+    sources = {"MIDDLEWARE": settings.MIDDLEWARE}
+    for prefix, scoped in getattr(settings, "MIDDLEWARE_SCOPES", {}).items():
+        sources[f"MIDDLEWARE_SCOPES[{prefix!r}]"] = scoped
+    errors = [
+        Error(
+            f"{path} is enabled in the {settings.SETTINGS_PROFILE!r} "
+            "settings profile.",
+            hint=f"Remove it from {source}.",
+            id="users.E001",
+        )
+        for source, middleware in sources.items()
+        for path in PROFILING_MIDDLEWARE
+        if path in middleware
+    ]
+    if settings.DEBUG:
+        errors.append(
+            Error(
+                f"DEBUG is enabled in the {settings.SETTINGS_PROFILE!r} "
+                "settings profile.",
+                id="users.E002",
+            )
+        )
+    return errors
+
+
+@register()
+def check_admin_middleware(app_configs, **kwargs) -> list[Error]:
+    """Require the admin's middleware to run for the admin URLs."""
+    try:
+        admin_path = reverse("admin:index")
+    except NoReverseMatch:
+        return []
+
+    middleware = list(settings.MIDDLEWARE)
+    if "LibraryServiceAPI.middleware.RouteScopedMiddleware" in middleware:
+        scopes = getattr(settings, "MIDDLEWARE_SCOPES", {})
+        prefixes = [
+            prefix for prefix in scopes if admin_path.startswith(prefix)
+        ]
+        if prefixes:
+            middleware += scopes[max(prefixes, key=len)]
+    return [
+        Error(
+            f"{required} does not run for the admin at {admin_path}.",
+            hint="Add it to MIDDLEWARE or to the MIDDLEWARE_SCOPES entry "
+            "serving the admin.",
+            id="users.E003",
+        )
+        for required in ADMIN_MIDDLEWARE
+        if required not in middleware
+    ]
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs) -> list[Error]:
+    """Require a default cache shared by every worker in production."""
+    if settings.SETTINGS_PROFILE != "prod":
+        return []
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Error(
+            f"The default cache {backend} is private to each worker, so "
+            "token revocations and replica pins do not reach the others.",
+            hint="Set CACHE_BACKEND and CACHE_LOCATION to a shared cache.",
+            id="users.E004",
+        )
+    ]
@@ -0,0 +1,41 @@
+"""
+Cursors over ``(date_joined, id)``, shared by the API pagination and the
+admin changelist.
+
+Kept apart from ``users.pagination`` so that the admin, loaded on every
+start, does not import DRF's pagination and serializers with it.
+"""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q, QuerySet
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+
+
+def encode_cursor(date_joined: datetime, pk: int) -> str:
+    raw = f"{date_joined.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date_joined, pk = raw.decode().split("|")
+        return datetime.fromisoformat(date_joined), int(pk)
+    except (TypeError, ValueError):
+        raise NotFound(_("Invalid cursor."))
+
+
+def seek_after(queryset: QuerySet, cursor: str) -> QuerySet:
+    """Rows of ``queryset`` after the one ``cursor`` was made from."""
+    date_joined, pk = decode_cursor(cursor)
+    # The redundant lower bound lets the planner start the index scan at the
+    # cursor instead of filtering from the beginning.
+    return queryset.filter(
+        Q(date_joined__gt=date_joined) | Q(date_joined=date_joined, id__gt=pk),
+        date_joined__gte=date_joined,
+    )
@@ -0,0 +1,111 @@
+"""
+Password hasher with per-deployment cost, and deferred hash upgrades.
+
+``TunableArgon2PasswordHasher`` reads its Argon2 parameters from
+``settings.PASSWORD_HASHING_COST`` so each deployment can size them to its
+hardware (see ``manage.py calibrate_password_hasher``). It keeps Django's
+``argon2`` algorithm name, so existing hashes stay valid and are upgraded
+once the configured cost changes.
+
+Hashes needing an upgrade, including legacy PBKDF2 and bcrypt hashes, are
+recomputed after a successful login in a background thread instead of
+inside the login request.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import Argon2PasswordHasher, make_password
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with the cost taken from ``PASSWORD_HASHING_COST``."""
+
+    @property
+    def time_cost(self) -> int:
+        return settings.PASSWORD_HASHING_COST["TIME_COST"]
+
+    @property
+    def memory_cost(self) -> int:
+        return settings.PASSWORD_HASHING_COST["MEMORY_COST"]
+
+    @property
+    def parallelism(self) -> int:
+        return settings.PASSWORD_HASHING_COST["PARALLELISM"]
+
+
+def rehash_password(
+    user_id: int, raw_password: str, encoded: str, using: str
+) -> Optional[str]:
+    """
+    Store a fresh hash of ``raw_password`` for the user.
+
+    The update only applies while the stored hash is still ``encoded``, so
+    a password changed in the meantime is left alone. Return the new hash,
+    or ``None`` when it was not stored.
+    """
+    new_encoded = make_password(raw_password)
+    updated = (
+        get_user_model()
+        ._default_manager.using(using)
+        .filter(pk=user_id, password=encoded)
+        .update(password=new_encoded)
+    )
+    return new_encoded if updated else None
+
+
+def rehash_in_background(
+    user_id: int, raw_password: str, encoded: str, using: str
+) -> None:
+    try:
+        rehash_password(user_id, raw_password, encoded, using)
+    except Exception:
+        logger.exception("Failed to upgrade the password hash of %s.", user_id)
+    finally:
+        # Connections belong to the worker thread; don't keep them open.
+        connections.close_all()
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_rehash_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_REHASH["WORKERS"],
+                thread_name_prefix="password-rehash",
+            )
+        return _executor
+
+
+def schedule_rehash(user, raw_password: str) -> None:
+    """
+    Upgrade the password hash of ``user``, which was just verified.
+
+    With ``PASSWORD_REHASH["ASYNC"]`` the work is handed to a thread pool
+    once the current transaction commits; otherwise it runs inline.
+    """
+    if user.pk is None:
+        return
+    args = (user.pk, raw_password, user.password, user._state.db)
+    if not settings.PASSWORD_REHASH["ASYNC"]:
+        encoded = rehash_password(*args)
+        if encoded is not None:
+            user.password = encoded
+        return
+    transaction.on_commit(
+        lambda: get_rehash_executor().submit(rehash_in_background, *args),
+        using=user._state.db,
+    )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+from LibraryServiceAPI.metrics import timed
+
+
+class HashingPoolSaturated(Exception):
+    """Raised when every worker is busy and the queue limit is reached."""
+
+
+def init_worker() -> None:
+    """Configure Django in a freshly spawned hashing worker."""
+    if not settings.configured:
+        django.setup()
+
+
+def hash_password(password: str) -> str:
+    """Hash a raw password in a worker process."""
+    return make_password(password)
+
+
+class HashingPool:
+    """
+    Bounded process pool that runs password hashing off the event loop.
+
+    At most ``max_workers`` passwords are hashed at once and at most
+    ``queue_limit`` more may wait for a worker; anything beyond that is
+    rejected with ``HashingPoolSaturated`` so callers can shed load.
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int) -> None:
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._seconds = 0.0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker,
+                )
+            return self._executor
+
+    def _acquire(self, count: int = 1, timeout: float = 0) -> None:
+        """Take ``count`` slots, waiting up to ``timeout`` seconds."""
+        limit = self.max_workers + self.queue_limit
+        with self._slot_freed:
+            if not self._slot_freed.wait_for(
+                lambda: self._pending + count <= limit, timeout
+            ):
+                self._rejected += count
+                raise HashingPoolSaturated
+            self._pending += count
+
+    def _release(self, seconds: float, failed: bool, count: int = 1) -> None:
+        with self._slot_freed:
+            self._pending -= count
+            self._seconds += seconds
+            if failed:
+                self._failed += count
+            else:
+                self._completed += count
+            self._slot_freed.notify_all()
+
+    async def make_password(self, password: str) -> str:
+        """Hash ``password`` in the pool without blocking the event loop."""
+        self._acquire()
+        start = time.perf_counter()
+        failed = True
+        try:
+            with timed("hashing"):
+                encoded = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, hash_password, password
+                )
+            failed = False
+            return encoded
+        finally:
+            self._release(time.perf_counter() - start, failed)
+
+    def hash_passwords(
+        self, passwords: list[str], timeout: float = 0
+    ) -> list[str]:
+        """
+        Hash ``passwords`` in the pool from synchronous code, at most
+        ``max_workers`` at a time. Each group waits up to ``timeout``
+        seconds for free slots.
+        """
+        hashed: list[str] = []
+        size = max(self.max_workers, 1)
+        for start in range(0, len(passwords), size):
+            group = passwords[start : start + size]
+            self._acquire(len(group), timeout)
+            begin = time.perf_counter()
+            failed = True
+            try:
+                with timed("hashing"):
+                    hashed += self.executor.map(hash_password, group)
+                failed = False
+            finally:
+                self._release(time.perf_counter() - begin, failed, len(group))
+        return hashed
+
+    def metrics(self) -> dict:
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": min(self._pending, self.max_workers),
+                "queued": max(self._pending - self.max_workers, 0),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_seconds": self._seconds / finished if finished else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+_pool: Optional[HashingPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool() -> HashingPool:
+    """Return the process-wide hashing pool configured from settings."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            config = settings.PASSWORD_HASHING_POOL
+            _pool = HashingPool(
+                max_workers=config["MAX_WORKERS"],
+                queue_limit=config["QUEUE_LIMIT"],
+            )
+        return _pool
+
+
+def hashing_pool_metrics() -> Optional[dict]:
+    """Return the metrics of the hashing pool without creating it."""
+    pool = _pool
+    return pool.metrics() if pool is not None else None
@@ -0,0 +1,250 @@
+"""
+Bulk creation of users from CSV or JSON Lines input.
+
+Rows are validated one by one with ``UserImportSerializer``; uniqueness of
+emails and usernames is checked once per batch, passwords are hashed in
+parallel on a process pool and users are inserted with ``bulk_create``.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Union
+
+from django.db import IntegrityError, transaction
+
+from LibraryServiceAPI.metrics import timed
+from users.hashing import HashingPool, hash_password
+from users.models import User, UserSearchDocument
+from users.serializers import UserImportSerializer
+
+USERNAME_TAKEN = "A user with that username already exists."
+EMAIL_TAKEN = "A user with that email address already exists."
+
+
+class RowParseError(Exception):
+    """An input line that could not be decoded into a row."""
+
+
+Row = Union[dict, RowParseError]
+
+
+class _LineDecoder:
+    """
+    Iterate over ``lines`` as text. A line that is not UTF-8 raises
+    ``UnicodeDecodeError`` and is dropped; iteration resumes after it.
+    """
+
+    def __init__(self, lines: Iterable[Union[str, bytes]]) -> None:
+        self.lines = iter(lines)
+        self.line_num = 0
+
+    def __iter__(self) -> _LineDecoder:
+        return self
+
+    def __next__(self) -> str:
+        line = next(self.lines)
+        self.line_num += 1
+        return line.decode("utf-8") if isinstance(line, bytes) else line
+
+    def error(self, exc: Exception) -> RowParseError:
+        if isinstance(exc, UnicodeDecodeError):
+            return RowParseError(f"Line {self.line_num} is not valid UTF-8.")
+        return RowParseError(f"Invalid CSV on line {self.line_num}: {exc}")
+
+
+def iter_csv_rows(lines: Iterable[Union[str, bytes]]) -> Iterator[Row]:
+    """Yield a dict per CSV record; the first line holds the column names."""
+    decoder = _LineDecoder(lines)
+    reader = csv.DictReader(decoder)
+    try:
+        reader.fieldnames
+    except (UnicodeDecodeError, csv.Error) as exc:
+        # Without column names no record can be read.
+        yield decoder.error(exc)
+        return
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except (UnicodeDecodeError, csv.Error) as exc:
+            yield decoder.error(exc)
+            continue
+        yield {key: value for key, value in row.items() if value != ""}
+
+
+def iter_jsonl_rows(lines: Iterable[Union[str, bytes]]) -> Iterator[Row]:
+    """Yield a dict per JSON Lines record, skipping blank lines."""
+    decoder = _LineDecoder(lines)
+    while True:
+        try:
+            line = next(decoder)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as exc:
+            yield decoder.error(exc)
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield RowParseError(f"Invalid JSON: {exc}")
+            continue
+        if not isinstance(row, dict):
+            yield RowParseError("Expected a JSON object.")
+            continue
+        yield row
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def add_error(self, row: int, errors: Union[dict, list]) -> None:
+        self.errors.append({"row": row, "errors": errors})
+
+
+class UserImporter:
+    """
+    Create users from an iterable of rows in batches of ``batch_size``.
+
+    Rows are numbered from 1 in the order they are read; every rejected row
+    is reported in the result without aborting the rest of its batch.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        executor: Optional[Executor] = None,
+        pool: Optional[HashingPool] = None,
+        pool_timeout: float = 0,
+    ) -> None:
+        self.batch_size = batch_size
+        self.executor = executor
+        # Shared with other callers, so only used through its slots.
+        self.pool = pool
+        self.pool_timeout = pool_timeout
+        self.result = ImportResult()
+        self.seen_emails: set[str] = set()
+        self.seen_usernames: set[str] = set()
+
+    def run(self, rows: Iterable[Row]) -> ImportResult:
+        """
+        Import ``rows``. If hashing fails part way, ``self.result`` holds
+        what the batches before it imported.
+        """
+        numbered = enumerate(rows, start=1)
+        while batch := list(islice(numbered, self.batch_size)):
+            self.import_batch(batch, self.result)
+        return self.result
+
+    def import_batch(
+        self, batch: list[tuple[int, Row]], result: ImportResult
+    ) -> None:
+        valid = []
+        for number, row in batch:
+            if isinstance(row, RowParseError):
+                result.add_error(number, [str(row)])
+                continue
+            serializer = UserImportSerializer(data=row)
+            if not serializer.is_valid():
+                result.add_error(number, serializer.errors)
+                continue
+            data = dict(serializer.validated_data)
+            data["email"] = User.objects.normalize_email(data["email"])
+            valid.append((number, data))
+
+        valid = self.check_uniqueness(valid, result)
+        if not valid:
+            return
+
+        passwords = self.hash_passwords(
+            data.pop("password") for _, data in valid
+        )
+        users = [
+            User(password=password, **data)
+            for (_, data), password in zip(valid, passwords)
+        ]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                UserSearchDocument.objects.index(users)
+            result.created += len(users)
+        except IntegrityError:
+            # Someone else inserted a conflicting user since the uniqueness
+            # check; fall back to row by row inserts to isolate it.
+            for (number, _), user in zip(valid, users):
+                try:
+                    with transaction.atomic():
+                        user.save()
+                    result.created += 1
+                except IntegrityError as exc:
+                    result.add_error(number, [str(exc)])
+
+    def check_uniqueness(
+        self, rows: list[tuple[int, dict]], result: ImportResult
+    ) -> list[tuple[int, dict]]:
+        """
+        Drop rows whose email or username exists in the database or earlier
+        in the input, using one query per column for the whole batch.
+        """
+        emails = {data["email"].lower() for _, data in rows}
+        usernames = {
+            data["username"]
+            for _, data in rows
+            if data.get("username") is not None
+        }
+        taken_emails = set(
+            User.objects.filter(email__lower__in=emails).values_list(
+                "email__lower", flat=True
+            )
+        )
+        taken_usernames = (
+            set(
+                User.objects.filter(username__in=usernames).values_list(
+                    "username", flat=True
+                )
+            )
+            if usernames
+            else set()
+        )
+
+        unique = []
+        for number, data in rows:
+            errors = {}
+            email, username = data["email"].lower(), data.get("username")
+            if email in taken_emails or email in self.seen_emails:
+                errors["email"] = [EMAIL_TAKEN]
+            if username is not None and (
+                username in taken_usernames or username in self.seen_usernames
+            ):
+                errors["username"] = [USERNAME_TAKEN]
+            if errors:
+                result.add_error(number, errors)
+                continue
+            self.seen_emails.add(email)
+            if username is not None:
+                self.seen_usernames.add(username)
+            unique.append((number, data))
+        return unique
+
+    def hash_passwords(self, passwords: Iterable[str]) -> list[str]:
+        passwords = list(passwords)
+        if self.pool is not None:
+            return self.pool.hash_passwords(passwords, self.pool_timeout)
+        with timed("hashing"):
+            if self.executor is None:
+                return [hash_password(password) for password in passwords]
+            chunksize = max(len(passwords) // 32, 1)
+            return list(
+                self.executor.map(
+                    hash_password, passwords, chunksize=chunksize
+                )
+            )
@@ -0,0 +1,85 @@
+"""
+``startswith`` that a btree index can serve under any collation.
+
+``startswith`` compiles to ``LIKE 'prefix%'``, which PostgreSQL can only
+serve from an index whose collation is C. When the column sorts by code
+point, every value starting with ``prefix`` lies in ``[prefix, upper)``, so
+``indexed_startswith`` adds that range for the index to seek on. Linguistic
+collations ignore punctuation and case on a first pass and may sort a match
+outside the range; there the lookup is a plain ``startswith``.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from django.db.models.lookups import StartsWith
+
+# Collations that order text by code point.
+CODE_POINT_COLLATIONS = frozenset(
+    {"binary", "c", "c.utf-8", "c.utf8", "posix", "ucs_basic"}
+)
+
+MAX_CODE_POINT = 0x10FFFF
+SURROGATES = range(0xD800, 0xE000)
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    The least string above every string that starts with ``prefix``, in
+    code point order; None if there is none.
+
+    Surrogates never occur in stored text, so the bound skips over them.
+    """
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if code in SURROGATES:
+            code = SURROGATES.stop
+        if code <= MAX_CODE_POINT:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+
+def database_collation(connection) -> Optional[str]:
+    """Default collation of the database, looked up once per connection."""
+    if connection.vendor == "sqlite":
+        return "BINARY"
+    if connection.vendor != "postgresql":
+        return None
+    if not hasattr(connection, "_default_collation"):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT datcollate FROM pg_database "
+                "WHERE datname = current_database()"
+            )
+            connection._default_collation = cursor.fetchone()[0]
+    return connection._default_collation
+
+
+def sorts_by_code_point(connection, field) -> bool:
+    collation = getattr(field, "db_collation", None) or database_collation(
+        connection
+    )
+    return collation is not None and (
+        collation.lower() in CODE_POINT_COLLATIONS
+    )
+
+
+class IndexedStartsWith(StartsWith):
+    lookup_name = "indexed_startswith"
+
+    def as_sql(self, compiler, connection):
+        # Backends key their LIKE operators by the stock lookup name.
+        sql, params = compiler.compile(StartsWith(self.lhs, self.rhs))
+        if not isinstance(self.rhs, str) or not sorts_by_code_point(
+            connection, self.lhs.output_field
+        ):
+            return sql, params
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        upper = prefix_upper_bound(self.rhs)
+        range_sql, range_params = f"{lhs_sql} >= %s", [*lhs_params, self.rhs]
+        if upper is not None:
+            range_sql += f" AND {lhs_sql} < %s"
+            range_params += [*lhs_params, upper]
+        return f"({range_sql} AND {sql})", [*range_params, *params]
@@ -0,0 +1,54 @@
+import gzip
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+RENDERERS = {"json": OpenApiJsonRenderer, "yaml": OpenApiYamlRenderer}
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema as JSON and YAML, with gzip and brotli "
+        "variants, for the schema view to serve from disk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            type=Path,
+            default=settings.OPENAPI_SCHEMA_ROOT,
+            help="Directory the schema files are written to.",
+        )
+
+    def handle(self, *args, **options):
+        output_dir = options["output_dir"]
+        output_dir.mkdir(parents=True, exist_ok=True)
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        for name, renderer_class in RENDERERS.items():
+            content = renderer_class().render(schema, renderer_context={})
+            path = output_dir / f"schema.{name}"
+            path.write_bytes(content)
+            path.with_name(f"{path.name}.gz").write_bytes(
+                gzip.compress(content, compresslevel=9, mtime=0)
+            )
+            if brotli is not None:
+                path.with_name(f"{path.name}.br").write_bytes(
+                    brotli.compress(content, quality=11)
+                )
+            self.stdout.write(f"Wrote {path}")
+
+        if brotli is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "brotli is not installed; skipped the .br variants."
+                )
+            )
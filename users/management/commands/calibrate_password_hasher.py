@@ -0,0 +1,98 @@
+import statistics
+import time
+
+import argon2
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SALT = b"calibration-salt"
+
+
+def verify_seconds(
+    time_cost: int, memory_cost: int, parallelism: int, samples: int
+) -> float:
+    """Median time to verify a password hashed with the given cost."""
+    encoded = argon2.low_level.hash_secret(
+        b"calibration password",
+        SALT,
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        hash_len=argon2.DEFAULT_HASH_LENGTH,
+        type=argon2.low_level.Type.ID,
+    )
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        argon2.low_level.verify_secret(
+            encoded, b"calibration password", argon2.low_level.Type.ID
+        )
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Find the Argon2 cost whose password verification takes at most "
+        "--target-ms on this host."
+    )
+
+    def add_arguments(self, parser):
+        cost = settings.PASSWORD_HASHING_COST
+        parser.add_argument("--target-ms", type=float, default=250)
+        parser.add_argument(
+            "--memory-cost",
+            type=int,
+            default=cost["MEMORY_COST"],
+            help="Starting memory cost in KiB; halved while even a time "
+            "cost of 1 is over the target.",
+        )
+        parser.add_argument(
+            "--parallelism", type=int, default=cost["PARALLELISM"]
+        )
+        parser.add_argument("--max-time-cost", type=int, default=10)
+        parser.add_argument("--samples", type=int, default=3)
+
+    def handle(self, *args, **options):
+        target = options["target_ms"] / 1000
+        parallelism = options["parallelism"]
+        memory_cost = options["memory_cost"]
+        if parallelism < 1 or memory_cost < 8 * parallelism:
+            raise CommandError(
+                "--memory-cost must be at least 8 KiB per lane of "
+                "--parallelism."
+            )
+
+        def measure(time_cost: int) -> float:
+            seconds = verify_seconds(
+                time_cost, memory_cost, parallelism, options["samples"]
+            )
+            self.stdout.write(
+                f"t={time_cost} m={memory_cost} p={parallelism}: "
+                f"{seconds * 1000:.1f} ms"
+            )
+            return seconds
+
+        seconds = measure(1)
+        while seconds > target and memory_cost // 2 >= 8 * parallelism:
+            memory_cost //= 2
+            seconds = measure(1)
+        if seconds > target:
+            raise CommandError(
+                f"No cost verifies within {options['target_ms']} ms."
+            )
+
+        time_cost = 1
+        while time_cost < options["max_time_cost"]:
+            seconds = measure(time_cost + 1)
+            if seconds > target:
+                break
+            time_cost += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"ARGON2_TIME_COST={time_cost}\n"
+                f"ARGON2_MEMORY_COST={memory_cost}\n"
+                f"ARGON2_PARALLELISM={parallelism}"
+            )
+        )
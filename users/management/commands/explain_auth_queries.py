@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from users.models import User
+
+SAMPLE_ID = 1
+SAMPLE_EMAIL = "user@example.com"
+SAMPLE_USERNAME = "user"
+
+
+def hot_queries() -> dict:
+    """The queries run on the authentication path, by name."""
+    return {
+        # ModelBackend.authenticate via get_by_natural_key.
+        "login": User._default_manager.filter(email__lower=SAMPLE_EMAIL),
+        # JWTAuthentication.get_user.
+        "jwt user": User.objects.filter(id=SAMPLE_ID),
+        # ClaimsUser.get_db_user, behind GET /api/v1/users/me/.
+        "me": User.objects.filter(pk=SAMPLE_ID, is_active=True),
+        # get_token_version on a cache miss.
+        "token version": User.objects.filter(
+            pk=SAMPLE_ID, is_active=True
+        ).values_list("token_version", flat=True)[:1],
+        # Registration uniqueness checks.
+        "unique email": User.objects.filter(email__lower=SAMPLE_EMAIL)[:1],
+        "unique_username": User.objects.filter(
+            username=SAMPLE_USERNAME, username__isnull=False
+        )[:1],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the query plans of the authentication hot path so index "
+        "regressions are visible."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Execute the queries and report actual timings "
+            "(PostgreSQL only).",
+        )
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options["analyze"] and connection.vendor == "postgresql":
+            explain_options = {"analyze": True, "buffers": True}
+        for name, queryset in hot_queries().items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}:"))
+            self.stdout.write(f"  {queryset.query}")
+            for line in queryset.explain(**explain_options).splitlines():
+                self.stdout.write(f"  {line}")
+            self.stdout.write("")
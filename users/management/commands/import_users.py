@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from users.hashing import init_worker
+from users.importing import UserImporter, iter_csv_rows, iter_jsonl_rows
+
+READERS = {"csv": iter_csv_rows, "jsonl": iter_jsonl_rows}
+
+
+class Command(BaseCommand):
+    help = "Create users in bulk from a CSV or JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", help="Input file, or '-' to read from standard input."
+        )
+        parser.add_argument(
+            "--format",
+            choices=READERS,
+            help="Input format. Guessed from the file extension if omitted.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.USER_IMPORT_BATCH_SIZE,
+            help="Number of rows validated and inserted together.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of processes hashing passwords; 0 hashes them in "
+            "this process.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        input_format = options["format"]
+        if input_format is None:
+            input_format = os.path.splitext(path)[1].lstrip(".").lower()
+            if input_format not in READERS:
+                raise CommandError(
+                    "Cannot guess the input format, pass --format."
+                )
+
+        stream = (
+            sys.stdin
+            if path == "-"
+            else open(path, encoding="utf-8", newline="")
+        )
+        executor = (
+            ProcessPoolExecutor(
+                max_workers=options["workers"], initializer=init_worker
+            )
+            if options["workers"] > 0
+            else None
+        )
+        with stream, executor or nullcontext():
+            importer = UserImporter(options["batch_size"], executor)
+            result = importer.run(READERS[input_format](stream))
+
+        for error in result.errors:
+            self.stderr.write(json.dumps(error))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} users, "
+                f"rejected {len(result.errors)} rows."
+            )
+        )
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from LibraryServiceAPI.importtime import TARGETS, measure_cold_start
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the cold start of a worker or manage.py run in a fresh "
+        "interpreter and report the heaviest imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "target",
+            nargs="?",
+            choices=sorted(TARGETS),
+            default="wsgi",
+            help="What to start: the WSGI or ASGI application, Django "
+            "setup alone, or setup and the URLconf.",
+        )
+        parser.add_argument(
+            "--profile",
+            default="prod",
+            help="DJANGO_SETTINGS_PROFILE of the measured interpreter.",
+        )
+        parser.add_argument(
+            "--budget",
+            nargs="?",
+            type=float,
+            const=settings.COLD_START["BUDGET"],
+            help="Fail if the best of COLD_START['RUNS'] cold starts takes "
+            "longer than this many seconds, COLD_START['BUDGET'] by default.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Number of modules and packages listed.",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=("cumulative", "self"),
+            default="cumulative",
+            help="Rank modules by time including or excluding their own "
+            "imports.",
+        )
+
+    def handle(self, *args, **options):
+        budget = options["budget"]
+        runs = 1 if budget is None else settings.COLD_START["RUNS"]
+        try:
+            cold_start = min(
+                (
+                    measure_cold_start(
+                        options["target"], profile=options["profile"]
+                    )
+                    for _ in range(runs)
+                ),
+                key=lambda run: run.seconds,
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            f"Cold start of {cold_start.target} ({options['profile']} "
+            f"profile): {cold_start.seconds * 1000:.1f} ms, "
+            f"{len(cold_start.modules)} modules loaded"
+        )
+        self.stdout.write(f"\nHeaviest modules by {options['sort']} time:")
+        self.stdout.write(f"  {'cumulative ms':>13} {'self ms':>9}  module")
+        for timing in cold_start.heaviest(options["limit"], options["sort"]):
+            self.stdout.write(
+                f"  {timing.cumulative_us / 1000:>13.1f} "
+                f"{timing.self_us / 1000:>9.1f}  {timing.module}"
+            )
+        self.stdout.write("\nHeaviest packages by self time:")
+        for package, self_us in cold_start.packages(options["limit"]):
+            self.stdout.write(f"  {self_us / 1000:>13.1f} ms  {package}")
+
+        if budget is not None and cold_start.seconds > budget:
+            raise CommandError(
+                f"Cold start took {cold_start.seconds:.3f}s, over the budget "
+                f"of {budget:.3f}s."
+            )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from users.revocation import revocation_list
+
+
+class Command(BaseCommand):
+    help = "Delete revoked JWT IDs whose tokens have expired."
+
+    def handle(self, *args, **options):
+        deleted = revocation_list.purge()
+        self.stdout.write(f"Purged {deleted} revoked tokens.")
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from users.models import User, UserSearchDocument
+from users.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the user search documents and their trigram index."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Users indexed per transaction.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to rebuild the index in.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        using = options["database"]
+        users = User.objects.using(using).only(
+            "pk", "first_name", "last_name", "username", "email"
+        )
+
+        last_pk = 0
+        indexed = 0
+        while batch := list(
+            users.filter(pk__gt=last_pk).order_by("pk")[:batch_size]
+        ):
+            last_pk = batch[-1].pk
+            with transaction.atomic(using=using):
+                UserSearchDocument.objects.index(batch, using=using)
+            indexed += len(batch)
+            self.stdout.write(f"Indexed {indexed} users", ending="\r")
+
+        rebuild_search_index(connections[using])
+        self.stdout.write(f"Indexed {indexed} users.")
@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-18 16:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0003_revokedtoken"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["date_joined", "id"],
+                name="users_user_date_jo_5aa9d9_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.1 on 2026-10-18 16:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# The trigram index of users.search as of this migration, inlined so that
+# later changes to that module cannot alter what this migration does.
+DOCUMENT_TABLE = "users_usersearchdocument"
+FTS_TABLE = "users_usersearch_fts"
+
+CREATE_INDEX = {
+    "sqlite": [
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(document, "
+        f"content='{DOCUMENT_TABLE}', content_rowid='user_id', "
+        "tokenize='trigram')",
+        f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} "
+        f"BEGIN INSERT INTO {FTS_TABLE}(rowid, document) "
+        "VALUES (new.user_id, new.document); END",
+        f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} "
+        f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) "
+        "VALUES ('delete', old.user_id, old.document); END",
+        f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} "
+        f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) "
+        "VALUES ('delete', old.user_id, old.document); "
+        f"INSERT INTO {FTS_TABLE}(rowid, document) "
+        "VALUES (new.user_id, new.document); END",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"CREATE INDEX {DOCUMENT_TABLE}_trgm ON {DOCUMENT_TABLE} "
+        "USING gin (document gin_trgm_ops)",
+    ],
+}
+DROP_INDEX = {
+    "sqlite": [
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+        f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    ],
+    "postgresql": [f"DROP INDEX IF EXISTS {DOCUMENT_TABLE}_trgm"],
+}
+
+
+def make_document(first_name, last_name, username, email):
+    words = (first_name, last_name, username, email)
+    return f" {' '.join(word.lower() for word in words if word)} "
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for statement in CREATE_INDEX.get(vendor, []):
+        schema_editor.execute(statement)
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for statement in DROP_INDEX.get(vendor, []):
+        schema_editor.execute(statement)
+
+
+def index_existing_users(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    UserSearchDocument = apps.get_model("users", "UserSearchDocument")
+    db = schema_editor.connection.alias
+    users = User.objects.using(db).values_list(
+        "pk", "first_name", "last_name", "username", "email"
+    )
+    batch = []
+    for pk, *fields in users.iterator(chunk_size=1000):
+        batch.append(
+            UserSearchDocument(user_id=pk, document=make_document(*fields))
+        )
+        if len(batch) == 1000:
+            UserSearchDocument.objects.using(db).bulk_create(batch)
+            batch = []
+    UserSearchDocument.objects.using(db).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_user_date_joined_id_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserSearchDocument",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("document", models.TextField()),
+            ],
+        ),
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(index_existing_users, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 5.1 on 2026-10-18 16:53
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+# Users listed by the duplicate email error before it is cut short.
+DUPLICATES_SHOWN = 50
+
+UNIQUE_EMAIL_CI = models.UniqueConstraint(
+    Lower("email"),
+    name="unique_email_ci",
+    violation_error_message="A user with that email address already exists.",
+)
+
+ACTIVE_TOKEN_VERSION = models.Index(
+    condition=models.Q(("is_active", True)),
+    fields=["id", "token_version"],
+    name="user_active_token_version",
+)
+
+
+def check_email_duplicates(apps, schema_editor):
+    """Refuse to migrate while emails that differ only in case exist."""
+    User = apps.get_model("users", "User")
+    users = User.objects.using(schema_editor.connection.alias).annotate(
+        email_lower=Lower("email")
+    )
+    duplicates = (
+        users.values("email_lower")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values_list("email_lower", flat=True)
+    )
+    rows = list(
+        users.filter(email_lower__in=duplicates)
+        .order_by("email_lower", "id")
+        .values_list("id", "email")[: DUPLICATES_SHOWN + 1]
+    )
+    if not rows:
+        return
+    lines = [f"  id={pk} {email}" for pk, email in rows[:DUPLICATES_SHOWN]]
+    if len(rows) > DUPLICATES_SHOWN:
+        lines.append("  ...")
+    raise RuntimeError(
+        "Cannot add the unique_email_ci constraint: these users have email "
+        "addresses that differ only in case. Merge or rename them, then run "
+        "migrate again.\n" + "\n".join(lines)
+    )
+
+
+def add_indexes(apps, schema_editor):
+    """
+    Build the indexes without blocking writes on PostgreSQL, where
+    unique_email_ci is a unique index on LOWER(email).
+    """
+    User = apps.get_model("users", "User")
+    table = schema_editor.quote_name(User._meta.db_table)
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.add_index(User, ACTIVE_TOKEN_VERSION)
+        schema_editor.add_constraint(User, UNIQUE_EMAIL_CI)
+        return
+    # A failed concurrent build leaves an invalid index behind.
+    schema_editor.execute(
+        "DROP INDEX CONCURRENTLY IF EXISTS user_active_token_version"
+    )
+    schema_editor.execute(
+        "CREATE INDEX CONCURRENTLY user_active_token_version "
+        f'ON {table} ("id", "token_version") WHERE "is_active"'
+    )
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS unique_email_ci")
+    schema_editor.execute(
+        "CREATE UNIQUE INDEX CONCURRENTLY unique_email_ci "
+        f'ON {table} (LOWER("email"))'
+    )
+
+
+def remove_indexes(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.remove_constraint(User, UNIQUE_EMAIL_CI)
+        schema_editor.remove_index(User, ACTIVE_TOKEN_VERSION)
+        return
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS unique_email_ci")
+    schema_editor.execute(
+        "DROP INDEX CONCURRENTLY IF EXISTS user_active_token_version"
+    )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0005_usersearchdocument"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            check_email_duplicates, migrations.RunPython.noop
+        ),
+        migrations.RemoveIndex(
+            model_name="user",
+            name="users_user_email_6f2530_idx",
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_indexes, remove_indexes),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="user", index=ACTIVE_TOKEN_VERSION
+                ),
+                migrations.AddConstraint(
+                    model_name="user", constraint=UNIQUE_EMAIL_CI
+                ),
+            ],
+        ),
+    ]
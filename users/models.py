@@ -1,11 +1,37 @@
 from __future__ import annotations
 
+from typing import Iterable, Optional
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.base_user import BaseUserManager
+from django.contrib.auth.hashers import acheck_password, check_password
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from LibraryServiceAPI.metrics import timed
+from LibraryServiceAPI.routers import pin_to_primary
+from users.cache import (
+    PROFILE_FIELDS,
+    invalidate_profile,
+    invalidate_token_version,
+)
+from users.hashers import schedule_rehash
+from users.lookups import IndexedStartsWith
+from users.search import SEARCH_FIELDS, make_document
+
+# Columns written by Django internals (update_last_login, password rehash on
+# login) and by password changes. Saves limited to them skip clean().
+SYSTEM_UPDATE_FIELDS = frozenset({"last_login", "password", "token_version"})
+# Saved changes to any of these bump token_version, revoking every JWT
+# issued before them along with the claims they carry.
+TOKEN_VERSION_FIELDS = frozenset(
+    {"email", "password", "is_active", "is_staff", "is_superuser"}
+)
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -44,6 +70,32 @@ class UserManager(BaseUserManager):
 
         return self._create_user(email, password, **extra_fields)
 
+    def get_by_natural_key(self, email: str) -> User:
+        """Fetch a user by email, ignoring case, through ``unique_email_ci``."""
+        return self.get(email__lower=email.lower())
+
+    def search_prefix(self, term: str) -> models.QuerySet:
+        """
+        Users whose last name or username starts with ``term``.
+
+        A term of two words is read as a full last name followed by a first
+        name prefix. Matching is case-sensitive so that it stays on the
+        ``(last_name, first_name)`` and ``username`` indexes.
+        """
+        words = term.split()
+        if not words:
+            return self.get_queryset()
+        if len(words) == 2:
+            last_name, first_name = words
+            return self.filter(
+                first_name__indexed_startswith=first_name, last_name=last_name
+            )
+        term = " ".join(words)
+        return self.filter(
+            Q(last_name__indexed_startswith=term)
+            | Q(username__indexed_startswith=term)
+        )
+
 
 class User(AbstractUser):
     """
@@ -57,6 +109,12 @@ class User(AbstractUser):
     # Add an email field with a unique constraint.
     email = models.EmailField(_("email address"), unique=True)
 
+    # Bumped on changes to TOKEN_VERSION_FIELDS to revoke every JWT issued
+    # before them.
+    token_version = models.PositiveIntegerField(
+        _("token version"), default=0, editable=False
+    )
+
     # Set the USERNAME_FIELD to email.
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -72,24 +130,148 @@ class User(AbstractUser):
             return self.username
         return self.email
 
-    def save(self, *args, **kwargs):
-        self.clean()
-        return super().save(*args, **kwargs)
+    def set_password(self, raw_password):
+        with timed("hashing"):
+            super().set_password(raw_password)
+
+    def check_password(self, raw_password):
+        """
+        Verify ``raw_password``, deferring any hash upgrade to
+        ``schedule_rehash`` rather than saving it inline.
+        """
+
+        def setter(raw_password):
+            schedule_rehash(self, raw_password)
+
+        with timed("hashing"):
+            return check_password(raw_password, self.password, setter)
+
+    async def acheck_password(self, raw_password):
+        """See check_password()."""
+
+        async def setter(raw_password):
+            await sync_to_async(schedule_rehash)(self, raw_password)
+
+        with timed("hashing"):
+            return await acheck_password(raw_password, self.password, setter)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_token_fields = instance._token_fields()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using, fields, **kwargs)
+        self._reload_token_fields(fields)
+
+    async def arefresh_from_db(self, using=None, fields=None, **kwargs):
+        await super().arefresh_from_db(using, fields, **kwargs)
+        self._reload_token_fields(fields)
+
+    def _reload_token_fields(self, fields) -> None:
+        # Only the reloaded fields match the database again.
+        reloaded = self._token_fields()
+        if fields is not None:
+            reloaded = {k: v for k, v in reloaded.items() if k in fields}
+        self._loaded_token_fields = {
+            **getattr(self, "_loaded_token_fields", {}),
+            **reloaded,
+        }
+
+    def _token_fields(self) -> dict:
+        # Deferred fields are absent from __dict__ and never compared.
+        return {
+            name: self.__dict__[name]
+            for name in TOKEN_VERSION_FIELDS
+            if name in self.__dict__
+        }
+
+    def _changed_token_fields(self) -> set[str]:
+        loaded = getattr(self, "_loaded_token_fields", {})
+        return {
+            name
+            for name, value in self._token_fields().items()
+            if name in loaded and loaded[name] != value
+        }
+
+    def save(self, *args, validate: Optional[bool] = None, **kwargs):
+        """
+        Save the user, running ``clean()`` first.
+
+        Validation is skipped for saves restricted by ``update_fields`` to
+        ``SYSTEM_UPDATE_FIELDS``, unless ``validate`` says otherwise.
+        Saving a change to ``TOKEN_VERSION_FIELDS`` bumps ``token_version``.
+        """
+        update_fields = kwargs.get("update_fields")
+        if validate is None:
+            validate = update_fields is None or not (
+                SYSTEM_UPDATE_FIELDS.issuperset(update_fields)
+            )
+        if validate:
+            self.clean()
+        changed = self._changed_token_fields()
+        if update_fields is not None:
+            changed &= set(update_fields)
+        if changed:
+            self.token_version += 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        result = super().save(*args, **kwargs)
+        saved = self._token_fields()
+        if update_fields is not None:
+            saved = {
+                **getattr(self, "_loaded_token_fields", {}),
+                **{k: v for k, v in saved.items() if k in update_fields},
+            }
+        self._loaded_token_fields = saved
+        pin_to_primary(self.pk)
+        invalidate_token_version(self.pk)
+        if update_fields is None or not PROFILE_FIELDS.isdisjoint(
+            update_fields
+        ):
+            invalidate_profile(self.pk)
+        if update_fields is None or not SEARCH_FIELDS.isdisjoint(
+            update_fields
+        ):
+            UserSearchDocument.objects.index([self], using=self._state.db)
+        return result
+
+    def delete(self, *args, **kwargs):
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        pin_to_primary(user_id)
+        invalidate_profile(user_id)
+        invalidate_token_version(user_id)
+        return result
 
     class Meta:
         ordering = ["date_joined"]
         indexes = [
             models.Index(fields=["username"]),
             models.Index(fields=["last_name", "first_name"]),
-            models.Index(fields=["email"]),
+            models.Index(fields=["date_joined", "id"]),
+            # Lets the token version check of active users, run on every
+            # authenticated request, be answered from the index alone.
+            models.Index(
+                fields=["id", "token_version"],
+                condition=Q(is_active=True),
+                name="user_active_token_version",
+            ),
         ]
         constraints = [
+            models.UniqueConstraint(
+                Lower("email"),
+                name="unique_email_ci",
+                violation_error_message="A user with that email address "
+                "already exists.",
+            ),
             models.UniqueConstraint(
                 fields=["username"],
                 condition=Q(username__isnull=False),
                 name="unique_username",
                 violation_error_message="A user with that username already "
-                                        "exists.",
+                "exists.",
             ),
         ]
 
@@ -100,3 +282,71 @@ class User(AbstractUser):
         if self.username:
             return self.username
         return self.email
+
+
+class RevokedToken(models.Model):
+    """
+    JWT ID of a revoked token, kept until the token would have expired.
+
+    Rows are grouped into hourly ``bucket``s of their expiry time so the purge
+    job drops whole buckets through the index instead of scanning.
+    """
+
+    jti = models.UUIDField(primary_key=True)
+    expires_at = models.DateTimeField()
+    bucket = models.PositiveIntegerField(db_index=True)
+    # Lets processes load only the revocations made since they last synced.
+    revoked_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return self.jti.hex
+
+
+# Lets lookups spell LOWER(email) as ``email__lower`` so that they match the
+# expression of the unique_email_ci index.
+User._meta.get_field("email").register_lookup(Lower)
+# Prefix searches that stay on the btree indexes; see users.lookups.
+for name in ("first_name", "last_name", "username"):
+    User._meta.get_field(name).register_lookup(IndexedStartsWith)
+
+
+class UserSearchDocumentManager(models.Manager):
+    def index(self, users: Iterable[User], using: Optional[str] = None):
+        """Create or refresh the search documents of ``users``."""
+        documents = [
+            UserSearchDocument(
+                user_id=user.pk,
+                document=make_document(
+                    user.first_name, user.last_name, user.username, user.email
+                ),
+            )
+            for user in users
+        ]
+        return self.db_manager(using).bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["document"],
+        )
+
+
+class UserSearchDocument(models.Model):
+    """
+    Denormalized text a user is found by in ``users.search``.
+
+    Maintained by ``User.save`` and deleted with the user; the trigram index
+    over ``document`` lives outside the model and is created by migration.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    document = models.TextField()
+
+    objects = UserSearchDocumentManager()
+
+    def __str__(self):
+        return self.document.strip()
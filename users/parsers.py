@@ -0,0 +1,27 @@
+from typing import Iterator
+
+from rest_framework.parsers import BaseParser
+
+from users.importing import Row, iter_csv_rows, iter_jsonl_rows
+
+
+class CSVRowsParser(BaseParser):
+    """Parse a CSV body lazily into a stream of row dicts."""
+
+    media_type = "text/csv"
+
+    def parse(
+        self, stream, media_type=None, parser_context=None
+    ) -> Iterator[Row]:
+        return iter_csv_rows(stream)
+
+
+class JSONLinesParser(BaseParser):
+    """Parse a JSON Lines body lazily into a stream of row dicts."""
+
+    media_type = "application/x-ndjson"
+
+    def parse(
+        self, stream, media_type=None, parser_context=None
+    ) -> Iterator[Row]:
+        return iter_jsonl_rows(stream)
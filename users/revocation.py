@@ -0,0 +1,186 @@
+"""
+Revocation list for JWTs.
+
+Revoked JWT IDs are stored in ``RevokedToken`` and mirrored into an
+in-process Bloom filter. Tokens the filter has never seen, which is almost
+every token, are accepted without touching the database; only a filter
+hit is confirmed with a primary key lookup. Each revocation increments a
+generation counter in the cache; a process that sees it change adds only
+the revocations made since its last load to its filter. Every filter is
+still rebuilt in full at least every ``REFRESH_INTERVAL`` seconds.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from users.models import RevokedToken
+
+# Counts revocations; a process that has seen fewer loads the new ones.
+GENERATION_CACHE_KEY = "users:revocation:generation"
+# Overlap of incremental loads, covering clock differences between hosts
+# and revocations committed after a load started.
+CLOCK_SKEW_SECONDS = 5
+
+# Width of the expiry buckets used to purge revoked tokens, in seconds.
+BUCKET_SECONDS = 60 * 60
+
+
+def expiry_bucket(timestamp: float) -> int:
+    return int(timestamp // BUCKET_SECONDS)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """Process-local view of the revoked JWT IDs."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._bloom: Optional[BloomFilter] = None
+        self._generation = 0
+        self._built_at = 0.0
+        # Wall clock time of the last load; later revocations are new.
+        self._loaded_at = 0.0
+
+    @property
+    def config(self) -> dict:
+        return settings.TOKEN_REVOCATION
+
+    def _sync(self) -> BloomFilter:
+        generation = cache.get(GENERATION_CACHE_KEY, 0)
+        expired = (
+            time.monotonic() - self._built_at > self.config["REFRESH_INTERVAL"]
+        )
+        if self._bloom is None or expired:
+            with self._lock:
+                self._rebuild(generation)
+        elif generation != self._generation:
+            with self._lock:
+                self._load_new(generation)
+        return self._bloom
+
+    def _rebuild(self, generation: int) -> None:
+        loaded_at = time.time()
+        jtis = list(
+            RevokedToken.objects.filter(
+                bucket__gte=expiry_bucket(loaded_at)
+            ).values_list("jti", flat=True)
+        )
+        capacity = max(self.config["BLOOM_CAPACITY"], 2 * len(jtis))
+        bloom = BloomFilter(capacity, self.config["BLOOM_ERROR_RATE"])
+        for jti in jtis:
+            bloom.add(jti.hex)
+        self._bloom = bloom
+        self._generation = generation
+        self._built_at = time.monotonic()
+        self._loaded_at = loaded_at
+
+    def _load_new(self, generation: int) -> None:
+        """Add the revocations made since the last load to the filter."""
+        loaded_at = time.time()
+        since = datetime.fromtimestamp(
+            self._loaded_at - CLOCK_SKEW_SECONDS, timezone.utc
+        )
+        for jti in RevokedToken.objects.filter(
+            revoked_at__gte=since
+        ).values_list("jti", flat=True):
+            self._bloom.add(jti.hex)
+        self._generation = generation
+        self._loaded_at = loaded_at
+
+    def is_revoked(self, jti: str) -> bool:
+        jti = uuid.UUID(jti).hex
+        if jti not in self._sync():
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, jti: str, expires: float) -> bool:
+        """
+        Revoke ``jti``; False if it already was. The primary key makes the
+        insert the check, so concurrent callers cannot both succeed.
+        """
+        _, created = RevokedToken.objects.get_or_create(
+            jti=jti,
+            defaults={
+                "expires_at": datetime.fromtimestamp(expires, timezone.utc),
+                "bucket": expiry_bucket(expires),
+            },
+        )
+        if not created:
+            return False
+        cache.add(GENERATION_CACHE_KEY, 0, None)
+        try:
+            generation = cache.incr(GENERATION_CACHE_KEY)
+        except ValueError:
+            # Evicted between add() and incr(); the next rebuild catches up.
+            generation = None
+        with self._lock:
+            # Keep this process's filter current without a reload, unless
+            # another process revoked a token since this one last synced.
+            if self._bloom is not None:
+                self._bloom.add(uuid.UUID(jti).hex)
+                if generation == self._generation + 1:
+                    self._generation = generation
+        return True
+
+    def purge(self) -> int:
+        """Delete revocations whose tokens have expired in full buckets."""
+        deleted, _ = RevokedToken.objects.filter(
+            bucket__lt=expiry_bucket(time.time())
+        ).delete()
+        return deleted
+
+
+revocation_list = RevocationList()
+
+
+def revoke_token(token: Token) -> bool:
+    """Revoke ``token`` until it expires; False if it already was."""
+    return revocation_list.revoke(token[api_settings.JTI_CLAIM], token["exp"])
+
+
+def is_token_revoked(token: Token) -> bool:
+    """
+    Return whether ``token`` was revoked. Usually answered by the Bloom
+    filter alone; a possible match costs one primary key lookup.
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    return jti is not None and revocation_list.is_revoked(jti)
@@ -0,0 +1,22 @@
+"""
+OpenAPI schema generation.
+
+Imported only when a schema is generated, through ``AutoSchema`` being
+DRF's ``DEFAULT_SCHEMA_CLASS``, so that workers serving the API never load
+drf-spectacular. Defining the extensions below registers them.
+"""
+
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from drf_spectacular.openapi import AutoSchema as SpectacularAutoSchema
+
+
+class AutoSchema(SpectacularAutoSchema):
+    pass
+
+
+class UserJWTScheme(SimpleJWTScheme):
+    target_class = "users.authentication.JWTAuthentication"
+
+
+class StatelessUserJWTScheme(SimpleJWTScheme):
+    target_class = "users.authentication.StatelessJWTAuthentication"
@@ -0,0 +1,179 @@
+"""
+Fuzzy user search over a denormalized search document.
+
+Every user has a ``UserSearchDocument`` row holding their lowercased names,
+username and email in one string. The documents are indexed by trigrams:
+a ``pg_trgm`` GIN index on PostgreSQL and an FTS5 table with the trigram
+tokenizer on SQLite, kept in sync with the document table by triggers.
+A query matches documents sharing trigrams with it, which tolerates partial
+names and typos, and results are ranked by the share of the query's
+trigrams each document contains.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+
+# User columns copied into the search document. Saves that touch none of
+# them leave the document in place.
+SEARCH_FIELDS = frozenset({"first_name", "last_name", "username", "email"})
+
+DOCUMENT_TABLE = "users_usersearchdocument"
+FTS_TABLE = "users_usersearch_fts"
+
+# Databases with a trigram index; fetch_candidates() supports no others.
+SEARCH_VENDORS = frozenset({"sqlite", "postgresql"})
+
+# Candidates fetched from the index per requested result before ranking.
+CANDIDATES_PER_RESULT = 4
+
+SQLITE_CREATE = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(document, "
+    f"content='{DOCUMENT_TABLE}', content_rowid='user_id', "
+    "tokenize='trigram')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, document) "
+    "VALUES (new.user_id, new.document); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) "
+    "VALUES ('delete', old.user_id, old.document); END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) "
+    "VALUES ('delete', old.user_id, old.document); "
+    f"INSERT INTO {FTS_TABLE}(rowid, document) "
+    "VALUES (new.user_id, new.document); END",
+]
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+POSTGRES_CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX {DOCUMENT_TABLE}_trgm ON {DOCUMENT_TABLE} "
+    "USING gin (document gin_trgm_ops)",
+]
+POSTGRES_DROP = [f"DROP INDEX IF EXISTS {DOCUMENT_TABLE}_trgm"]
+
+
+def make_document(
+    first_name: str, last_name: str, username: str | None, email: str
+) -> str:
+    """
+    Build the search document of a user.
+
+    Words are separated and surrounded by spaces so that word boundaries
+    produce trigrams of their own, as ``pg_trgm`` does.
+    """
+    words = (first_name, last_name, username, email)
+    return f" {' '.join(word.lower() for word in words if word)} "
+
+
+def trigrams(term: str) -> set[str]:
+    """Trigrams of every word of ``term``, padded like the documents."""
+    grams = set()
+    for word in term.lower().split():
+        padded = f" {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def create_search_index(connection) -> None:
+    """Create the trigram index; a no-op on unsupported databases."""
+    statements = {"sqlite": SQLITE_CREATE, "postgresql": POSTGRES_CREATE}
+    with connection.cursor() as cursor:
+        for statement in statements.get(connection.vendor, []):
+            cursor.execute(statement)
+
+
+def drop_search_index(connection) -> None:
+    statements = {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP}
+    with connection.cursor() as cursor:
+        for statement in statements.get(connection.vendor, []):
+            cursor.execute(statement)
+
+
+def create_unmigrated_search_index(app_config, using, **kwargs) -> None:
+    """
+    ``post_migrate`` receiver creating the index when the app's tables were
+    built without migrations, as in test databases with ``MIGRATE`` off.
+    """
+    module, _ = MigrationLoader.migrations_module(app_config.label)
+    if module is None:
+        create_search_index(connections[using])
+
+
+def rebuild_search_index(connection) -> None:
+    """Rebuild the index from the document table."""
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+    elif connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"REINDEX INDEX {DOCUMENT_TABLE}_trgm")
+
+
+def fetch_candidates(
+    connection, term: str, grams: set[str], limit: int
+) -> Iterable[tuple[int, str]]:
+    if connection.vendor == "sqlite":
+        query = " OR ".join(
+            '"{}"'.format(gram.replace('"', '""')) for gram in grams
+        )
+        sql = (
+            f"SELECT rowid, document FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}) LIMIT %s"
+        )
+        params = [query, limit]
+    elif connection.vendor == "postgresql":
+        term = term.lower()
+        sql = (
+            f"SELECT user_id, document FROM {DOCUMENT_TABLE} "
+            "WHERE %s <%% document "
+            "ORDER BY word_similarity(%s, document) DESC LIMIT %s"
+        )
+        params = [term, term, limit]
+    else:
+        raise NotImplementedError(
+            f"User search is not supported on {connection.vendor}."
+        )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def search_user_ids(
+    term: str, limit: int = 20, using: str = "default"
+) -> list[int]:
+    """
+    Return the ids of up to ``limit`` users matching ``term``, best first.
+
+    Databases without a trigram index answer with
+    ``UserManager.search_prefix`` instead.
+    """
+    connection = connections[using]
+    if connection.vendor not in SEARCH_VENDORS:
+        if not term.split():
+            return []
+        # No trigram index to query; match prefixes instead.
+        users = get_user_model().objects.db_manager(using).search_prefix(term)
+        return list(users.values_list("pk", flat=True)[:limit])
+    grams = trigrams(term)
+    if not grams:
+        return []
+    candidates = fetch_candidates(
+        connection, term, grams, limit * CANDIDATES_PER_RESULT
+    )
+    scored = []
+    for rank, (user_id, document) in enumerate(candidates):
+        found = sum(gram in document for gram in grams)
+        scored.append((-found, rank, user_id))
+    return [user_id for _, _, user_id in sorted(scored)[:limit]]
@@ -1,10 +1,109 @@
+import copy
+
 from django.contrib.auth.password_validation import validate_password
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, Token, UntypedToken
 
+from LibraryServiceAPI.metrics import timed
+from users.authentication import TOKEN_VERSION_CLAIM, cache_token_version
 from users.models import User
+from users.revocation import is_token_revoked, revoke_token
+
+
+class CaseInsensitiveUniqueValidator(UniqueValidator):
+    """``UniqueValidator`` comparing lowercased values."""
+
+    def __init__(self, queryset, message=None) -> None:
+        super().__init__(queryset, message=message, lookup="lower")
+
+    def filter_queryset(self, value, queryset, field_name):
+        return super().filter_queryset(value.lower(), queryset, field_name)
+
+
+class TimedSerializerMixin:
+    """Report validation and representation time as "serializer"."""
+
+    def run_validation(self, data=serializers.empty):
+        with timed("serializer"):
+            return super().run_validation(data)
+
+    def to_representation(self, instance):
+        with timed("serializer"):
+            return super().to_representation(instance)
+
+
+class CachedModelSerializer(serializers.ModelSerializer):
+    """
+    ``ModelSerializer`` that introspects the model once per class.
+
+    The fields built for the first instance are kept as prototypes and
+    every instance gets fresh copies of them. Output made only of plain
+    model columns is read by precompiled per-field readers instead of the
+    generic ``get_attribute`` path; the values still go through each
+    field's ``to_representation``, so the output is unchanged.
+    """
+
+    # Field classes whose output depends on the value alone.
+    PLAIN_FIELDS = (
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.DateTimeField,
+        serializers.EmailField,
+        serializers.IntegerField,
+    )
 
+    def get_fields(self) -> dict:
+        cls = type(self)
+        prototypes = cls.__dict__.get("_prototype_fields")
+        if prototypes is None:
+            prototypes = super().get_fields()
+            cls._prototype_fields = prototypes
+        return copy.deepcopy(prototypes)
 
-class UserCreateSerializer(serializers.ModelSerializer):
+    @classmethod
+    def compile_readers(cls, fields: dict) -> list | None:
+        """
+        Return ``(name, attribute, to_representation)`` for each readable
+        field, or None unless all of them read plain model columns.
+        """
+        columns = {
+            field.attname for field in cls.Meta.model._meta.concrete_fields
+        }
+        readers = []
+        for name, field in fields.items():
+            if field.write_only:
+                continue
+            attribute = field.source or name
+            if type(field) not in cls.PLAIN_FIELDS or attribute not in columns:
+                return None
+            readers.append((name, attribute, field.to_representation))
+        return readers
+
+    def to_representation(self, instance) -> dict:
+        cls = type(self)
+        if "_readers" not in cls.__dict__:
+            cls._readers = cls.compile_readers(self.get_fields())
+        if cls._readers is None or not isinstance(instance, cls.Meta.model):
+            return super().to_representation(instance)
+        representation = {}
+        for name, attribute, to_representation in cls._readers:
+            value = getattr(instance, attribute)
+            representation[name] = (
+                None if value is None else to_representation(value)
+            )
+        return representation
+
+
+class UserCreateSerializer(TimedSerializerMixin, CachedModelSerializer):
     """User model serializer."""
 
     class Meta:
@@ -17,6 +116,15 @@ class UserCreateSerializer(serializers.ModelSerializer):
             "last_name",
         ]
         extra_kwargs = {
+            "email": {
+                "validators": [
+                    CaseInsensitiveUniqueValidator(
+                        User.objects.all(),
+                        message="A user with that email address already "
+                        "exists.",
+                    )
+                ],
+            },
             "password": {
                 "write_only": True,
                 "min_length": 8,
@@ -47,8 +155,30 @@ class UserCreateSerializer(serializers.ModelSerializer):
             },
         }
 
+    def create(self, validated_data: dict) -> User:
+        return User.objects.create_user(**validated_data)
+
+
+class UserImportSerializer(UserCreateSerializer):
+    """
+    User model serializer for one row of a bulk import.
 
-class UserManageSerializer(serializers.ModelSerializer):
+    Uniqueness is not checked here; the importer checks it for a whole batch
+    with a single query per column.
+    """
+
+    def get_fields(self) -> dict:
+        fields = super().get_fields()
+        for field in fields.values():
+            field.validators = [
+                validator
+                for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+        return fields
+
+
+class UserManageSerializer(TimedSerializerMixin, CachedModelSerializer):
     """User model serializer for managing a user profile."""
 
     class Meta:
@@ -63,6 +193,23 @@ class UserManageSerializer(serializers.ModelSerializer):
         ]
 
 
+class UserDirectorySerializer(TimedSerializerMixin, CachedModelSerializer):
+    """User model serializer for the staff user directory."""
+
+    class Meta:
+        model = User
+        fields = [
+            "id",
+            "email",
+            "username",
+            "first_name",
+            "last_name",
+            "is_active",
+            "is_staff",
+            "date_joined",
+        ]
+
+
 class UserUpdateSerializer(UserCreateSerializer):
     """User model serializer for updating a user profile without a password."""
 
@@ -71,7 +218,9 @@ class UserUpdateSerializer(UserCreateSerializer):
         fields.remove("password")
 
 
-class UserPasswordUpdateSerializer(serializers.ModelSerializer):
+class UserPasswordUpdateSerializer(
+    TimedSerializerMixin, CachedModelSerializer
+):
     """User model serializer for updating a user's password."""
 
     class Meta:
@@ -90,5 +239,82 @@ class UserPasswordUpdateSerializer(serializers.ModelSerializer):
 
     def update(self, instance: User, validated_data: dict) -> User:
         instance.set_password(validated_data["password"])
-        instance.save()
+        instance.save(update_fields=["password"])
+        cache_token_version(instance)
         return instance
+
+
+# Columns read by UserTokenObtainPairSerializer.get_token().
+TOKEN_CLAIM_FIELDS = (
+    "id",
+    "email",
+    "is_active",
+    "is_staff",
+    "token_version",
+)
+
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token pair serializer that signs the claims used for stateless auth."""
+
+    @classmethod
+    def get_token(cls, user: User) -> Token:
+        token = super().get_token(user)
+        token["email"] = user.email
+        token["is_staff"] = user.is_staff
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh serializer that rejects revoked refresh tokens and tokens issued
+    before a password change, and revokes the old token when rotating.
+    """
+
+    def validate(self, attrs: dict) -> dict:
+        refresh = self.token_class(attrs["refresh"])
+        if is_token_revoked(refresh):
+            raise TokenError(_("Token has been revoked"))
+        user = (
+            User.objects.filter(
+                pk=refresh[api_settings.USER_ID_CLAIM], is_active=True
+            )
+            .only(*TOKEN_CLAIM_FIELDS)
+            .first()
+        )
+        if user is None:
+            raise TokenError(_("User not found"))
+        if refresh.get(TOKEN_VERSION_CLAIM, 0) != user.token_version:
+            raise TokenError(_("The user's password has been changed."))
+
+        # Claims come from the current row, not the old token, so a
+        # refresh never extends privileges the user has since lost.
+        fresh = UserTokenObtainPairSerializer.get_token(user)
+        data = {"access": str(fresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # Losing the race to revoke means another request already
+            # spent this token.
+            if not revoke_token(refresh):
+                raise TokenError(_("Token has been revoked"))
+            data["refresh"] = str(fresh)
+        return data
+
+
+class UserTokenVerifySerializer(TokenVerifySerializer):
+    """Verify serializer that also rejects revoked tokens."""
+
+    def validate(self, attrs: dict) -> dict:
+        if is_token_revoked(UntypedToken(attrs["token"])):
+            raise TokenError(_("Token has been revoked"))
+        return {}
+
+
+class TokenLogoutSerializer(serializers.Serializer):
+    """Revokes the given refresh token."""
+
+    refresh = serializers.CharField(write_only=True)
+
+    def validate(self, attrs: dict) -> dict:
+        revoke_token(RefreshToken(attrs["refresh"]))
+        return {}
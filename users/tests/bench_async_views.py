@@ -0,0 +1,84 @@
+"""
+Throughput of the sync DRF and native async ``me`` views under concurrent
+ASGI requests.
+
+Each round fires ``BENCH_CONCURRENCY`` (1,000 by default) requests at once
+through Django's ASGI handler and reports requests per second and latency
+percentiles. Run with ``DJANGO_SETTINGS_PROFILE=bench python manage.py test
+users.tests.bench_async_views``; the dev profile adds the sync-only debug
+toolbar middleware, which forces every request through a thread. The
+in-process handler leaves out the server and network; for numbers
+behind a real server, run the project under uvicorn and point a load
+generator at /api/v1/users/me/ and /api/v1/users/me/async/.
+"""
+
+import asyncio
+import os
+import time
+from unittest import mock, skipIf
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.conf import settings
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.tests.utils import latency_percentiles, report
+
+
+@skipIf(
+    "debug_toolbar" in settings.INSTALLED_APPS,
+    "Run with DJANGO_SETTINGS_PROFILE=bench.",
+)
+@mock.patch(
+    "users.throttling.SlidingWindowScopedRateThrottle.THROTTLE_RATES",
+    {"me": None},
+)
+class AsyncViewsBenchmark(TestCase):
+    async def run_round(self, method: str, url: str, **kwargs) -> dict:
+        request = getattr(self.async_client, method)
+
+        async def timed():
+            start = time.perf_counter()
+            response = await request(url, headers=self.headers, **kwargs)
+            self.assertLess(response.status_code, 300)
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        samples = await asyncio.gather(
+            *(timed() for _ in range(self.concurrency))
+        )
+        elapsed = time.perf_counter() - start
+        return {
+            "req/s": self.concurrency / elapsed,
+            **latency_percentiles(samples),
+        }
+
+    async def compare(self, title: str, method: str, **kwargs) -> None:
+        for name in ("me", "me-async"):
+            cache.clear()
+            result = await self.run_round(
+                method, reverse(f"users:{name}"), **kwargs
+            )
+            report(f"{title}, {name}", result, "")
+
+    async def test_me(self):
+        self.concurrency = int(os.getenv("BENCH_CONCURRENCY", 1000))
+        user = await get_user_model().objects.acreate(
+            email="bench@example.com"
+        )
+        self.headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(user)}"
+        }
+
+        print(f"\n{self.concurrency} concurrent requests per round")
+        await self.compare("GET, cached", "get")
+        with override_settings(USER_PROFILE_CACHE_TIMEOUT=0):
+            await self.compare("GET, uncached", "get")
+        await self.compare(
+            "PATCH",
+            "patch",
+            data={"first_name": "Bench"},
+            content_type="application/json",
+        )
@@ -0,0 +1,90 @@
+"""
+Latency of GET /api/v1/users/me/ with per-request, persistent and pooled
+database connections.
+
+Requests go through a real WSGIHandler so connections are opened and
+released by the request_started/request_finished signals exactly as in a
+deployment. Run with
+``python manage.py test users.tests.bench_connection_pool``; with POSTGRES=True
+the pooled variant is included, while on the SQLite fallback the in-memory
+test database keeps one connection and the modes only differ in overhead.
+"""
+
+import time
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test import TransactionTestCase
+from rest_framework.reverse import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.tests.utils import bench_iterations, latency_percentiles, report
+from users.views import ManageUserView
+
+
+class ConnectionPoolBenchmark(TransactionTestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="bench@example.com", password="benchpassword"
+        )
+        self.environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": reverse("users:me"),
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "HTTP_HOST": "testserver",
+            "HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}",
+            "wsgi.input": BytesIO(),
+            "wsgi.url_scheme": "http",
+        }
+        self.handler = WSGIHandler()
+        self.settings_dict = connection.settings_dict
+        self.addCleanup(
+            self.settings_dict.update,
+            {
+                "CONN_MAX_AGE": self.settings_dict["CONN_MAX_AGE"],
+                "OPTIONS": dict(self.settings_dict["OPTIONS"]),
+            },
+        )
+
+    def request(self) -> float:
+        start = time.perf_counter()
+        response = self.handler(dict(self.environ), lambda *args: None)
+        b"".join(response)
+        response.close()
+        return time.perf_counter() - start
+
+    def run_mode(self, iterations: int, **settings) -> dict[str, float]:
+        connection.close()
+        self.settings_dict.update(settings)
+        self.request()
+        samples = [self.request() for _ in range(iterations)]
+        return latency_percentiles(samples)
+
+    def test_connection_modes(self):
+        iterations = bench_iterations()
+        modes = {
+            "per-request": {"CONN_MAX_AGE": 0},
+            "persistent": {"CONN_MAX_AGE": 600},
+        }
+        if connection.vendor == "postgresql":
+            modes["pooled"] = {
+                "CONN_MAX_AGE": 0,
+                "OPTIONS": {"pool": {"min_size": 2, "max_size": 4}},
+            }
+
+        with mock.patch.object(ManageUserView, "throttle_classes", []):
+            for name, settings in modes.items():
+                results = self.run_mode(iterations, **settings)
+                report(
+                    f"GET /api/v1/users/me/, {name} connections "
+                    f"({connection.vendor})",
+                    results,
+                    "ms",
+                )
+                if "pool" in settings.get("OPTIONS", {}):
+                    connection.close()
+                    connection.close_pool()
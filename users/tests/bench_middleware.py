@@ -0,0 +1,46 @@
+"""
+Per-request middleware overhead of the users API with the minimal scoped
+pipeline against the full session, CSRF, auth and messages stack.
+
+Run with ``python manage.py test users.tests.bench_middleware``.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from LibraryServiceAPI.middleware import MiddlewareScope
+from users.tests.utils import bench_iterations, ops_per_second, report
+
+FULL = settings.MIDDLEWARE_SCOPES["/"]
+
+
+class MiddlewareBenchmark(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="bench@example.com"
+        )
+
+    def test_middleware_overhead(self):
+        iterations = bench_iterations(5000)
+        request = RequestFactory().get("/api/v1/users/me/")
+        auth = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        results = {}
+        for label, stack in (("full", FULL), ("minimal", [])):
+            scope = MiddlewareScope(stack, lambda r: HttpResponse(), False)
+            results[f"pipeline only, {label}"] = ops_per_second(
+                lambda: scope.handler(request), iterations
+            )
+
+            scopes = {"/": FULL, "/api/v1/users/": stack}
+            with override_settings(MIDDLEWARE_SCOPES=scopes):
+                client = Client()
+                results[f"me GET, {label}"] = ops_per_second(
+                    lambda: client.get(reverse("users:me"), headers=auth),
+                    iterations // 10,
+                )
+        report("Users API middleware", results, "requests/s")
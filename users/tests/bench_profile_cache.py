@@ -0,0 +1,54 @@
+"""
+Throughput of GET /api/v1/users/me/ with and without the profile cache.
+
+Run with ``python manage.py test users.tests.bench_profile_cache``.
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from users.authentication import StatelessJWTAuthentication
+from users.tests.utils import bench_iterations, ops_per_second, report
+from users.views import ManageUserView
+
+
+class ProfileCacheBenchmark(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(
+            email="bench@example.com", password="benchpassword"
+        )
+        token = APIClient().post(
+            reverse("token_obtain_pair"),
+            data={"email": "bench@example.com", "password": "benchpassword"},
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {token.data['access']}"
+        )
+        self.url = reverse("users:me")
+
+    def get(self, **headers):
+        return lambda: self.client.get(self.url, **headers)
+
+    def test_profile_cache(self):
+        iterations = bench_iterations()
+        results = {}
+        with mock.patch.object(
+            ManageUserView,
+            "authentication_classes",
+            [StatelessJWTAuthentication],
+        ), mock.patch.object(ManageUserView, "throttle_classes", []):
+            with override_settings(USER_PROFILE_CACHE_TIMEOUT=0):
+                results["no cache"] = ops_per_second(self.get(), iterations)
+            results["cache"] = ops_per_second(self.get(), iterations)
+            etag = self.client.get(self.url)["ETag"]
+            results["cache + If-None-Match"] = ops_per_second(
+                self.get(HTTP_IF_NONE_MATCH=etag), iterations
+            )
+        report("GET /api/v1/users/me/ (stateless JWT)", results, "req/s")
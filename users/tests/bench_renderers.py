@@ -0,0 +1,56 @@
+"""
+Renders and parses per second of UserManageSerializer payloads with the
+orjson renderer and parser against DRF's stdlib json ones.
+
+Run with ``python manage.py test users.tests.bench_renderers``.
+"""
+
+import io
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from LibraryServiceAPI.parsers import ORJSONParser
+from LibraryServiceAPI.renderers import ORJSONRenderer
+from users.serializers import UserManageSerializer
+from users.tests.utils import bench_iterations, ops_per_second, report
+
+
+class RendererBenchmark(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        User.objects.bulk_create(
+            User(
+                email=f"user{number}@example.com",
+                username=f"user{number}",
+                first_name="Zoë",
+                last_name="User",
+            )
+            for number in range(50)
+        )
+        users = list(User.objects.all())
+        cls.one = UserManageSerializer(users[0]).data
+        cls.page = UserManageSerializer(users, many=True).data
+
+    def test_renderers(self):
+        iterations = bench_iterations(20000)
+        results = {}
+        for name, data, count in (
+            ("me", self.one, iterations),
+            ("page of 50", self.page, iterations // 50),
+        ):
+            body = JSONRenderer().render(data)
+            for label, renderer, parser in (
+                ("json", JSONRenderer(), JSONParser()),
+                ("orjson", ORJSONRenderer(), ORJSONParser()),
+            ):
+                results[f"render {name}, {label}"] = ops_per_second(
+                    lambda: renderer.render(data), count
+                )
+                results[f"parse {name}, {label}"] = ops_per_second(
+                    lambda: parser.parse(io.BytesIO(body)), count
+                )
+        report("UserManageSerializer payloads", results, "ops/s")
@@ -0,0 +1,83 @@
+"""
+Serializations per second of the users serializers against the same
+serializers as stock ModelSerializers, which introspect the model on every
+instantiation.
+
+Run with ``python manage.py test users.tests.bench_serializers``.
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import serializers
+
+from users.serializers import (
+    UserDirectorySerializer,
+    UserManageSerializer,
+    UserUpdateSerializer,
+)
+from users.tests.utils import bench_iterations, ops_per_second, report
+
+
+def plain(serializer_class):
+    class Plain(serializers.ModelSerializer):
+        Meta = serializer_class.Meta
+
+    return Plain
+
+
+class SerializerBenchmark(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            email="bench@example.com",
+            username="bench",
+            first_name="Bench",
+            last_name="User",
+        )
+        User.objects.bulk_create(
+            User(email=f"user{number}@example.com", last_name="User")
+            for number in range(50)
+        )
+        cls.page = list(User.objects.all()[:50])
+
+    def test_serializers(self):
+        iterations = bench_iterations(5000)
+
+        def me(cls):
+            return cls(self.user).data
+
+        def directory_page(cls):
+            return cls(self.page, many=True).data
+
+        def me_patch(cls):
+            # No email in the payload, so no uniqueness query runs.
+            serializer = cls(
+                self.user, data={"first_name": "Changed"}, partial=True
+            )
+            serializer.is_valid(raise_exception=True)
+
+        results = {}
+        for name, serializer_class, serialize, count in (
+            ("me GET", UserManageSerializer, me, iterations),
+            (
+                "directory page of 50",
+                UserDirectorySerializer,
+                directory_page,
+                iterations // 50,
+            ),
+            (
+                "me PATCH validation",
+                UserUpdateSerializer,
+                me_patch,
+                iterations,
+            ),
+        ):
+            for label, cls in (
+                ("ModelSerializer", plain(serializer_class)),
+                ("cached", serializer_class),
+            ):
+                results[f"{name}, {label}"] = ops_per_second(
+                    lambda: serialize(cls), count
+                )
+        report("Users serializers", results, "serializations/s")
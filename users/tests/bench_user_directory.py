@@ -0,0 +1,108 @@
+"""
+Latency of the staff user directory over a large table: keyset versus
+OFFSET pages deep into the table, and prefix search.
+
+Run with ``python manage.py test users.tests.bench_user_directory``. The
+table holds ``BENCH_USERS`` synthetic users (1,000,000 by default), so
+populating it takes a while.
+"""
+
+import os
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.reverse import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from users.pagination import DateJoinedKeysetPagination, encode_cursor
+from users.tests.utils import bench_iterations, latency_percentiles, report
+
+LAST_NAMES = [
+    "Smith",
+    "Johnson",
+    "Williams",
+    "Brown",
+    "Jones",
+    "Garcia",
+    "Miller",
+    "Davis",
+    "Rodriguez",
+    "Martinez",
+]
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer"]
+
+
+def measure(func, iterations: int) -> dict[str, float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return latency_percentiles(samples)
+
+
+class UserDirectoryBenchmark(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.total = int(os.getenv("BENCH_USERS", 1_000_000))
+        rng = random.Random(0)
+        start = timezone.now() - timedelta(days=365)
+        User = get_user_model()
+        batch = []
+        for number in range(cls.total):
+            batch.append(
+                User(
+                    email=f"user{number}@example.com",
+                    username=f"user{number}",
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=f"{rng.choice(LAST_NAMES)}{number % 1000}",
+                    password="!",
+                    date_joined=start + timedelta(seconds=number // 3),
+                )
+            )
+            if len(batch) == 10_000:
+                User.objects.bulk_create(batch)
+                batch = []
+        User.objects.bulk_create(batch)
+        cls.staff = User.objects.create_user(
+            email="staff@example.com", password="benchpassword", is_staff=True
+        )
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.staff)
+
+    def test_user_directory(self):
+        iterations = bench_iterations(50)
+        url = reverse("users:directory")
+        User = get_user_model()
+        paginator = DateJoinedKeysetPagination()
+        results = {}
+        for depth in (0.01, 0.5, 0.99):
+            offset = int(self.total * depth)
+            anchor = User.objects.order_by("date_joined", "id")[offset]
+            cursor = encode_cursor(anchor.date_joined, anchor.pk)
+            ordered = User.objects.order_by("date_joined", "id")
+            results[f"OFFSET {offset:,}"] = measure(
+                lambda: list(ordered[offset : offset + 51]), iterations
+            )
+            request = Request(self.factory.get(url, {"cursor": cursor}))
+            results[f"keyset at {offset:,}"] = measure(
+                lambda: paginator.paginate_queryset(User.objects, request),
+                iterations,
+            )
+        # Searches go through the whole view, including serialization.
+        for term in ("Smith", "Smith42", "Garcia7 Ma", "user99999"):
+            results[f"search {term!r}"] = measure(
+                lambda: self.client.get(url, {"search": term}), iterations
+            )
+
+        print(f"\nUser directory over {self.total:,} users")
+        for name, percentiles in results.items():
+            report(name, percentiles, "ms")
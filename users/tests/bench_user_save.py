@@ -0,0 +1,36 @@
+"""
+Throughput of User.save with and without the clean() fast path.
+
+Run with ``python manage.py test users.tests.bench_user_save``.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.test import TestCase
+
+from users.tests.utils import bench_iterations, ops_per_second, report
+
+
+class UserSaveBenchmark(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="bench@example.com", password="benchpassword"
+        )
+
+    def test_user_save(self):
+        iterations = bench_iterations(2000)
+        user = self.user
+        results = {
+            "save()": ops_per_second(user.save, iterations),
+            "last_login, validated": ops_per_second(
+                lambda: user.save(update_fields=["last_login"], validate=True),
+                iterations,
+            ),
+            "last_login, fast path": ops_per_second(
+                lambda: user.save(update_fields=["last_login"]), iterations
+            ),
+            "update_last_login()": ops_per_second(
+                lambda: update_last_login(None, user), iterations
+            ),
+        }
+        report("User.save", results, "saves/s")
@@ -0,0 +1,204 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from users.admin import UserAdmin, estimated_count
+from users.serializers import UserTokenObtainPairSerializer
+
+# Session, requesting user, count and page; the count is cached after the
+# first page.
+MAX_CHANGELIST_QUERIES = 4
+
+
+class UserAdminTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_superuser(
+            email="admin@example.com", password="test!23password"
+        )
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        User.objects.bulk_create(
+            User(
+                email=f"user{number}@example.com",
+                username=f"user{number}",
+                last_name="Smith" if number % 2 else "Jones",
+                date_joined=start + timedelta(minutes=number),
+            )
+            for number in range(UserAdmin.list_per_page * 2 + 10)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def get(self, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        sql = [query["sql"] for query in queries.captured_queries]
+        self.assertLessEqual(len(sql), MAX_CHANGELIST_QUERIES, sql)
+        self.assertFalse(any("OFFSET" in statement for statement in sql))
+        return response, sql
+
+    def test_changelist_pages_by_cursor(self):
+        url = reverse("admin:users_user_changelist")
+        seen = []
+        data = None
+        while True:
+            response, sql = self.get(url, data)
+            cl = response.context["cl"]
+            seen += [user.pk for user in cl.result_list]
+            if cl.next_url is None:
+                break
+            self.assertEqual(cl.result_count, get_user_model().objects.count())
+            data = {"cursor": cl.next_url.split("cursor=")[1]}
+        self.assertEqual(
+            seen,
+            list(
+                get_user_model()
+                .objects.order_by("date_joined", "id")
+                .values_list("pk", flat=True)
+            ),
+        )
+        # The table count was reused by every later page.
+        self.assertFalse(any("COUNT" in statement for statement in sql))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            reverse("admin:users_user_changelist"), {"cursor": "!"}
+        )
+        self.assertRedirects(
+            response,
+            reverse("admin:users_user_changelist") + "?e=1",
+            fetch_redirect_response=False,
+        )
+
+    def test_search_uses_indexed_lookups(self):
+        url = reverse("admin:users_user_changelist")
+        for term, expected in (
+            ("Smi", get_user_model().objects.filter(last_name="Smith")),
+            ("ADMIN@example.com", [self.admin]),
+        ):
+            with self.subTest(term):
+                response, sql = self.get(url, {"q": term})
+                self.assertTrue(all("LIKE '%" not in s for s in sql))
+                self.assertEqual(
+                    response.context["cl"].result_count, len(expected)
+                )
+
+    def test_filtered_count_stops_at_limit(self):
+        queryset = get_user_model().objects.filter(is_active=True)
+        self.assertEqual(estimated_count(queryset), queryset.count())
+        with mock.patch("users.admin.EXACT_COUNT_LIMIT", 5):
+            self.assertEqual(estimated_count(queryset), 6)
+
+    def test_change_form_uses_autocomplete(self):
+        user = get_user_model().objects.get(username="user1")
+        user.user_permissions.add(*Permission.objects.all()[:3])
+        response = self.client.get(
+            reverse("admin:users_user_change", args=[user.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'class="admin-autocomplete"', count=2)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("admin:autocomplete"),
+                {
+                    "term": "change",
+                    "app_label": "users",
+                    "model_name": "user",
+                    "field_name": "user_permissions",
+                },
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["results"])
+        self.assertLessEqual(len(queries), MAX_CHANGELIST_QUERIES)
+
+    def test_add_user(self):
+        response = self.client.post(
+            reverse("admin:users_user_add"),
+            {
+                "email": "New@Example.com",
+                "usable_password": "true",
+                "password1": "test!23password",
+                "password2": "test!23password",
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        user = get_user_model().objects.get(email="New@example.com")
+        self.assertTrue(user.check_password("test!23password"))
+
+
+class UserAdminTokenRevocationTestCase(TestCase):
+    """Admin changes to a user's credentials or privileges revoke JWTs."""
+
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        admin = User.objects.create_superuser(
+            email="admin@example.com", password="test!23password"
+        )
+        self.client.force_login(admin)
+        self.user = User.objects.create_user(
+            email="staff@example.com",
+            password="test!23password",
+            is_staff=True,
+        )
+        token = UserTokenObtainPairSerializer.get_token(self.user)
+        self.api = APIClient()
+        self.api.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+        response = self.api.get(reverse("users:me"))
+        self.assertEqual(response.status_code, 200)
+
+    def assertTokenRejected(self):
+        response = self.api.get(reverse("users:me"))
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_password_change_revokes_tokens(self):
+        response = self.client.post(
+            reverse("admin:auth_user_password_change", args=[self.user.pk]),
+            {
+                "usable_password": "true",
+                "password1": "new!!!32password",
+                "password2": "new!!!32password",
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("new!!!32password"))
+        self.assertTokenRejected()
+
+    def change(self, **changes):
+        data = {
+            "email": self.user.email,
+            "is_active": "on",
+            "is_staff": "on",
+            "date_joined_0": "2024-01-01",
+            "date_joined_1": "00:00:00",
+        }
+        data.update(changes)
+        response = self.client.post(
+            reverse("admin:users_user_change", args=[self.user.pk]),
+            {key: value for key, value in data.items() if value is not None},
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def test_demotion_revokes_tokens(self):
+        self.change(is_staff=None)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_staff)
+        self.assertTokenRejected()
+
+    def test_deactivation_revokes_tokens(self):
+        self.change(is_active=None)
+        self.assertTokenRejected()
@@ -0,0 +1,227 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.hashing import HashingPool
+from users.serializers import UserTokenObtainPairSerializer
+
+
+class AsyncPasswordViewsTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pool = HashingPool(max_workers=1, queue_limit=0)
+        # Workers of the parallel test runner cannot start processes.
+        cls.pool._executor = ThreadPoolExecutor(max_workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch(
+            "users.async_views.get_hashing_pool", return_value=self.pool
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def auth_header(self, user):
+        return {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+    async def test_register(self):
+        response = await self.async_client.post(
+            reverse("users:register-async"),
+            data={"email": "test@EXAMPLE.com", "password": "test!23password"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = await get_user_model().objects.aget(email="test@example.com")
+        self.assertTrue(user.check_password("test!23password"))
+
+    async def test_register_invalid(self):
+        response = await self.async_client.post(
+            reverse("users:register-async"),
+            data={"email": "test@example.com", "password": "1234"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("password", response.json())
+
+    async def test_register_saturated(self):
+        with mock.patch(
+            "users.async_views.get_hashing_pool",
+            return_value=HashingPool(max_workers=0, queue_limit=0),
+        ):
+            response = await self.async_client.post(
+                reverse("users:register-async"),
+                data={"email": "test@example.com", "password": "test!23pass"},
+                content_type="application/json",
+            )
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(response["Retry-After"], "1")
+
+    async def test_password_update(self):
+        user = await get_user_model().objects.acreate(email="test@example.com")
+        response = await self.async_client.put(
+            reverse("users:password-async"),
+            data={"password": "new!!!32password"},
+            content_type="application/json",
+            headers=self.auth_header(user),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        await user.arefresh_from_db()
+        self.assertTrue(user.check_password("new!!!32password"))
+        self.assertEqual(user.token_version, 1)
+
+    async def test_password_update_unauthenticated(self):
+        response = await self.async_client.put(
+            reverse("users:password-async"),
+            data={"password": "new!!!32password"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(
+        MIDDLEWARE=[
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            "django.middleware.csrf.CsrfViewMiddleware",
+        ]
+    )
+    def test_csrf_exempt(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(
+            reverse("users:register-async"),
+            data={"email": "test@example.com", "password": "test!23password"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        for method, url, data in (
+            ("put", "users:password-async", {"password": "new!!!32password"}),
+            ("patch", "users:me-async", {"first_name": "John"}),
+        ):
+            # Signed with the current token version, which the password
+            # change bumps.
+            token = UserTokenObtainPairSerializer.get_token(
+                get_user_model().objects.get()
+            )
+            response = getattr(client, method)(
+                reverse(url),
+                data=data,
+                content_type="application/json",
+                headers={"Authorization": f"Bearer {token.access_token}"},
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_hashing_metrics(self):
+        user = await get_user_model().objects.acreate(
+            email="staff@example.com", is_staff=True
+        )
+        response = await self.async_client.get(
+            reverse("users:hashing-metrics"),
+            headers=self.auth_header(user),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["max_workers"], 1)
+
+
+class AsyncManageUserViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    async def create_user(self):
+        user = await get_user_model().objects.acreate(
+            email="test@example.com", first_name="John"
+        )
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        return user, headers
+
+    async def test_get(self):
+        user, headers = await self.create_user()
+        response = await self.async_client.get(
+            reverse("users:me-async"), headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["email"], "test@example.com")
+        self.assertIn("private", response["Cache-Control"])
+
+        response = await self.async_client.get(
+            reverse("users:me-async"),
+            headers={**headers, "If-None-Match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_matches_sync_view(self):
+        user, headers = await self.create_user()
+        sync_response = await self.async_client.get(
+            reverse("users:me"), headers=headers
+        )
+        response = await self.async_client.get(
+            reverse("users:me-async"), headers=headers
+        )
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response["ETag"], sync_response["ETag"])
+
+    async def test_patch(self):
+        user, headers = await self.create_user()
+        response = await self.async_client.patch(
+            reverse("users:me-async"),
+            data={"last_name": "Smith"},
+            content_type="application/json",
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["last_name"], "Smith")
+        await user.arefresh_from_db()
+        self.assertEqual((user.first_name, user.last_name), ("John", "Smith"))
+
+    async def test_put_invalid(self):
+        user, headers = await self.create_user()
+        response = await self.async_client.put(
+            reverse("users:me-async"),
+            data={"email": "not-an-email"},
+            content_type="application/json",
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.json())
+
+    async def test_delete(self):
+        user, headers = await self.create_user()
+        response = await self.async_client.delete(
+            reverse("users:me-async"), headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(
+            await get_user_model().objects.filter(pk=user.pk).aexists()
+        )
+
+    async def test_throttled(self):
+        user, headers = await self.create_user()
+        with mock.patch(
+            "users.throttling.SlidingWindowScopedRateThrottle.THROTTLE_RATES",
+            {"me": "1/minute"},
+        ), mock.patch(
+            "users.throttling.SlidingWindowRateThrottle.timer",
+            return_value=90,
+        ):
+            await self.async_client.get(
+                reverse("users:me-async"), headers=headers
+            )
+            response = await self.async_client.get(
+                reverse("users:me-async"), headers=headers
+            )
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", response)
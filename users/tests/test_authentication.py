@@ -0,0 +1,159 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from users.authentication import (
+    ClaimsUser,
+    JWTAuthentication,
+    StatelessJWTAuthentication,
+)
+from users.serializers import UserTokenObtainPairSerializer
+from users.views import ManageUserView, UserPasswordUpdateView
+
+
+class JWTAuthenticationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.factory = APIRequestFactory()
+        self.user = get_user_model().objects.create_user(
+            email="test@example.com", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            data={"email": "test@example.com", "password": "testpassword"},
+        )
+        self.access = response.data["access"]
+
+    def get_request(self):
+        return self.factory.get(
+            reverse("users:me"), HTTP_AUTHORIZATION=f"Bearer {self.access}"
+        )
+
+    def test_token_contains_claims(self):
+        user, token = JWTAuthentication().authenticate(self.get_request())
+        self.assertEqual(user, self.user)
+        self.assertEqual(token["email"], "test@example.com")
+        self.assertEqual(token["is_staff"], False)
+        self.assertEqual(token["ver"], 0)
+
+    def test_stateless_authentication_skips_user_lookup(self):
+        backend = StatelessJWTAuthentication()
+        backend.authenticate(self.get_request())
+
+        with self.assertNumQueries(0):
+            user, _ = backend.authenticate(self.get_request())
+
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.email, "test@example.com")
+        self.assertFalse(user.is_staff)
+
+    def test_claims_user_loads_db_user_once(self):
+        user, _ = StatelessJWTAuthentication().authenticate(self.get_request())
+        with self.assertNumQueries(1):
+            self.assertEqual(user.get_db_user(), self.user)
+            user.get_db_user()
+
+    def test_password_change_revokes_tokens(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.put(
+            reverse("users:password"), data={"password": "new!!!32password"}
+        )
+
+        for backend in (JWTAuthentication(), StatelessJWTAuthentication()):
+            with self.assertRaises(AuthenticationFailed):
+                backend.authenticate(self.get_request())
+
+    def test_demotion_revokes_tokens(self):
+        self.user.is_staff = True
+        self.user.save()
+        refresh = UserTokenObtainPairSerializer.get_token(self.user)
+        self.access = str(refresh.access_token)
+        backend = StatelessJWTAuthentication()
+        user, _ = backend.authenticate(self.get_request())
+        self.assertTrue(user.is_staff)
+
+        self.user.is_staff = False
+        self.user.save()
+
+        for backend in (JWTAuthentication(), StatelessJWTAuthentication()):
+            with self.assertRaises(AuthenticationFailed):
+                backend.authenticate(self.get_request())
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        with mock.patch.object(
+            ManageUserView,
+            "authentication_classes",
+            [StatelessJWTAuthentication],
+        ):
+            response = client.get(reverse("users:me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrelated_save_keeps_tokens(self):
+        self.user.first_name = "John"
+        self.user.save()
+        self.user.last_name = "Doe"
+        self.user.save(update_fields=["last_name"])
+
+        user, _ = StatelessJWTAuthentication().authenticate(self.get_request())
+        self.assertEqual(user.id, self.user.id)
+
+    def test_refresh_keeps_tokens(self):
+        other = get_user_model().objects.get(pk=self.user.pk)
+        other.is_staff = True
+        other.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.token_version, 1)
+
+        self.user.first_name = "X"
+        self.user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.token_version, 1)
+
+    def test_deactivation_revokes_tokens(self):
+        JWTAuthentication().authenticate(self.get_request())
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.token_version, 1)
+        for backend in (JWTAuthentication(), StatelessJWTAuthentication()):
+            with self.assertRaises(AuthenticationFailed):
+                backend.authenticate(self.get_request())
+
+    def test_stateless_views(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        with mock.patch.object(
+            ManageUserView,
+            "authentication_classes",
+            [StatelessJWTAuthentication],
+        ), mock.patch.object(
+            UserPasswordUpdateView,
+            "authentication_classes",
+            [StatelessJWTAuthentication],
+        ):
+            response = client.patch(
+                reverse("users:me"), data={"first_name": "John"}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["first_name"], "John")
+
+            response = client.put(
+                reverse("users:password"),
+                data={"password": "new!!!32password"},
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            response = client.get(reverse("users:me"))
+            self.assertEqual(
+                response.status_code, status.HTTP_401_UNAUTHORIZED
+            )
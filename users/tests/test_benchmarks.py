@@ -0,0 +1,26 @@
+from django.test import TestCase
+
+from users.benchmarks import APIBenchmark, percentiles
+
+
+class APIBenchmarkTestCase(TestCase):
+    def test_percentiles(self):
+        samples = [index / 1000 for index in range(1, 101)]
+        self.assertEqual(
+            percentiles(samples), {"p50": 51.0, "p95": 96.0, "p99": 100.0}
+        )
+
+    def test_run(self):
+        results = APIBenchmark(users=3, iterations=3).run(
+            only=["token verify", "me GET", "me PATCH", "token refresh"]
+        )
+
+        self.assertEqual(
+            list(results),
+            ["token refresh", "token verify", "me GET", "me PATCH"],
+        )
+        for result in results.values():
+            self.assertEqual(result["errors"], 0)
+            self.assertGreater(result["throughput_rps"], 0)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertEqual(results["token verify"]["queries_max"], 0)
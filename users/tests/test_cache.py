@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from users.cache import get_cached_profile
+
+
+class ProfileCacheTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="test@example.com", password="testpassword"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_get_caches_payload(self):
+        response = self.client.get(reverse("users:me"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+        payload, etag = get_cached_profile(self.user.pk)
+        self.assertEqual(payload, response.data)
+        self.assertEqual(etag, response["ETag"])
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get(reverse("users:me"))["ETag"]
+        response = self.client.get(
+            reverse("users:me"), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_patch_invalidates_cache(self):
+        etag = self.client.get(reverse("users:me"))["ETag"]
+        self.client.patch(reverse("users:me"), data={"first_name": "John"})
+        self.assertIsNone(get_cached_profile(self.user.pk))
+
+        response = self.client.get(
+            reverse("users:me"), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["first_name"], "John")
+
+    def test_model_save_and_delete_invalidate_cache(self):
+        self.client.get(reverse("users:me"))
+        self.user.last_name = "Doe"
+        self.user.save()
+        self.assertIsNone(get_cached_profile(self.user.pk))
+
+        self.client.get(reverse("users:me"))
+        user_id = self.user.pk
+        self.user.delete()
+        self.assertIsNone(get_cached_profile(user_id))
+
+    @override_settings(USER_PROFILE_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self):
+        response = self.client.get(reverse("users:me"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(get_cached_profile(self.user.pk))
@@ -0,0 +1,89 @@
+from django.test import SimpleTestCase, override_settings
+
+from users.checks import (
+    ADMIN_MIDDLEWARE,
+    check_admin_middleware,
+    check_production_profile,
+    check_shared_cache,
+)
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+
+class ProductionProfileCheckTestCase(SimpleTestCase):
+    @override_settings(SETTINGS_PROFILE="dev", MIDDLEWARE=MIDDLEWARE)
+    def test_dev_profile_allows_profiling(self):
+        self.assertEqual(check_production_profile(None), [])
+
+    @override_settings(SETTINGS_PROFILE="prod", MIDDLEWARE=MIDDLEWARE)
+    def test_prod_profile_rejects_profiling_middleware(self):
+        errors = check_production_profile(None)
+        self.assertEqual([error.id for error in errors], ["users.E001"])
+
+    @override_settings(
+        SETTINGS_PROFILE="prod",
+        MIDDLEWARE=[],
+        MIDDLEWARE_SCOPES={"/api/v1/users/": MIDDLEWARE},
+    )
+    def test_prod_profile_rejects_scoped_profiling_middleware(self):
+        errors = check_production_profile(None)
+        self.assertEqual([error.id for error in errors], ["users.E001"])
+        self.assertEqual(
+            errors[0].hint,
+            "Remove it from MIDDLEWARE_SCOPES['/api/v1/users/'].",
+        )
+
+    @override_settings(SETTINGS_PROFILE="bench", DEBUG=True, MIDDLEWARE=[])
+    def test_bench_profile_rejects_debug(self):
+        errors = check_production_profile(None)
+        self.assertEqual([error.id for error in errors], ["users.E002"])
+
+    @override_settings(SETTINGS_PROFILE="prod", MIDDLEWARE=[])
+    def test_clean_prod_profile(self):
+        self.assertEqual(check_production_profile(None), [])
+
+
+class AdminMiddlewareCheckTestCase(SimpleTestCase):
+    def test_scoped_admin_middleware(self):
+        self.assertEqual(check_admin_middleware(None), [])
+
+    @override_settings(
+        MIDDLEWARE_SCOPES={
+            "/": list(ADMIN_MIDDLEWARE),
+            "/admin/": ADMIN_MIDDLEWARE[:2],
+        }
+    )
+    def test_admin_scope_missing_middleware(self):
+        errors = check_admin_middleware(None)
+        self.assertEqual([error.id for error in errors], ["users.E003"] * 2)
+
+    @override_settings(MIDDLEWARE=MIDDLEWARE)
+    def test_scopes_need_route_scoped_middleware(self):
+        errors = check_admin_middleware(None)
+        self.assertEqual(len(errors), len(ADMIN_MIDDLEWARE))
+
+
+class SharedCacheCheckTestCase(SimpleTestCase):
+    def test_test_profile_allows_local_memory(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(SETTINGS_PROFILE="prod")
+    def test_prod_profile_rejects_local_memory(self):
+        errors = check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ["users.E004"])
+
+    @override_settings(
+        SETTINGS_PROFILE="prod",
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCATION": "cache_table",
+            }
+        },
+    )
+    def test_prod_profile_with_shared_cache(self):
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,66 @@
+import os
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from LibraryServiceAPI.importtime import measure_cold_start, parse_importtime
+
+# Loaded on demand only: API docs generation and the debug toolbar.
+LAZY_MODULES = (
+    "drf_spectacular.openapi",
+    "drf_spectacular.views",
+    "debug_toolbar",
+)
+
+
+class ColdStartTestCase(SimpleTestCase):
+    def test_wsgi_defers_lazy_modules(self):
+        cold_start = measure_cold_start("wsgi")
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, cold_start.modules)
+        # Nor does a worker build the URLconf before its first request.
+        self.assertNotIn(settings.ROOT_URLCONF, cold_start.modules)
+
+    def test_wsgi_within_budget(self):
+        # Wall clock time depends on the machine and its load, so only
+        # COLD_START_CHECK holds the suite to the production budget.
+        budget = settings.COLD_START[
+            "BUDGET" if os.getenv("COLD_START_CHECK") else "TEST_BUDGET"
+        ]
+        call_command("profile_imports", budget=budget, stdout=StringIO())
+
+    def test_urlconf_defers_docs(self):
+        cold_start = measure_cold_start("urls")
+        self.assertIn(settings.ROOT_URLCONF, cold_start.modules)
+        self.assertNotIn("drf_spectacular.views", cold_start.modules)
+
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |        420 | json\n"
+            "unrelated output\n"
+        )
+        self.assertEqual(
+            [
+                (timing.module, timing.self_us, timing.cumulative_us)
+                for timing in parse_importtime(stderr)
+            ],
+            [("json.decoder", 120, 120), ("json", 300, 420)],
+        )
+
+    def test_profile_imports_command(self):
+        stdout = StringIO()
+        call_command("profile_imports", "manage", limit=3, stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn("Cold start of manage (prod profile)", output)
+        self.assertIn("django", output)
+
+    @override_settings(COLD_START={"BUDGET": 1.0, "RUNS": 1})
+    def test_profile_imports_budget(self):
+        with self.assertRaisesMessage(CommandError, "over the budget"):
+            call_command(
+                "profile_imports", "manage", budget=0.0, stdout=StringIO()
+            )
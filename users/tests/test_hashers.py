@@ -0,0 +1,129 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from users.hashers import rehash_in_background, rehash_password
+
+LOW_COST = {"TIME_COST": 1, "MEMORY_COST": 64, "PARALLELISM": 1}
+INLINE = {"ASYNC": False, "WORKERS": 1}
+BACKGROUND = {"ASYNC": True, "WORKERS": 1}
+HASHERS = [
+    "users.hashers.TunableArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+]
+
+
+@override_settings(
+    PASSWORD_HASHERS=HASHERS,
+    PASSWORD_HASHING_COST=LOW_COST,
+    PASSWORD_REHASH=INLINE,
+)
+class TunableArgon2PasswordHasherTestCase(TestCase):
+    def test_uses_configured_cost(self):
+        encoded = make_password("test!23password")
+        self.assertIn("$m=64,t=1,p=1$", encoded)
+        self.assertFalse(get_hasher().must_update(encoded))
+
+    def test_cost_change_requires_update(self):
+        encoded = make_password("test!23password")
+        with override_settings(
+            PASSWORD_HASHING_COST={**LOW_COST, "TIME_COST": 2}
+        ):
+            self.assertTrue(get_hasher().must_update(encoded))
+
+
+@override_settings(PASSWORD_HASHERS=HASHERS, PASSWORD_HASHING_COST=LOW_COST)
+class RehashOnLoginTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@example.com"
+        )
+        self.legacy = make_password(
+            "test!23password",
+            hasher="pbkdf2_sha256",
+        )
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            password=self.legacy
+        )
+
+    def login(self):
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": "test@example.com", "password": "test!23password"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(PASSWORD_REHASH=INLINE)
+    def test_legacy_hash_upgraded_inline(self):
+        self.login()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("argon2$"))
+        self.assertTrue(self.user.check_password("test!23password"))
+
+    @override_settings(PASSWORD_REHASH=BACKGROUND)
+    def test_legacy_hash_upgraded_after_commit(self):
+        executor = mock.Mock()
+        with mock.patch(
+            "users.hashers.get_rehash_executor", return_value=executor
+        ):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                self.login()
+            self.user.refresh_from_db()
+            self.assertEqual(self.user.password, self.legacy)
+            for callback in callbacks:
+                callback()
+
+        function, *args = executor.submit.call_args.args
+        self.assertIs(function, rehash_in_background)
+        self.assertEqual(
+            args,
+            [self.user.pk, "test!23password", self.legacy, "default"],
+        )
+
+    def test_rehash_skips_changed_password(self):
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            password=make_password("changed!23password")
+        )
+        self.assertIsNone(
+            rehash_password(
+                self.user.pk, "test!23password", self.legacy, "default"
+            )
+        )
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("changed!23password"))
+
+    @override_settings(PASSWORD_REHASH=INLINE)
+    def test_failed_login_keeps_hash(self):
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": "test@example.com", "password": "wrong!23password"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, self.legacy)
+
+
+class CalibratePasswordHasherTestCase(TestCase):
+    def test_reports_cost(self):
+        stdout = StringIO()
+        call_command(
+            "calibrate_password_hasher",
+            target_ms=10_000,
+            memory_cost=64,
+            parallelism=1,
+            max_time_cost=2,
+            samples=1,
+            stdout=stdout,
+        )
+        self.assertIn(
+            "ARGON2_TIME_COST=2\nARGON2_MEMORY_COST=64\nARGON2_PARALLELISM=1",
+            stdout.getvalue(),
+        )
@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+SATURATED_POOL = {
+    "min_size": 2,
+    "max_size": 4,
+    "size": 4,
+    "in_use": 4,
+    "waiting": 3,
+    "saturation": 1.0,
+}
+
+
+class ReadinessViewTestCase(TestCase):
+    def test_ready(self):
+        response = self.client.get(reverse("readiness"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(), {"ready": True, "database": "ok", "pool": None}
+        )
+
+    def test_saturated_pool(self):
+        with mock.patch(
+            "LibraryServiceAPI.views.pool_stats", return_value=SATURATED_POOL
+        ):
+            response = self.client.get(reverse("readiness"))
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertEqual(response.json()["pool"]["waiting"], 3)
+
+    def test_database_unreachable(self):
+        with mock.patch(
+            "LibraryServiceAPI.views.connection.cursor",
+            side_effect=DatabaseError("connection to db.internal refused"),
+        ), self.assertLogs("LibraryServiceAPI.views", "ERROR") as logs:
+            response = self.client.get(reverse("readiness"))
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertEqual(response.json()["database"], "unavailable")
+        self.assertNotIn(b"db.internal", response.content)
+        self.assertIn("db.internal", logs.output[0])
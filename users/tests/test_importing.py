@@ -0,0 +1,204 @@
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from users.hashing import HashingPool
+from users.importing import UserImporter, iter_csv_rows, iter_jsonl_rows
+
+CSV = """email,password,username,first_name
+first@example.com,test!23password,first,John
+second@Example.COM,test!23password,,
+bad-email,test!23password,,
+"""
+
+JSONL = """{"email": "first@example.com", "password": "test!23password"}
+
+not json
+{"email": "first@example.com", "password": "test!23password"}
+{"email": "taken@example.com", "password": "test!23password"}
+"""
+
+
+class UserImporterTestCase(TestCase):
+    def setUp(self):
+        self.User = get_user_model()
+
+    def test_csv_import(self):
+        result = UserImporter(batch_size=2).run(iter_csv_rows(StringIO(CSV)))
+        self.assertEqual(result.created, 2)
+        self.assertEqual([error["row"] for error in result.errors], [3])
+        self.assertIn("email", result.errors[0]["errors"])
+
+        user = self.User.objects.get(email="second@example.com")
+        self.assertIsNone(user.username)
+        self.assertTrue(user.check_password("test!23password"))
+        self.assertEqual(
+            self.User.objects.get(username="first").first_name, "John"
+        )
+
+    def test_jsonl_import_reports_duplicates(self):
+        self.User.objects.create_user(
+            email="taken@example.com", password="password"
+        )
+        result = UserImporter(batch_size=10).run(
+            iter_jsonl_rows(StringIO(JSONL))
+        )
+        self.assertEqual(result.created, 1)
+        self.assertEqual([error["row"] for error in result.errors], [2, 3, 4])
+        self.assertIn("email", result.errors[1]["errors"])
+        self.assertIn("email", result.errors[2]["errors"])
+
+    def test_undecodable_lines_are_rejected(self):
+        lines = CSV.encode().splitlines(keepends=True)
+        lines.insert(2, b"\xff@example.com,test!23password,,\n")
+        result = UserImporter(batch_size=10).run(iter_csv_rows(lines))
+        self.assertEqual(result.created, 2)
+        self.assertEqual([error["row"] for error in result.errors], [2, 4])
+        self.assertEqual(
+            result.errors[0]["errors"], ["Line 3 is not valid UTF-8."]
+        )
+
+        lines = JSONL.encode().splitlines(keepends=True)
+        lines[0] = b'{"email": "\xff"}\n'
+        result = UserImporter(batch_size=10).run(iter_jsonl_rows(lines))
+        self.assertEqual(
+            result.errors[0],
+            {"row": 1, "errors": ["Line 1 is not valid UTF-8."]},
+        )
+
+    def test_queries_per_batch(self):
+        rows = [
+            {
+                "email": f"user{index}@example.com",
+                "username": f"user{index}",
+                "password": "test!23password",
+            }
+            for index in range(20)
+        ]
+        # Two uniqueness probes, the user and search document INSERTs, plus
+        # the savepoint pair.
+        with self.assertNumQueries(6):
+            result = UserImporter(batch_size=20).run(rows)
+        self.assertEqual(result.created, 20)
+
+    def test_parallel_hashing(self):
+        rows = [
+            {"email": f"user{index}@example.com", "password": "test!23pass"}
+            for index in range(4)
+        ]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = UserImporter(batch_size=4, executor=executor).run(rows)
+        self.assertEqual(result.created, 4)
+        self.assertTrue(
+            self.User.objects.get(email="user3@example.com").check_password(
+                "test!23pass"
+            )
+        )
+
+    def test_import_users_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write(CSV)
+            file.flush()
+            stdout, stderr = StringIO(), StringIO()
+            call_command(
+                "import_users",
+                file.name,
+                workers=0,
+                stdout=stdout,
+                stderr=stderr,
+            )
+        self.assertIn("Created 2 users, rejected 1 rows.", stdout.getvalue())
+        self.assertIn('"row": 3', stderr.getvalue())
+
+
+class UserBulkImportViewTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.pool = HashingPool(max_workers=2, queue_limit=0)
+        # Workers of the parallel test runner cannot start processes.
+        self.pool._executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.pool.shutdown)
+        patcher = mock.patch(
+            "users.views.get_hashing_pool", side_effect=lambda: self.pool
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login_staff(self):
+        staff = get_user_model().objects.create_user(
+            email="staff@example.com", password="password", is_staff=True
+        )
+        self.client.force_authenticate(user=staff)
+
+    def test_staff_import(self):
+        self.login_staff()
+        response = self.client.post(
+            reverse("users:import"), data=CSV, content_type="text/csv"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(len(response.data["errors"]), 1)
+
+        response = self.client.post(
+            reverse("users:import"),
+            data=JSONL,
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.data["created"], 1)
+        # Hashed through the pool's slots, which are all free again.
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics["completed"], 3)
+        self.assertEqual(metrics["in_flight"], 0)
+
+    def test_undecodable_body(self):
+        self.login_staff()
+        response = self.client.post(
+            reverse("users:import"),
+            data=CSV.encode() + b"\xff@example.com,test!23password,,\n",
+            content_type="text/csv",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(
+            response.data["errors"][-1],
+            {"row": 4, "errors": ["Line 5 is not valid UTF-8."]},
+        )
+
+    def test_saturated_pool(self):
+        self.login_staff()
+        # Every slot is taken by other password operations.
+        self.pool._acquire(count=2)
+        with override_settings(
+            PASSWORD_HASHING_POOL={
+                **settings.PASSWORD_HASHING_POOL,
+                "IMPORT_TIMEOUT": 0,
+            }
+        ):
+            response = self.client.post(
+                reverse("users:import"), data=CSV, content_type="text/csv"
+            )
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(response.data["created"], 0)
+        self.assertEqual(self.pool.metrics()["rejected"], 2)
+
+    def test_import_requires_staff(self):
+        user = get_user_model().objects.create_user(
+            email="test@example.com", password="password"
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.post(
+            reverse("users:import"), data=CSV, content_type="text/csv"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
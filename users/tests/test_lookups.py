@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from users.lookups import prefix_upper_bound, sorts_by_code_point
+
+
+class PrefixUpperBoundTestCase(SimpleTestCase):
+    def test_bounds(self):
+        for prefix, upper in (
+            ("Smi", "Smj"),
+            ("a\uffff", "a\U00010000"),
+            # The next code point up would be a lone surrogate.
+            ("a\ud7ff", "a\ue000"),
+            ("a\U0010ffff", "b"),
+            ("\U0010ffff", None),
+            ("", None),
+        ):
+            with self.subTest(prefix=prefix):
+                self.assertEqual(prefix_upper_bound(prefix), upper)
+
+
+class IndexedStartsWithTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        User.objects.bulk_create(
+            User(email=f"{name}@example.com", last_name=name)
+            for name in ("Smith", "Smi-th", "Smj", "O'Neil", "\ud7ffx")
+        )
+
+    def search(self, term):
+        return sorted(
+            get_user_model()
+            .objects.search_prefix(term)
+            .values_list("last_name", flat=True)
+        )
+
+    def test_matches(self):
+        self.assertEqual(self.search("Smi"), ["Smi-th", "Smith"])
+        self.assertEqual(self.search("O'"), ["O'Neil"])
+
+    def test_surrogate_edge(self):
+        self.assertEqual(self.search("\ud7ff"), ["\ud7ffx"])
+
+    def test_range_only_under_code_point_collations(self):
+        field = get_user_model()._meta.get_field("last_name")
+        self.assertTrue(sorts_by_code_point(connection, field))
+
+        queryset = get_user_model().objects.search_prefix("Smi")
+        self.assertIn(">=", str(queryset.query))
+        with mock.patch(
+            "users.lookups.database_collation", return_value="en_US.UTF-8"
+        ):
+            self.assertFalse(sorts_by_code_point(connection, field))
+            sql = str(queryset.query)
+        self.assertNotIn(">=", sql)
+        self.assertIn("LIKE", sql)
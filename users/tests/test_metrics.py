@@ -0,0 +1,174 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from LibraryServiceAPI.metrics import (
+    RequestMetrics,
+    collect,
+    install_query_recorder,
+    registry,
+    timed,
+)
+
+METRICS = {"SAMPLE_RATE": 1.0, "SERVER_TIMING": True, "TOKEN": None}
+
+
+def server_timing(response) -> dict[str, str]:
+    """Map each Server-Timing metric name to its parameters."""
+    return {
+        entry.split(";", 1)[0]: entry
+        for entry in response["Server-Timing"].split(", ")
+    }
+
+
+class RequestMetricsTestCase(TestCase):
+    def test_collect_counts_queries(self):
+        install_query_recorder(connection)
+        with collect() as metrics:
+            get_user_model().objects.count()
+            get_user_model().objects.exists()
+        self.assertEqual(metrics.queries, 2)
+        self.assertGreater(metrics.db_seconds, 0)
+
+    def test_nested_sections_counted_once(self):
+        with collect() as metrics:
+            with timed("serializer"):
+                with timed("serializer"):
+                    pass
+            with timed("hashing"):
+                pass
+        self.assertEqual(set(metrics.sections), {"serializer", "hashing"})
+
+    def test_timed_without_collection(self):
+        with timed("serializer"):
+            pass
+
+    def test_render(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+        registry.observe(
+            "users:me",
+            "GET",
+            200,
+            0.02,
+            RequestMetrics(queries=3, sections={"serializer": 0.001}),
+        )
+        registry.observe("users:me", "GET", 200, 3.0, None)
+        output = registry.render({"db_pool_in_use": 2})
+        self.assertIn(
+            'http_requests_total{view="users:me",method="GET",status="200"} 2',
+            output,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_bucket{view="users:me",le="0.025"}'
+            " 1",
+            output,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_bucket{view="users:me",le="+Inf"}'
+            " 2",
+            output,
+        )
+        self.assertIn('http_requests_sampled_total{view="users:me"} 1', output)
+        self.assertIn('db_queries_total{view="users:me"} 3', output)
+        self.assertIn(
+            'section_duration_seconds_total{view="users:me",'
+            'section="serializer"} 0.001',
+            output,
+        )
+        self.assertIn("# TYPE db_pool_in_use gauge\ndb_pool_in_use 2", output)
+
+
+@override_settings(REQUEST_METRICS=METRICS)
+class RequestMetricsMiddlewareTestCase(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@example.com", password="test!23password"
+        )
+
+    def staff(self):
+        return get_user_model().objects.create_user(
+            email="staff@example.com", password="password", is_staff=True
+        )
+
+    def test_server_timing(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("users:me"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = server_timing(response)
+        self.assertRegex(timing["db"], r'^db;dur=[\d.]+;desc="\d+ queries"$')
+        self.assertIn("serializer", timing)
+        self.assertIn("total", timing)
+        self.assertEqual(registry.sampled["users:me"], 1)
+
+    def test_hashing_section(self):
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": "test@example.com", "password": "test!23password"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("hashing", server_timing(response))
+
+    def test_query_count_matches_queries_run(self):
+        self.client.force_authenticate(user=self.staff())
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse("users:directory"))
+        self.assertGreater(len(context.captured_queries), 0)
+        self.assertEqual(
+            registry.queries["users:directory"], len(context.captured_queries)
+        )
+
+    @override_settings(REQUEST_METRICS={**METRICS, "SAMPLE_RATE": 0.0})
+    def test_unsampled_requests_are_counted(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("users:me"))
+        self.assertEqual(list(server_timing(response)), ["total"])
+        self.assertEqual(registry.requests["users:me", "GET", 200], 1)
+        self.assertNotIn("users:me", registry.sampled)
+
+    @override_settings(REQUEST_METRICS={**METRICS, "SERVER_TIMING": False})
+    def test_server_timing_disabled(self):
+        response = self.client.get(reverse("readiness"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(registry.requests["readiness", "GET", 200], 1)
+
+
+@override_settings(REQUEST_METRICS={**METRICS, "TOKEN": "secret"})
+class MetricsViewTestCase(TestCase):
+    def test_requires_token(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_prometheus_text(self):
+        self.client.get(reverse("readiness"))
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertRegex(
+            response.content.decode(),
+            re.compile(
+                r'^http_requests_total\{view="readiness",method="GET",'
+                r'status="200"\} \d+$',
+                re.MULTILINE,
+            ),
+        )
+
+    @override_settings(DEBUG=False, REQUEST_METRICS=METRICS)
+    def test_hidden_without_token_outside_debug(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
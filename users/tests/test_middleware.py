@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class RouteScopedMiddlewareTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="test!23password"
+        )
+        cls.auth = {
+            "Authorization": f"Bearer {AccessToken.for_user(cls.admin)}"
+        }
+
+    def test_users_api_skips_session_and_csrf(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(reverse("users:directory"), headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(hasattr(response.wsgi_request, "session"))
+
+        response = client.post(
+            reverse("users:register"),
+            {"email": "test@example.com", "password": "test!23password"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.cookies, {})
+
+    def test_admin_keeps_full_pipeline(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(reverse("admin:login"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("csrftoken", response.cookies)
+        self.assertIn("X-Frame-Options", response)
+
+        # The CSRF check runs from the scoped process_view hook.
+        response = client.post(
+            reverse("admin:login"),
+            {"username": "admin@example.com", "password": "test!23password"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = Client().post(
+            reverse("admin:login"),
+            {"username": "admin@example.com", "password": "test!23password"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertIn("sessionid", response.cookies)
+
+    async def test_async_pipelines(self):
+        response = await self.async_client.get(reverse("admin:login"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("csrftoken", response.cookies)
+
+        response = await self.async_client.get(
+            reverse("users:directory"), headers=self.auth
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(hasattr(response.asgi_request, "session"))
@@ -0,0 +1,70 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.state import ProjectState
+from django.test import TransactionTestCase, tag
+
+
+@tag("slow")
+class MigrationsTestCase(TransactionTestCase):
+    """
+    Runs the migrations against the test database, which the test settings
+    build from the models without them.
+    """
+
+    def setUp(self):
+        # Record the existing schema as migrated so it can be unapplied.
+        call_command("migrate", fake=True, verbosity=0)
+        self.addCleanup(call_command, "migrate", verbosity=0)
+
+    def test_migrate_fresh_database(self):
+        loader = MigrationLoader(connection)
+        # Unapplying every app also runs each reverse migration.
+        for app_label in sorted(loader.migrated_apps):
+            call_command("migrate", app_label, "zero", verbosity=0)
+        self.assertNotIn(
+            get_user_model()._meta.db_table,
+            connection.introspection.table_names(),
+        )
+
+        call_command("migrate", verbosity=0)
+
+        tables = connection.introspection.table_names()
+        for model in apps.get_models():
+            self.assertIn(model._meta.db_table, tables)
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, get_user_model()._meta.db_table
+            )
+        for name in ("unique_email_ci", "user_active_token_version"):
+            self.assertIn(name, constraints)
+        # The migrations describe the models as they are.
+        loader = MigrationLoader(connection)
+        changes = MigrationAutodetector(
+            loader.project_state(), ProjectState.from_apps(apps)
+        ).changes(graph=loader.graph)
+        self.assertEqual(changes, {})
+
+    def test_case_variant_emails_block_unique_email_ci(self):
+        call_command("migrate", "users", "0005", verbosity=0)
+        User = get_user_model()
+        User.objects.bulk_create(
+            [
+                User(email="first@example.com"),
+                User(email="Dup@example.com"),
+                User(email="dup@example.com"),
+            ]
+        )
+
+        with self.assertRaisesMessage(RuntimeError, "unique_email_ci") as cm:
+            call_command("migrate", "users", verbosity=0)
+        message = str(cm.exception)
+        self.assertIn("Dup@example.com", message)
+        self.assertIn("dup@example.com", message)
+        self.assertNotIn("first@example.com", message)
+
+        User.objects.filter(email="Dup@example.com").delete()
+        call_command("migrate", "users", verbosity=0)
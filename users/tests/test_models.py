@@ -1,5 +1,14 @@
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
 from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from users.cache import PROFILE_FIELDS
+from users.importing import UserImporter
+from users.serializers import UserManageSerializer
 
 
 class TestUserModel(TestCase):
@@ -61,3 +70,93 @@ class TestUserModel(TestCase):
             email="test@example.com", password="password"
         )
         self.assertEqual(str(user), "test@example.com")
+
+
+class TestUserSave(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.User = get_user_model()
+        cls.user = cls.User.objects.create_user(
+            email="test@example.com", password="password"
+        )
+
+    def test_full_save_validates(self):
+        with mock.patch.object(self.User, "clean") as clean:
+            self.user.save()
+        clean.assert_called_once()
+
+    def test_system_update_skips_validation(self):
+        with mock.patch.object(self.User, "clean") as clean:
+            update_last_login(None, self.user)
+            self.user.set_password("new!!!32password")
+            self.user.save(update_fields=["password"])
+        clean.assert_not_called()
+
+    def test_profile_update_validates(self):
+        with mock.patch.object(self.User, "clean") as clean:
+            self.user.save(update_fields=["first_name", "last_login"])
+        clean.assert_called_once()
+
+    def test_explicit_validation_mode(self):
+        with mock.patch.object(self.User, "clean") as clean:
+            self.user.save(validate=False)
+            self.user.save(update_fields=["last_login"], validate=True)
+        clean.assert_called_once()
+
+    def test_profile_fields_match_serializer(self):
+        self.assertEqual(PROFILE_FIELDS, set(UserManageSerializer.Meta.fields))
+
+
+class TestCaseInsensitiveEmail(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.User = get_user_model()
+        cls.user = cls.User.objects.create_user(
+            email="John.Smith@Example.com", password="testpassword"
+        )
+
+    def test_email_case_is_preserved(self):
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, "John.Smith@example.com")
+
+    def test_get_by_natural_key_ignores_case(self):
+        with self.assertNumQueries(1):
+            user = self.User.objects.get_by_natural_key(
+                "JOHN.smith@EXAMPLE.com"
+            )
+        self.assertEqual(user, self.user)
+
+    def test_login_ignores_case(self):
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            data={
+                "email": "john.smith@example.com",
+                "password": "testpassword",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_registration_rejects_case_variant(self):
+        response = self.client.post(
+            reverse("users:register"),
+            data={
+                "email": "JOHN.SMITH@example.com",
+                "password": "test!23password",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["email"],
+            ["A user with that email address already exists."],
+        )
+
+    def test_import_rejects_case_variant(self):
+        result = UserImporter(batch_size=10).run(
+            [
+                {"email": "john.smith@example.com", "password": "test!23pass"},
+                {"email": "Jane@example.com", "password": "test!23pass"},
+                {"email": "jane@example.com", "password": "test!23pass"},
+            ]
+        )
+        self.assertEqual(result.created, 1)
+        self.assertEqual([error["row"] for error in result.errors], [1, 3])
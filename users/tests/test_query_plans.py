@@ -0,0 +1,29 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase
+
+from users.management.commands.explain_auth_queries import hot_queries
+
+
+class AuthIndexesTestCase(TestCase):
+    def test_email_unique_ignoring_case(self):
+        get_user_model().objects.create_user(
+            email="john@example.com", password="testpassword"
+        )
+        with self.assertRaises(IntegrityError):
+            get_user_model().objects.create_user(
+                email="John@example.com", password="testpassword"
+            )
+
+    def test_hot_queries_use_indexes(self):
+        stdout = StringIO()
+        call_command("explain_auth_queries", stdout=stdout)
+        output = stdout.getvalue()
+
+        for name in hot_queries():
+            self.assertIn(f"{name}:", output)
+        # SQLite reports full table scans as "SCAN <table>".
+        self.assertNotIn("SCAN users_user", output)
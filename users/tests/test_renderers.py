@@ -0,0 +1,147 @@
+import io
+import json
+import math
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from LibraryServiceAPI.parsers import ORJSONParser
+from LibraryServiceAPI.renderers import ORJSONRenderer
+from users.serializers import UserManageSerializer
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    def assertRendersLikeJSONRenderer(self, data, media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type),
+        )
+
+    def test_matches_json_renderer(self):
+        for data in (
+            None,
+            {},
+            [],
+            {"email": ["Enter a valid email address."]},
+            {"detail": ErrorDetail("Not found.", code="not_found")},
+            {"name": "Zoë 李", "line": "a\u2028b\u2029c"},
+            {"id": uuid.UUID(int=1), 1: True, "none": None},
+            {"at": datetime(2024, 1, 1, 12, 30, 5, 123456, timezone.utc)},
+            {"naive": datetime(2024, 1, 1), "day": date(2024, 1, 1)},
+            {"price": Decimal("1.50"), "lazy": gettext_lazy("Invalid.")},
+            {"wait": timedelta(seconds=90), "float": 0.1, "big": 2**62},
+        ):
+            with self.subTest(data=data):
+                self.assertRendersLikeJSONRenderer(data)
+
+    def test_floats(self):
+        data = {"small": 1e-7, "large": 1e16, "list": [2.5, -0.0]}
+        rendered = ORJSONRenderer().render(data)
+        self.assertIn(b'"large":1e16', rendered)
+        self.assertEqual(
+            json.loads(rendered),
+            json.loads(JSONRenderer().render(data)),
+        )
+
+    def test_non_finite_floats_are_rejected(self):
+        for value in (
+            math.nan,
+            math.inf,
+            [{"n": -math.inf}],
+            {"n": None, "m": math.nan},
+            Decimal("NaN"),
+        ):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                ORJSONRenderer().render({"value": value})
+
+    def test_unencodable_falls_back_to_json_renderer(self):
+        for data in ({"big": 2**64}, {"small": -(2**70)}):
+            with self.subTest(data=data):
+                self.assertRendersLikeJSONRenderer(data)
+
+    def test_indent_falls_back_to_json_renderer(self):
+        self.assertRendersLikeJSONRenderer(
+            {"a": [1, 2]}, "application/json; indent=4"
+        )
+
+
+class ORJSONParserTestCase(SimpleTestCase):
+    def parse(self, body, parser_context=None):
+        return ORJSONParser().parse(io.BytesIO(body), None, parser_context)
+
+    def test_matches_json_parser(self):
+        body = '{"email": "zoë@example.com", "n": [1, 2.5, null]}'.encode()
+        self.assertEqual(
+            self.parse(body),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_other_encodings(self):
+        body = '{"name": "Zoë"}'.encode("latin-1")
+        self.assertEqual(
+            self.parse(body, {"encoding": "latin-1"}), {"name": "Zoë"}
+        )
+
+    def test_falls_back_to_json_parser(self):
+        for body in (
+            b'"\\ud800"',
+            b"123456789012345678901234567890",
+            b"[-9223372036854775809, 18446744073709551616]",
+        ):
+            with self.subTest(body=body):
+                self.assertEqual(
+                    self.parse(body), JSONParser().parse(io.BytesIO(body))
+                )
+        self.assertEqual(
+            self.parse(b"123456789012345678901234567890"),
+            123456789012345678901234567890,
+        )
+
+    def test_invalid_json(self):
+        for body in (b"{", b'{"n": NaN}'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                self.parse(body)
+
+
+class ResponseCompatibilityTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="test@example.com",
+            password="test!23password",
+            first_name="Zoë",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_me(self):
+        response = self.client.get(reverse("users:me"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.content,
+            JSONRenderer().render(UserManageSerializer(self.user).data),
+        )
+
+    def test_json_request_and_error(self):
+        response = self.client.patch(
+            reverse("users:me"),
+            {"email": "not an email"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.content, JSONRenderer().render(response.data)
+        )
+        self.assertEqual(response["Content-Type"], "application/json")
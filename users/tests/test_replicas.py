@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.test import TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from LibraryServiceAPI.routers import apply_user_pin, monitor, replica_reads
+from users.serializers import UserTokenObtainPairSerializer
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], USER_PROFILE_CACHE_TIMEOUT=0)
+class ReplicaRouterTestCase(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="testpassword",
+            first_name="Primary",
+        )
+        # A replica that has not caught up with the first name yet.
+        replica_copy = User.objects.get(pk=self.user.pk)
+        replica_copy.first_name = "Replica"
+        replica_copy.save(using="replica")
+        cache.clear()
+        monitor.reset()
+
+    def first_name(self):
+        return get_user_model().objects.get(pk=self.user.pk).first_name
+
+    def test_reads_use_replica_only_when_enabled(self):
+        self.assertEqual(self.first_name(), "Primary")
+        with replica_reads():
+            self.assertEqual(self.first_name(), "Replica")
+        with replica_reads(False):
+            self.assertEqual(self.first_name(), "Primary")
+
+    def test_transactions_read_primary(self):
+        with replica_reads(), transaction.atomic():
+            self.assertEqual(self.first_name(), "Primary")
+
+    def test_writes_go_to_primary_and_pin_reads(self):
+        with replica_reads():
+            user = get_user_model().objects.get(pk=self.user.pk)
+            self.assertEqual(user._state.db, "replica")
+            user.last_name = "Smith"
+            user.save(update_fields=["last_name"])
+            self.assertEqual(self.first_name(), "Primary")
+        self.assertEqual(
+            get_user_model()
+            .objects.using("replica")
+            .get(pk=self.user.pk)
+            .last_name,
+            "",
+        )
+
+        # Later requests of the same user read their write.
+        with replica_reads():
+            apply_user_pin(self.user.pk)
+            self.assertEqual(self.first_name(), "Primary")
+        cache.clear()
+        with replica_reads():
+            apply_user_pin(self.user.pk)
+            self.assertEqual(self.first_name(), "Replica")
+
+    def test_lagging_replica_fails_over(self):
+        with mock.patch("LibraryServiceAPI.routers.measure_lag") as lag:
+            lag.return_value = 10.0
+            with replica_reads():
+                self.assertEqual(self.first_name(), "Primary")
+                # The lag is cached until the next check.
+                lag.return_value = 0.0
+                self.assertEqual(self.first_name(), "Primary")
+            self.assertEqual(lag.call_count, 1)
+
+    def test_unreachable_replica_fails_over(self):
+        with mock.patch(
+            "LibraryServiceAPI.routers.measure_lag",
+            side_effect=DatabaseError,
+        ), replica_reads():
+            self.assertEqual(self.first_name(), "Primary")
+
+    def test_me_reads_your_writes(self):
+        token = UserTokenObtainPairSerializer.get_token(self.user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+        response = client.get(reverse("users:me"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["first_name"], "Replica")
+
+        response = client.patch(reverse("users:me"), {"last_name": "Smith"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Loaded from the primary: the stale first name was not written.
+        self.assertEqual(response.data["first_name"], "Primary")
+
+        response = client.get(reverse("users:me"))
+        self.assertEqual(response.data["last_name"], "Smith")
+        self.assertEqual(response.data["first_name"], "Primary")
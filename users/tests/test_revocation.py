@@ -0,0 +1,197 @@
+import time
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
+
+from users.models import RevokedToken
+from users.revocation import (
+    BloomFilter,
+    expiry_bucket,
+    is_token_revoked,
+    revocation_list,
+    revoke_token,
+)
+
+
+class BloomFilterTestCase(TestCase):
+    def test_added_items_are_members(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [uuid.uuid4().hex for _ in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for _ in range(1000):
+            bloom.add(uuid.uuid4().hex)
+        hits = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+        self.assertLess(hits, 300)
+
+
+class RevocationListTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="test@example.com", password="testpassword"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_unrevoked_token_skips_database(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertFalse(is_token_revoked(token))
+
+        with self.assertNumQueries(0):
+            self.assertFalse(is_token_revoked(token))
+
+    def test_revoked_token(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertTrue(revoke_token(token))
+        self.assertFalse(revoke_token(token))
+
+        self.assertTrue(is_token_revoked(token))
+        revoked = RevokedToken.objects.get()
+        self.assertEqual(revoked.jti.hex, token["jti"])
+        self.assertEqual(revoked.bucket, expiry_bucket(token["exp"]))
+
+    def test_revocation_by_another_process_is_loaded(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertFalse(is_token_revoked(token))
+        cache.add("users:revocation:generation", 0, None)
+
+        RevokedToken.objects.create(
+            jti=token["jti"],
+            expires_at="2100-01-01T00:00Z",
+            bucket=expiry_bucket(token["exp"]),
+        )
+        cache.incr("users:revocation:generation")
+
+        with mock.patch.object(
+            revocation_list, "_rebuild", side_effect=AssertionError
+        ):
+            self.assertTrue(is_token_revoked(token))
+
+    def test_purge_deletes_expired_buckets(self):
+        expired = uuid.uuid4()
+        RevokedToken.objects.create(
+            jti=expired,
+            expires_at="2000-01-01T00:00Z",
+            bucket=expiry_bucket(time.time()) - 1,
+        )
+        token = RefreshToken.for_user(self.user)
+        revoke_token(token)
+
+        call_command("purge_revoked_tokens", stdout=open("/dev/null", "w"))
+
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)),
+            [uuid.UUID(token["jti"])],
+        )
+        self.assertEqual(revocation_list.purge(), 0)
+
+
+class TokenRevocationViewsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@example.com", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            data={"email": "test@example.com", "password": "testpassword"},
+        )
+        self.access = response.data["access"]
+        self.refresh = response.data["refresh"]
+
+    def test_refresh_rotates_and_revokes_old_token(self):
+        response = self.client.post(
+            reverse("token_refresh"), data={"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data["refresh"], self.refresh)
+
+        response = self.client.post(
+            reverse("token_refresh"), data={"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rotated_token_is_spent_once(self):
+        # Both requests pass the filter check, as concurrent ones would.
+        with mock.patch(
+            "users.serializers.is_token_revoked", return_value=False
+        ):
+            responses = [
+                self.client.post(
+                    reverse("token_refresh"), data={"refresh": self.refresh}
+                )
+                for _ in range(2)
+            ]
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_200_OK, status.HTTP_401_UNAUTHORIZED],
+        )
+
+    def test_refresh_signs_current_claims(self):
+        User = get_user_model()
+        User.objects.filter(pk=self.user.pk).update(
+            email="new@example.com", is_staff=True
+        )
+
+        response = self.client.post(
+            reverse("token_refresh"), data={"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for name in ("access", "refresh"):
+            token = UntypedToken(response.data[name])
+            self.assertEqual(token["email"], "new@example.com")
+            self.assertTrue(token["is_staff"])
+
+    def test_refresh_rejected_after_password_change(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.client.put(
+            reverse("users:password"), data={"password": "n3w-Passw0rd!"}
+        )
+        self.client.credentials()
+
+        response = self.client.post(
+            reverse("token_refresh"), data={"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_revokes_refresh_and_access_tokens(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        response = self.client.post(
+            reverse("token_logout"), data={"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get(reverse("users:me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials()
+        for name, data in (
+            ("token_refresh", {"refresh": self.refresh}),
+            ("token_verify", {"token": self.refresh}),
+            ("token_verify", {"token": self.access}),
+        ):
+            response = self.client.post(reverse(name), data=data)
+            self.assertEqual(
+                response.status_code, status.HTTP_401_UNAUTHORIZED
+            )
+
+    def test_logout_requires_valid_refresh_token(self):
+        response = self.client.post(
+            reverse("token_logout"), data={"refresh": "invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
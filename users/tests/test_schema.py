@@ -0,0 +1,106 @@
+import gzip
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from LibraryServiceAPI.views import accepted_encodings
+
+
+class PrecomputedSchemaTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.TemporaryDirectory()
+        call_command(
+            "build_schema",
+            output_dir=Path(cls.directory.name),
+            stdout=StringIO(),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.enterContext(
+            override_settings(OPENAPI_SCHEMA_ROOT=self.directory.name)
+        )
+
+    def test_serves_built_files(self):
+        response = self.client.get(reverse("schema"), {"format": "json"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Content-Type"], "application/vnd.oai.openapi+json"
+        )
+        self.assertIn("max-age=86400", response["Cache-Control"])
+        self.assertIn("public", response["Cache-Control"])
+        self.assertEqual(
+            response.content,
+            (Path(self.directory.name) / "schema.json").read_bytes(),
+        )
+
+        response = self.client.get(reverse("schema"))
+        self.assertEqual(
+            response["Content-Type"], "application/vnd.oai.openapi"
+        )
+
+    def test_documents_jwt_authentication(self):
+        schema = (Path(self.directory.name) / "schema.json").read_text()
+        self.assertIn('"jwtAuth"', schema)
+
+    def test_serves_compressed_variant(self):
+        response = self.client.get(
+            reverse("schema"),
+            {"format": "json"},
+            HTTP_ACCEPT_ENCODING="gzip, deflate",
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(response.content),
+            (Path(self.directory.name) / "schema.json").read_bytes(),
+        )
+
+    def test_refused_encodings(self):
+        for header in ("gzip;q=0, deflate", "identity, *;q=0", "gzip ; q=0.0"):
+            with self.subTest(header=header):
+                response = self.client.get(
+                    reverse("schema"),
+                    {"format": "json"},
+                    HTTP_ACCEPT_ENCODING=header,
+                )
+                self.assertNotIn("Content-Encoding", response)
+
+    def test_accepted_encodings(self):
+        for header, accepted in (
+            ("", {"identity"}),
+            ("GZIP;q=0.5", {"gzip", "identity"}),
+            ("*", {"br", "gzip", "identity"}),
+            ("br;q=0, *;q=0.1", {"gzip", "identity"}),
+        ):
+            with self.subTest(header=header):
+                self.assertEqual(accepted_encodings(header), accepted)
+
+    def test_if_none_match(self):
+        etag = self.client.get(reverse("schema"))["ETag"]
+        response = self.client.get(reverse("schema"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_missing_schema(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(OPENAPI_SCHEMA_ROOT=directory):
+                response = self.client.get(reverse("schema"))
+                self.assertEqual(
+                    response.status_code,
+                    status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+
+                with override_settings(DEBUG=True):
+                    response = self.client.get(reverse("schema"))
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
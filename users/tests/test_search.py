@@ -0,0 +1,138 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from users.models import UserSearchDocument
+from users.search import make_document, search_user_ids, trigrams
+
+
+class SearchDocumentTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="John.Smith@example.com",
+            password="testpassword",
+            first_name="John",
+            last_name="Smith",
+        )
+
+    def test_document_created_on_save(self):
+        self.assertEqual(
+            self.user.search_document.document,
+            " john smith john.smith@example.com ",
+        )
+
+    def test_document_updated_on_save(self):
+        self.user.last_name = "Smyth"
+        self.user.save()
+        self.assertEqual(
+            UserSearchDocument.objects.get(user=self.user).document,
+            " john smyth john.smith@example.com ",
+        )
+
+    def test_system_update_skips_document(self):
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=["last_login"])
+
+    def test_document_deleted_with_user(self):
+        self.user.delete()
+        self.assertFalse(UserSearchDocument.objects.exists())
+        self.assertEqual(search_user_ids("smith"), [])
+
+    def test_trigrams_are_padded(self):
+        self.assertEqual(trigrams("Jo"), {" jo", "jo "})
+        self.assertEqual(
+            make_document("", "Smith", None, "s@example.com"),
+            " smith s@example.com ",
+        )
+
+
+class UserSearchTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = {
+            name: User.objects.create_user(
+                email=email,
+                password="testpassword",
+                first_name=first_name,
+                last_name=last_name,
+            )
+            for name, first_name, last_name, email in [
+                ("john", "John", "Smith", "jsmith@example.com"),
+                ("jane", "Jane", "Smithers", "jane@example.com"),
+                ("anna", "Anna", "Brown", "anna.brown@example.com"),
+            ]
+        }
+        cls.staff = User.objects.create_user(
+            email="staff@example.com", password="testpassword", is_staff=True
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.staff)
+
+    def search(self, term, **params):
+        response = self.client.get(
+            reverse("users:search"), {"q": term, **params}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [user["email"] for user in response.data]
+
+    def test_partial_name(self):
+        self.assertEqual(
+            self.search("smit")[:2], ["jsmith@example.com", "jane@example.com"]
+        )
+
+    def test_misspelled_name(self):
+        self.assertEqual(self.search("Smtih")[0], "jsmith@example.com")
+        self.assertEqual(
+            self.search("anna bronw")[0], "anna.brown@example.com"
+        )
+
+    def test_misspelled_email(self):
+        self.assertEqual(
+            self.search("ana.brwn@exmaple.com")[0], "anna.brown@example.com"
+        )
+
+    def test_limit(self):
+        self.assertEqual(len(self.search("example", limit=2)), 2)
+
+    def test_requires_query(self):
+        response = self.client.get(reverse("users:search"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(user=self.users["john"])
+        response = self.client.get(reverse("users:search"), {"q": "smith"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unsupported_database_falls_back_to_prefix_search(self):
+        with mock.patch.object(connection, "vendor", "mysql"):
+            self.assertEqual(
+                search_user_ids("Smith"),
+                [self.users["john"].pk, self.users["jane"].pk],
+            )
+            self.assertEqual(
+                search_user_ids("Smith", limit=1), [self.users["john"].pk]
+            )
+            self.assertEqual(search_user_ids(" "), [])
+
+    def test_rebuild_command(self):
+        UserSearchDocument.objects.all().delete()
+        get_user_model().objects.filter(pk=self.users["anna"].pk).update(
+            last_name="Green"
+        )
+        self.assertEqual(search_user_ids("brown"), [])
+
+        call_command("rebuild_search_index", batch_size=2, stdout=StringIO())
+
+        self.assertEqual(UserSearchDocument.objects.count(), 4)
+        self.assertEqual(search_user_ids("green"), [self.users["anna"].pk])
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import serializers
+
+from users.serializers import (
+    UserDirectorySerializer,
+    UserManageSerializer,
+    UserUpdateSerializer,
+)
+
+
+def plain(serializer_class):
+    """The same serializer as a stock ModelSerializer."""
+
+    class Plain(serializers.ModelSerializer):
+        Meta = serializer_class.Meta
+
+    return Plain
+
+
+class CachedModelSerializerTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = [
+            User.objects.create_user(
+                email="john@example.com",
+                username="john",
+                first_name="John",
+                last_name="Smith",
+                is_staff=True,
+            ),
+            User.objects.create_user(email="anonymous@example.com"),
+        ]
+        cls.users[1].date_joined = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def test_output_matches_model_serializer(self):
+        for serializer_class in (
+            UserManageSerializer,
+            UserDirectorySerializer,
+            UserUpdateSerializer,
+        ):
+            with self.subTest(serializer_class.__name__):
+                self.assertEqual(
+                    serializer_class(self.users, many=True).data,
+                    plain(serializer_class)(self.users, many=True).data,
+                )
+
+    def test_mapping_falls_back_to_model_serializer(self):
+        data = {"email": "jane@example.com", "first_name": "Jane"}
+        self.assertEqual(
+            UserUpdateSerializer().to_representation(data),
+            plain(UserUpdateSerializer)().to_representation(data),
+        )
+
+    def test_fields_built_once_per_class(self):
+        class ProbeSerializer(UserManageSerializer):
+            pass
+
+        with mock.patch.object(
+            serializers.ModelSerializer,
+            "get_fields",
+            autospec=True,
+            side_effect=serializers.ModelSerializer.get_fields,
+        ) as get_fields:
+            first = ProbeSerializer(self.users[0])
+            second = ProbeSerializer(self.users[1])
+            self.assertEqual(first.data["email"], "john@example.com")
+            self.assertEqual(second.data["email"], "anonymous@example.com")
+        self.assertEqual(get_fields.call_count, 1)
+        self.assertIsNot(first.fields["email"], second.fields["email"])
+        self.assertIs(second.fields["email"].parent, second)
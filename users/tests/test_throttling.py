@@ -0,0 +1,128 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from users.throttling import (
+    SlidingWindowAnonRateThrottle,
+    SlidingWindowRateThrottle,
+    SlidingWindowScopedRateThrottle,
+    SQLiteThrottleStore,
+)
+
+# The test settings profile disables throttling.
+RATES = {"register": "5/minute", "token": "10/minute"}
+
+
+class SQLiteThrottleStoreTestCase(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "throttle.sqlite3"
+
+    def test_counters_are_shared(self):
+        first = SQLiteThrottleStore(self.path)
+        second = SQLiteThrottleStore(self.path)
+        self.assertEqual(first.incr("key", ttl=60), 1)
+        self.assertEqual(second.incr("key", ttl=60), 2)
+        self.assertEqual(first.get_many(["key", "missing"]), {"key": 2})
+
+    def test_expired_counter_restarts(self):
+        store = SQLiteThrottleStore(self.path)
+        with mock.patch("users.throttling.time.time", return_value=1000):
+            store.incr("key", ttl=60)
+            store.incr("key", ttl=60)
+        with mock.patch("users.throttling.time.time", return_value=1061):
+            self.assertEqual(store.get_many(["key"]), {})
+            self.assertEqual(store.incr("key", ttl=60), 1)
+
+
+class SlidingWindowThrottleTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().get("/")
+        self.request.user = AnonymousUser()
+
+    def make_throttle(self, now):
+        throttle = SlidingWindowAnonRateThrottle()
+        throttle.timer = lambda: now
+        throttle.rate = "10/minute"
+        throttle.num_requests, throttle.duration = 10, 60
+        return throttle
+
+    def allow(self, now):
+        return self.make_throttle(now).allow_request(self.request, None)
+
+    def test_limit_within_window(self):
+        results = [self.allow(60 + second) for second in range(11)]
+        self.assertEqual(results, [True] * 10 + [False])
+
+    def test_previous_window_is_weighted(self):
+        for second in range(10):
+            self.allow(60 + second)
+        # Half of the previous window still overlaps: 10 * 0.5 = 5 counted.
+        results = [self.allow(150) for _ in range(6)]
+        self.assertEqual(results, [True] * 5 + [False])
+
+    def test_wait(self):
+        for second in range(10):
+            self.allow(60 + second)
+        # 10 * 5/6 of the previous window still counts, leaving room for 2.
+        self.assertEqual(
+            [self.allow(130) for _ in range(3)], [True] * 2 + [False]
+        )
+        throttle = self.make_throttle(130)
+        self.assertFalse(throttle.allow_request(self.request, None))
+        self.assertEqual(throttle.wait(), 2)
+
+
+class ScopedThrottleTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        patcher = mock.patch.object(
+            SlidingWindowScopedRateThrottle, "THROTTLE_RATES", RATES
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Keep every request inside one window.
+        patcher = mock.patch.object(
+            SlidingWindowRateThrottle, "timer", return_value=90
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_register_scope(self):
+        for index in range(5):
+            response = self.client.post(
+                reverse("users:register"),
+                data={
+                    "email": f"user{index}@example.com",
+                    "password": "test!23password",
+                },
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(reverse("users:register"))
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    def test_sqlite_store_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = {
+                "BACKEND": "users.throttling.SQLiteThrottleStore",
+                "OPTIONS": {"path": f"{directory}/throttle.sqlite3"},
+            }
+            with override_settings(THROTTLE_STORE=store):
+                statuses = [
+                    self.client.post(reverse("token_verify")).status_code
+                    for _ in range(11)
+                ]
+        self.assertEqual(statuses[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertNotIn(status.HTTP_429_TOO_MANY_REQUESTS, statuses[:-1])
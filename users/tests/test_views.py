@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from rest_framework import status
@@ -37,12 +39,14 @@ class UserCreateViewTestCase(TestCase):
 
 
 class ManageUserViewTestCase(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             email="test@example.com", password="testpassword"
         )
 
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
     def test_get_request(self):
@@ -80,12 +84,14 @@ class ManageUserViewTestCase(TestCase):
 
 
 class UserPasswordUpdateViewTestCase(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             email="test@example.com", password="testpassword"
         )
 
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
     def test_put_request(self):
@@ -101,3 +107,89 @@ class UserPasswordUpdateViewTestCase(TestCase):
             .check_password("new!!!32password"),
             True,
         )
+
+
+class UserDirectoryViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user(
+            email="staff@example.com", password="testpassword", is_staff=True
+        )
+        joined = cls.staff.date_joined
+        get_user_model().objects.bulk_create(
+            get_user_model()(
+                email=f"user{number}@example.com",
+                username=f"user{number}",
+                first_name=first_name,
+                last_name=last_name,
+                # Every pair of users shares a timestamp.
+                date_joined=joined + timedelta(seconds=1 + number // 2),
+            )
+            for number, (first_name, last_name) in enumerate(
+                [
+                    ("John", "Smith"),
+                    ("Jane", "Smith"),
+                    ("Jo", "Smithers"),
+                    ("Anna", "Brown"),
+                    ("Mark", "Smyth"),
+                ]
+            )
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.staff)
+
+    def emails(self, response):
+        return [user["email"] for user in response.data["results"]]
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(
+            user=get_user_model().objects.get(username="user0")
+        )
+        response = self.client.get(reverse("users:directory"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_keyset_pagination(self):
+        url = reverse("users:directory") + "?page_size=2"
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += self.emails(response)
+            url = response.data["next"]
+
+        self.assertEqual(
+            seen,
+            ["staff@example.com"]
+            + [f"user{number}@example.com" for number in range(5)],
+        )
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            reverse("users:directory"), {"cursor": "invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_search_last_name_prefix(self):
+        response = self.client.get(
+            reverse("users:directory"), {"search": "Smith"}
+        )
+        self.assertEqual(
+            self.emails(response),
+            ["user0@example.com", "user1@example.com", "user2@example.com"],
+        )
+
+    def test_search_username_prefix(self):
+        response = self.client.get(
+            reverse("users:directory"), {"search": "user4"}
+        )
+        self.assertEqual(self.emails(response), ["user4@example.com"])
+
+    def test_search_last_and_first_name(self):
+        response = self.client.get(
+            reverse("users:directory"), {"search": "Smith J"}
+        )
+        self.assertEqual(
+            self.emails(response), ["user0@example.com", "user1@example.com"]
+        )
@@ -0,0 +1,25 @@
+import os
+import time
+from typing import Callable
+
+from users.benchmarks import percentiles as latency_percentiles
+
+
+def bench_iterations(default: int = 500) -> int:
+    """Number of iterations per benchmark, overridable via the environment."""
+    return int(os.getenv("BENCH_ITERATIONS", default))
+
+
+def ops_per_second(func: Callable[[], object], iterations: int) -> float:
+    """Call ``func`` ``iterations`` times and return the achieved rate."""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def report(title: str, results: dict[str, float], unit: str) -> None:
+    print(f"\n{title}")
+    for name, value in results.items():
+        print(f"  {name:<32} {value:>12,.1f} {unit}")
@@ -0,0 +1,212 @@
+"""
+Sliding-window rate throttles backed by a shared counter store.
+
+Each throttle key keeps two integer counters, one for the current fixed
+window and one for the previous, and estimates the request rate over the
+last ``duration`` seconds by weighting the previous window by how much of
+it still overlaps. Memory per key is constant and a check costs one read
+and one atomic increment against the store, so every worker that shares
+the store enforces the same limit.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.request import Request
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+if TYPE_CHECKING:
+    from rest_framework.views import APIView
+
+
+class ThrottleStore:
+    """Interface of the counter stores used by the sliding-window throttles."""
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, int]:
+        """Return the current value of every existing counter in ``keys``."""
+        raise NotImplementedError
+
+    def incr(self, key: str, ttl: int) -> int:
+        """
+        Atomically increment ``key``, creating it with a lifetime of ``ttl``
+        seconds if needed, and return the new value.
+        """
+        raise NotImplementedError
+
+
+class CacheThrottleStore(ThrottleStore):
+    """
+    Counters kept in a Django cache.
+
+    Use a cache shared by all workers, such as Redis or Memcached, where
+    ``incr`` is atomic; the default local-memory cache is per process.
+    """
+
+    def __init__(self, alias: str = "default") -> None:
+        self.cache = caches[alias]
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, int]:
+        return self.cache.get_many(list(keys))
+
+    def incr(self, key: str, ttl: int) -> int:
+        self.cache.add(key, 0, ttl)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # The counter expired between add() and incr().
+            self.cache.set(key, 1, ttl)
+            return 1
+
+
+class SQLiteThrottleStore(ThrottleStore):
+    """
+    Counters kept in a local SQLite file.
+
+    Shared by every process on the host that points at the same file, which
+    makes it a drop-in stand-in for a network store in tests and
+    single-host deployments.
+    """
+
+    def __init__(self, path: str, purge_interval: int = 60) -> None:
+        self.path = str(path)
+        self.purge_interval = purge_interval
+        self._local = threading.local()
+        self._next_purge = 0.0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS throttle_counter ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL, "
+                "expires REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, int]:
+        keys = list(keys)
+        rows = self.connection.execute(
+            "SELECT key, value FROM throttle_counter "
+            f"WHERE key IN ({', '.join('?' * len(keys))}) AND expires > ?",
+            [*keys, time.time()],
+        )
+        return dict(rows)
+
+    def incr(self, key: str, ttl: int) -> int:
+        now = time.time()
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_interval
+            self.connection.execute(
+                "DELETE FROM throttle_counter WHERE expires <= ?", [now]
+            )
+        (value,) = self.connection.execute(
+            "INSERT INTO throttle_counter (key, value, expires) "
+            "VALUES (?, 1, ?) ON CONFLICT (key) DO UPDATE SET "
+            "value = CASE WHEN expires > ? THEN value + 1 ELSE 1 END, "
+            "expires = CASE WHEN expires > ? THEN expires "
+            "ELSE excluded.expires END "
+            "RETURNING value",
+            [key, now + ttl, now, now],
+        ).fetchone()
+        return value
+
+
+@lru_cache(maxsize=None)
+def get_throttle_store() -> ThrottleStore:
+    """Return the store configured in ``settings.THROTTLE_STORE``."""
+    config = settings.THROTTLE_STORE
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def reset_throttle_store(*, setting: str, **kwargs) -> None:
+    if setting == "THROTTLE_STORE":
+        get_throttle_store.cache_clear()
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    ``SimpleRateThrottle`` that counts requests with a sliding-window counter
+    in the shared throttle store instead of a per-key request history.
+    """
+
+    def allow_request(self, request: Request, view: APIView) -> bool:
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, elapsed = divmod(self.now, self.duration)
+        current_key = f"{self.key}:{int(window)}"
+        previous_key = f"{self.key}:{int(window) - 1}"
+
+        store = get_throttle_store()
+        counts = store.get_many([previous_key, current_key])
+        self.previous = counts.get(previous_key, 0)
+        self.current = counts.get(current_key, 0)
+        self.elapsed = elapsed
+
+        if self.estimate(elapsed) >= self.num_requests:
+            return self.throttle_failure()
+        store.incr(current_key, ttl=2 * self.duration)
+        return self.throttle_success()
+
+    def estimate(self, elapsed: float) -> float:
+        weight = 1 - elapsed / self.duration
+        return self.previous * weight + self.current
+
+    def throttle_success(self) -> bool:
+        return True
+
+    def wait(self) -> Optional[float]:
+        remaining = self.duration - self.elapsed
+        if self.current >= self.num_requests or not self.previous:
+            return remaining
+        # Time until the previous window's share decays below the limit.
+        wait = self.duration * (
+            1 - (self.num_requests - self.current) / self.previous
+        )
+        return min(max(math.ceil(wait - self.elapsed), 0), remaining)
+
+
+class SlidingWindowAnonRateThrottle(
+    AnonRateThrottle, SlidingWindowRateThrottle
+):
+    """Sliding-window version of DRF's ``AnonRateThrottle``."""
+
+
+class SlidingWindowUserRateThrottle(
+    UserRateThrottle, SlidingWindowRateThrottle
+):
+    """Sliding-window version of DRF's ``UserRateThrottle``."""
+
+
+class SlidingWindowScopedRateThrottle(
+    ScopedRateThrottle, SlidingWindowRateThrottle
+):
+    """Sliding-window version of DRF's ``ScopedRateThrottle``."""
@@ -1,10 +1,44 @@
+from django.conf import settings
 from django.urls import path
 
-from users.views import ManageUserView, UserPasswordUpdateView, UserCreateView
+from users import async_views
+from users.views import (
+    ManageUserView,
+    UserBulkImportView,
+    UserPasswordUpdateView,
+    UserCreateView,
+    UserDirectoryView,
+    UserSearchView,
+)
+
+if settings.ASYNC_USER_VIEWS:
+    register_view = async_views.register
+    me_view = async_views.me
+    password_view = async_views.password_update
+else:
+    register_view = UserCreateView.as_view()
+    me_view = ManageUserView.as_view()
+    password_view = UserPasswordUpdateView.as_view()
+
 urlpatterns = [
-    path("", UserCreateView.as_view(), name="register"),
-    path("me/", ManageUserView.as_view(), name="me"),
-    path("me/password/", UserPasswordUpdateView.as_view(), name="password"),
+    path("", register_view, name="register"),
+    path("async/", async_views.register, name="register-async"),
+    path("me/", me_view, name="me"),
+    path("me/async/", async_views.me, name="me-async"),
+    path("me/password/", password_view, name="password"),
+    path(
+        "me/password/async/",
+        async_views.password_update,
+        name="password-async",
+    ),
+    path("directory/", UserDirectoryView.as_view(), name="directory"),
+    path("search/", UserSearchView.as_view(), name="search"),
+    path("import/", UserBulkImportView.as_view(), name="import"),
+    path(
+        "hashing/metrics/",
+        async_views.hashing_metrics,
+        name="hashing-metrics",
+    ),
 ]
 
 app_name = "users"
@@ -1,13 +1,37 @@
 from typing import Type
 
+from django.conf import settings
 from django.db.models import QuerySet
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    extend_schema,
+    extend_schema_view,
+)
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.serializers import Serializer
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from rest_framework_simplejwt import views as jwt_views
 
+from users.authentication import resolve_user
+from users.cache import cache_profile, get_cached_profile, invalidate_profile
+from users.hashing import HashingPoolSaturated, get_hashing_pool
+from users.importing import UserImporter
 from users.models import User
+from users.pagination import DateJoinedKeysetPagination
+from users.parsers import CSVRowsParser, JSONLinesParser
+from users.revocation import revoke_token
+from users.search import search_user_ids
+from users.throttling import SlidingWindowScopedRateThrottle
 from users.serializers import (
+    UserDirectorySerializer,
     UserManageSerializer,
     UserUpdateSerializer,
     UserPasswordUpdateSerializer,
@@ -28,6 +52,8 @@ class UserCreateView(generics.CreateAPIView):
 
     serializer_class = UserCreateSerializer
     permission_classes = (AllowAny,)
+    throttle_classes = (SlidingWindowScopedRateThrottle,)
+    throttle_scope = "register"
 
 
 @extend_schema_view(
@@ -64,6 +90,8 @@ class ManageUserView(generics.RetrieveUpdateDestroyAPIView):
     """
 
     permission_classes = (IsAuthenticated,)
+    throttle_classes = (SlidingWindowScopedRateThrottle,)
+    throttle_scope = "me"
 
     def get_queryset(self) -> QuerySet:
         user = self.request.user
@@ -71,13 +99,151 @@ class ManageUserView(generics.RetrieveUpdateDestroyAPIView):
         return User.objects.all().filter(id=user.id)
 
     def get_object(self) -> User:
-        return self.request.user
+        return resolve_user(self.request.user)
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.request.method == "GET":
             return UserManageSerializer
         return UserUpdateSerializer
 
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        entry = get_cached_profile(request.user.pk)
+        if entry is None:
+            serializer = self.get_serializer(self.get_object())
+            entry = cache_profile(request.user.pk, serializer.data)
+        payload, etag = entry
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(payload)
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Authorization",))
+        return response
+
+    def perform_update(self, serializer: Serializer) -> None:
+        super().perform_update(serializer)
+        invalidate_profile(self.request.user.pk)
+
+    def perform_destroy(self, instance: User) -> None:
+        user_id = instance.pk
+        super().perform_destroy(instance)
+        invalidate_profile(user_id)
+
+
+@extend_schema(
+    summary="List users",
+    tags=["Users"],
+    description=(
+        "List users in order of registration, optionally filtered by a "
+        "case-sensitive prefix of the last name or username, or by a last "
+        'name and first name prefix ("Smith Jo"). Staff only.'
+    ),
+    parameters=[
+        OpenApiParameter(
+            "search", str, description="Last name or username prefix."
+        )
+    ],
+)
+class UserDirectoryView(generics.ListAPIView):
+    """
+    API endpoint that allows staff to list and search users.
+    """
+
+    serializer_class = UserDirectorySerializer
+    permission_classes = (IsAdminUser,)
+    pagination_class = DateJoinedKeysetPagination
+
+    def get_queryset(self) -> QuerySet:
+        search = self.request.query_params.get("search", "")
+        return User.objects.search_prefix(search)
+
+
+@extend_schema(
+    summary="Search users",
+    tags=["Users"],
+    description=(
+        "Fuzzy search over user names, usernames and emails, tolerant of "
+        "partial words and typos. Results are ranked best first. Staff only."
+    ),
+    parameters=[
+        OpenApiParameter("q", str, required=True, description="Search text."),
+        OpenApiParameter(
+            "limit", int, description="Maximum number of results (1-50)."
+        ),
+    ],
+)
+class UserSearchView(generics.ListAPIView):
+    """
+    API endpoint that allows staff to search users by name or email.
+    """
+
+    serializer_class = UserDirectorySerializer
+    permission_classes = (IsAdminUser,)
+    pagination_class = None
+    default_limit = 20
+    max_limit = 50
+
+    def get_limit(self) -> int:
+        try:
+            limit = int(self.request.query_params["limit"])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        term = request.query_params.get("q", "")
+        if not term.strip():
+            raise ValidationError({"q": ["This field is required."]})
+        ids = search_user_ids(term, limit=self.get_limit())
+        users = User.objects.in_bulk(ids)
+        serializer = self.get_serializer(
+            [users[pk] for pk in ids if pk in users], many=True
+        )
+        return Response(serializer.data)
+
+
+class TokenObtainPairView(jwt_views.TokenObtainPairView):
+    throttle_classes = (SlidingWindowScopedRateThrottle,)
+    throttle_scope = "token"
+
+
+class TokenRefreshView(jwt_views.TokenRefreshView):
+    throttle_classes = (SlidingWindowScopedRateThrottle,)
+    throttle_scope = "token"
+
+
+class TokenVerifyView(jwt_views.TokenVerifyView):
+    throttle_classes = (SlidingWindowScopedRateThrottle,)
+    throttle_scope = "token"
+
+
+@extend_schema(
+    summary="Log out",
+    tags=["Users"],
+    description=(
+        "Revokes the given refresh token and, if the request is "
+        "authenticated, the access token it was made with."
+    ),
+    responses={204: None},
+)
+class TokenLogoutView(jwt_views.TokenViewBase):
+    """
+    API endpoint that revokes the caller's JWTs.
+    """
+
+    _serializer_class = "users.serializers.TokenLogoutSerializer"
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    throttle_classes = (SlidingWindowScopedRateThrottle,)
+    throttle_scope = "token"
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        super().post(request, *args, **kwargs)
+        if request.auth is not None:
+            revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 
 @extend_schema(
     summary="Update user password",
@@ -95,4 +261,48 @@ class UserPasswordUpdateView(generics.UpdateAPIView):
     permission_classes = (IsAuthenticated,)
 
     def get_object(self) -> User:
-        return self.request.user
+        return resolve_user(self.request.user)
+
+
+@extend_schema(
+    summary="Import users in bulk",
+    tags=["Users"],
+    description=(
+        "Create users from a CSV or JSON Lines body. Rows that fail "
+        "validation are reported without aborting the import. Staff only."
+    ),
+    request={
+        "text/csv": OpenApiTypes.STR,
+        "application/x-ndjson": OpenApiTypes.STR,
+    },
+    responses={200: OpenApiTypes.OBJECT},
+)
+class UserBulkImportView(APIView):
+    """
+    API endpoint that allows staff to create users in bulk.
+    """
+
+    permission_classes = (IsAdminUser,)
+    parser_classes = (CSVRowsParser, JSONLinesParser)
+
+    def post(self, request: Request) -> Response:
+        importer = UserImporter(
+            settings.USER_IMPORT_BATCH_SIZE,
+            pool=get_hashing_pool(),
+            pool_timeout=settings.PASSWORD_HASHING_POOL["IMPORT_TIMEOUT"],
+        )
+        try:
+            result = importer.run(request.data)
+        except HashingPoolSaturated:
+            # Earlier batches are committed; report them with the 429.
+            result = importer.result
+            return Response(
+                {
+                    "detail": "Too many password operations in progress.",
+                    "created": result.created,
+                    "errors": result.errors,
+                },
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": "1"},
+            )
+        return Response({"created": result.created, "errors": result.errors})